@@ -1,20 +1,37 @@
 import os
+import sys
 import time
 import logging
+
+# Marca de inicio para medir el costo de los imports en startup-profile
+IMPORT_STARTED = time.perf_counter()
+
 from flask import render_template
 from app import create_app, db
 from app.models.user import User
 from app.models.note import Note
 from sqlalchemy.exc import OperationalError
-from sqlalchemy import text
+from sqlalchemy import func, inspect, text
+from app.utils.health import ReadinessProbe, StatsSnapshot
+from app.services.count_service import count_service
+from app.services.compaction_service import compaction_service
+
+IMPORTS_DURATION = time.perf_counter() - IMPORT_STARTED
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def wait_for_db(app, max_retries=30, delay=2):
-    """Esperar a que la base de datos esté disponible"""
-    for attempt in range(max_retries):
+def wait_for_db(app, timeout=None, initial_delay=None, max_delay=None):
+    """Esperar a que la base de datos esté disponible (backoff exponencial)"""
+    timeout = timeout if timeout is not None else app.config['DB_WAIT_TIMEOUT']
+    delay = initial_delay if initial_delay is not None else app.config['DB_WAIT_INITIAL_DELAY']
+    max_delay = max_delay if max_delay is not None else app.config['DB_WAIT_MAX_DELAY']
+    deadline = time.monotonic() + timeout
+    attempt = 0
+
+    while True:
+        attempt += 1
         try:
             with app.app_context():
                 # Intentar conectar a la base de datos
@@ -22,18 +39,44 @@ def wait_for_db(app, max_retries=30, delay=2):
                 logger.info("✅ Conexión a la base de datos establecida")
                 return True
         except OperationalError as e:
-            logger.warning(f"⏳ Intento {attempt + 1}/{max_retries}: Esperando base de datos... ({str(e)[:100]})")
-            time.sleep(delay)
+            logger.warning(f"⏳ Intento {attempt}: Esperando base de datos... ({str(e)[:100]})")
         except Exception as e:
             logger.error(f"❌ Error inesperado: {e}")
-            time.sleep(delay)
+
+        if time.monotonic() + delay > deadline:
+            break
+        time.sleep(delay)
+        delay = min(delay * 2, max_delay)
 
     logger.error("❌ No se pudo conectar a la base de datos después de varios intentos")
     return False
 
+def schema_is_current(app):
+    """Verificar si el esquema ya está al día (migraciones aplicadas o tablas creadas)"""
+    with app.app_context():
+        migrations_dir = os.path.join(app.root_path, '..', 'migrations')
+        if os.path.isdir(migrations_dir):
+            from alembic.config import Config as AlembicConfig
+            from alembic.migration import MigrationContext
+            from alembic.script import ScriptDirectory
+
+            alembic_config = AlembicConfig()
+            alembic_config.set_main_option('script_location', migrations_dir)
+            script = ScriptDirectory.from_config(alembic_config)
+            with db.engine.connect() as connection:
+                current_heads = set(MigrationContext.configure(connection).get_current_heads())
+            return current_heads == set(script.get_heads())
+
+        existing_tables = set(inspect(db.engine).get_table_names())
+        return set(db.metadata.tables).issubset(existing_tables)
+
 def create_tables_safely(app):
-    """Crear tablas de forma segura"""
+    """Crear tablas de forma segura (se omite si el esquema ya está al día)"""
     try:
+        if schema_is_current(app):
+            logger.info("✅ Esquema al día, se omite create_all")
+            return True
+
         with app.app_context():
             db.create_all()
             logger.info("✅ Tablas de base de datos creadas/verificadas")
@@ -45,18 +88,29 @@ def create_tables_safely(app):
 # Crear la aplicación
 app = create_app(os.getenv('FLASK_ENV', 'default'))
 
+def load_stats():
+    """Calcular estadísticas de usuarios (por rol) y notas"""
+    roles = dict(db.session.query(User.role, func.count(User.id)).group_by(User.role).all())
+    return {
+        'users': sum(roles.values()),
+        'notes': count_service.approx(Note),
+        'roles': {role: roles.get(role, 0) for role in ('admin', 'manager', 'client')}
+    }
+
+# Estadísticas y readiness cacheadas: las visitas y los probes no golpean la BD
+stats_snapshot = StatsSnapshot(load_stats, ttl=app.config['STATS_SNAPSHOT_TTL'])
+readiness_probe = ReadinessProbe(ttl=app.config['READINESS_CACHE_TTL'])
+
 @app.route('/')
 def index():
     """Landing page principal"""
     try:
-        # Obtener estadísticas reales de la base de datos
-        with app.app_context():
-            total_users = User.query.count()
-            total_notes = Note.query.count()
+        # Estadísticas desde el snapshot en memoria
+        stats = stats_snapshot.get()
 
         return render_template('index.html',
-                             total_users=total_users,
-                             total_notes=total_notes)
+                             total_users=stats['users'],
+                             total_notes=stats['notes'])
     except Exception as e:
         logger.warning(f"No se pudieron obtener estadísticas: {e}")
         return render_template('index.html',
@@ -82,6 +136,8 @@ def api_info():
             'public': {
                 'landing': '/',
                 'health': '/health',
+                'liveness': '/livez',
+                'readiness': '/readyz',
                 'api_info': '/api-info'
             },
             'auth': {
@@ -107,6 +163,7 @@ def api_info():
                 'update': 'PUT /api/notes/<id> (own notes or manager+)',
                 'delete': 'DELETE /api/notes/<id> (own notes or manager+)',
                 'search': 'GET /api/notes/search (own notes or manager+)',
+                'changes': 'GET /api/notes/changes?since=<token> (own notes or manager+)',
                 'by_user': 'GET /api/notes?user_id=<id> (own notes or manager+)'
             }
         },
@@ -144,22 +201,35 @@ def api_info():
         }
     }
 
+@app.route('/livez')
+def liveness():
+    """Liveness: el proceso responde (nunca toca la base de datos)"""
+    return {'status': 'alive'}, 200
+
+@app.route('/readyz')
+def readiness():
+    """Readiness: conectividad a la base de datos con resultado cacheado"""
+    ok, error, _ = readiness_probe.check()
+    if ok:
+        return {'status': 'ready', 'database': 'connected'}, 200
+    return {'status': 'not_ready', 'database': 'disconnected', 'error': error}, 503
+
 @app.route('/health')
 def health_check():
     """Endpoint de health check mejorado"""
     try:
-        # Verificar conexión a la base de datos
-        with app.app_context():
-            db.session.execute(text("SELECT 1"))
-
-            # Obtener estadísticas básicas
-            users_count = User.query.count()
-            notes_count = Note.query.count()
+        # Verificar conexión a la base de datos (cacheado)
+        ok, error, _ = readiness_probe.check()
+        if not ok:
+            raise Exception(error)
 
-            # Estadísticas por rol
-            admin_count = User.query.filter_by(role='admin').count()
-            manager_count = User.query.filter_by(role='manager').count()
-            client_count = User.query.filter_by(role='client').count()
+        # Estadísticas básicas desde el snapshot
+        stats = stats_snapshot.get()
+        users_count = stats['users']
+        notes_count = stats['notes']
+        admin_count = stats['roles']['admin']
+        manager_count = stats['roles']['manager']
+        client_count = stats['roles']['client']
 
         return {
             'status': 'healthy',
@@ -196,6 +266,26 @@ def health_check():
             'error': str(e)
         }, 503
 
+def startup_profile():
+    """Reportar los tiempos de import e inicialización del arranque"""
+    timings = dict(app.extensions.get('startup_timings', {}))
+
+    start = time.perf_counter()
+    db_ready = wait_for_db(app, timeout=5)
+    timings['wait_for_db'] = time.perf_counter() - start
+
+    if db_ready:
+        start = time.perf_counter()
+        current = schema_is_current(app)
+        timings['schema_check'] = time.perf_counter() - start
+        print(f"Esquema al día: {'sí' if current else 'no'}")
+
+    print("⏱️  Perfil de arranque")
+    print(f"   {'imports (app.py)':<28} {IMPORTS_DURATION * 1000:>8.1f} ms")
+    for name, seconds in timings.items():
+        print(f"   {name:<28} {seconds * 1000:>8.1f} ms")
+    print("   Detalle de imports: python -X importtime app.py 2> importtime.log")
+
 @app.errorhandler(404)
 def not_found(error):
     """Manejo de errores 404"""
@@ -207,6 +297,8 @@ def not_found(error):
             'public': {
                 'landing': '/',
                 'health': '/health',
+                'liveness': '/livez',
+                'readiness': '/readyz',
                 'api_info': '/api-info'
             },
             'auth': {
@@ -233,12 +325,25 @@ def internal_error(error):
     }, 500
 
 if __name__ == '__main__':
+    # python app.py startup-profile
+    if sys.argv[1:] == ['startup-profile']:
+        startup_profile()
+        sys.exit(0)
+
+    # python app.py compact-tombstones
+    if sys.argv[1:] == ['compact-tombstones']:
+        with app.app_context():
+            print(f"🧹 Tombstones purgados: {compaction_service.compact()}")
+        sys.exit(0)
+
     logger.info("🚀 Iniciando TennisManager API v3.0 con autenticación JWT...")
 
     # Esperar a que la base de datos esté disponible
     if wait_for_db(app):
         # Crear tablas
         if create_tables_safely(app):
+            # Compactación periódica de tombstones (si COMPACTION_INTERVAL > 0)
+            compaction_service.start_background(app)
             logger.info("🎉 TennisManager API v3.0 lista para recibir peticiones")
             logger.info("🌐 Landing page: http://localhost:5001/")
             logger.info("💚 Health check: http://localhost:5001/health")
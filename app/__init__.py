@@ -1,43 +1,205 @@
-from flask import Flask
+import importlib
+import sqlite3
+import itertools
+import time
+from functools import wraps
+from flask import Flask, current_app, g, has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_migrate import Migrate
 from flask_cors import CORS
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from config import config
 
-db = SQLAlchemy()
+# Cookie que fija las lecturas al primario tras una escritura (read-your-writes)
+PRIMARY_COOKIE = 'db_primary_until'
+
+
+class RoutingSession(Session):
+    """Sesión que envía las lecturas de métodos @replica_read a las réplicas
+
+    Las escrituras, los flush y cualquier lectura con cambios pendientes o
+    después de un commit en la misma request (o dentro de la ventana de
+    stickiness del cliente) siguen yendo al primario.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get('replica_depth') and self._can_use_replica():
+            engine = select_replica(self._db)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _can_use_replica(self):
+        if self._flushing or self.new or self.dirty or self.deleted:
+            return False
+        if self.info.get('wrote'):
+            return False
+        if has_request_context() and g.get('db_primary_sticky'):
+            return False
+        return True
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 
+
+def replica_keys(app):
+    """Bind keys de las réplicas configuradas"""
+    return [key for key in app.config.get('SQLALCHEMY_BINDS', {}) if key.startswith('replica_')]
+
+
+def select_replica(db):
+    """Elegir réplica por round-robin o por menor número de conexiones en uso"""
+    app = current_app._get_current_object()
+    keys = app.extensions.get('replica_keys')
+    if not keys:
+        return None
+
+    engines = db.engines
+    if app.config['REPLICA_SELECTION'] == 'least_loaded':
+        key = min(keys, key=lambda k: engines[k].pool.checkedout())
+    else:
+        key = keys[next(app.extensions['replica_counter']) % len(keys)]
+    return engines[key]
+
+
+def replica_read(f):
+    """Decorador para métodos de servicio de solo lectura (pueden ir a réplica)"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        info = db.session.info
+        info['replica_depth'] = info.get('replica_depth', 0) + 1
+        try:
+            return f(*args, **kwargs)
+        finally:
+            info['replica_depth'] -= 1
+
+    return decorated
+
+
+def init_replicas(app):
+    """Registrar réplicas de lectura y stickiness al primario tras escribir"""
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    for index, uri in enumerate(app.config.get('SQLALCHEMY_REPLICA_URIS') or []):
+        binds[f'replica_{index}'] = uri
+    app.config['SQLALCHEMY_BINDS'] = binds
+    app.extensions['replica_counter'] = itertools.count()
+
+    @app.before_request
+    def load_primary_stickiness():
+        try:
+            sticky_until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+        except ValueError:
+            sticky_until = 0
+        g.db_primary_sticky = sticky_until > time.time()
+
+    @app.after_request
+    def save_primary_stickiness(response):
+        if g.get('db_wrote') and app.extensions.get('replica_keys'):
+            sticky_until = time.time() + app.config['REPLICA_STICKY_SECONDS']
+            response.set_cookie(PRIMARY_COOKIE, str(sticky_until),
+                                max_age=app.config['REPLICA_STICKY_SECONDS'], httponly=True)
+        return response
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def mark_session_wrote(session):
+    """Después de un commit con escrituras, el resto de la request lee del primario"""
+    if session.info.get('pending_write'):
+        session.info['wrote'] = True
+        if has_request_context():
+            g.db_wrote = True
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def mark_session_flushed(session, flush_context):
+    session.info['pending_write'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def mark_session_dml(execute_state):
+    """INSERT/UPDATE/DELETE ejecutados directamente (bulk, query.update/delete,
+    Table.delete()) no pasan por el flush, pero también escriben en el primario"""
+    if execute_state.is_insert or execute_state.is_update or execute_state.is_delete:
+        execute_state.session.info['pending_write'] = True
+
+
+@event.listens_for(Engine, 'connect')
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite ignora ON DELETE CASCADE salvo que se activen las foreign keys"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+
+# Blueprints de la API: (nombre, módulo, atributo, url_prefix)
+BLUEPRINTS = [
+    ('user', 'app.controllers.user_controller', 'user_bp', '/api/users'),
+    ('note', 'app.controllers.note_controller', 'note_bp', '/api/notes'),
+    ('auth', 'app.controllers.auth_controller', 'auth_bp', '/api/auth'),
+    ('carrito', 'app.controllers.carrito_controller', 'carrito_bp', '/api/carritos'),
+    ('categoria', 'app.controllers.categoria_controller', 'categoria_bp', '/api/categorias'),
+    ('detalle', 'app.controllers.detalle_controller', 'detalle_bp', '/api/detalles'),
+    ('emprendimiento', 'app.controllers.emprendimiento_controller', 'emprendimiento_bp', '/api/emprendimientos'),
+    ('producto', 'app.controllers.producto_controller', 'producto_bp', '/api/productos'),
+    ('usuario', 'app.controllers.usuario_controller', 'usuario_bp', '/api/usuario'),
+]
+
+
+def register_blueprints(app):
+    """Importar y registrar solo los blueprints habilitados, midiendo cada import
+
+    Flask no permite registrar blueprints después de la primera request, así
+    que la carga perezosa se hace por configuración: con ENABLED_BLUEPRINTS
+    un proceso importa únicamente los controllers (y servicios) que sirve.
+    """
+    enabled = app.config.get('ENABLED_BLUEPRINTS')
+    timings = app.extensions['startup_timings']
+
+    for name, module_name, attr, url_prefix in BLUEPRINTS:
+        if enabled and name not in enabled:
+            continue
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        app.register_blueprint(getattr(module, attr), url_prefix=url_prefix)
+        timings[f'blueprint:{name}'] = time.perf_counter() - start
+
+
 def create_app(config_name='default'):
+    started = time.perf_counter()
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    app.extensions['startup_timings'] = timings = {}
 
     # Inicializar extensiones
+    init_replicas(app)
     db.init_app(app)
+    app.extensions['replica_keys'] = replica_keys(app)
     migrate.init_app(app, db)
     CORS(app)
 
-    # Registrar blueprints existentes
-    from app.controllers.user_controller import user_bp
-    from app.controllers.note_controller import note_bp
-    from app.controllers.auth_controller import auth_bp
-
-    app.register_blueprint(user_bp, url_prefix='/api/users')
-    app.register_blueprint(note_bp, url_prefix='/api/notes')
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-
-    # Registrar blueprints NUEVOS (solo GET)
-    from app.controllers.carrito_controller import carrito_bp
-    from app.controllers.categoria_controller import categoria_bp
-    from app.controllers.detalle_controller import detalle_bp
-    from app.controllers.emprendimiento_controller import emprendimiento_bp
-    from app.controllers.producto_controller import producto_bp
-    from app.controllers.usuario_controller import usuario_bp
-
-    app.register_blueprint(carrito_bp, url_prefix='/api/carritos')
-    app.register_blueprint(categoria_bp, url_prefix='/api/categorias')
-    app.register_blueprint(detalle_bp, url_prefix='/api/detalles')
-    app.register_blueprint(emprendimiento_bp, url_prefix='/api/emprendimientos')
-    app.register_blueprint(producto_bp, url_prefix='/api/productos')
-    app.register_blueprint(usuario_bp, url_prefix='/api/usuario')
+    # Access log JSON; se registra primero para que su after_request corra último
+    # y vea el tamaño final (comprimido) de la respuesta
+    from app.utils.access_log import init_access_log
+    init_access_log(app)
+
+    # Trazas request -> auth -> servicio -> SQL -> serialización (OTLP/JSON)
+    from app.utils.tracing import init_tracing
+    init_tracing(app)
+
+    # Compresión de respuestas (gzip, y br/zstd si están instalados)
+    from app.utils.compression import init_compression
+    init_compression(app)
+
+    # Profiler por request con salida en flame graph (ver app/utils/profiling.py)
+    from app.utils.profiling import init_profiling
+    init_profiling(app)
+    timings['extensions'] = time.perf_counter() - started
+
+    register_blueprints(app)
+    timings['create_app'] = time.perf_counter() - started
 
     return app
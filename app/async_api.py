@@ -0,0 +1,304 @@
+"""
+Modo de servicio asíncrono para los endpoints de solo lectura.
+
+Expone los GET de productos, categorías, emprendimientos y notas sobre el
+engine asyncio de SQLAlchemy (aiomysql en MySQL, aiosqlite en tests).
+Solo cambia la E/S: los parámetros, las sentencias, los permisos, la
+autenticación y la serialización son los de los controllers y servicios
+síncronos (select_statement, page_statement, search_statement, serialize_many,
+bearer_user_id...), así que ambos modos responden lo mismo. Un solo proceso
+puede mantener muchas queries en vuelo mientras espera a la base de datos.
+
+Ejecutar con: hypercorn asgi:app --bind 0.0.0.0:5050
+"""
+from quart import Blueprint, Quart, current_app, request
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from config import config
+from app.controllers.base_controller import BaseController
+from app.controllers.categoria_controller import categoria_controller
+from app.controllers.emprendimiento_controller import emprendimiento_controller, emprendimiento_service
+from app.controllers.note_controller import NoteController, note_controller, note_service
+from app.controllers.producto_controller import producto_controller
+from app.models.Emprendimiento import Emprendimiento
+from app.models.note import Note
+from app.models.user import User
+from app.services.count_service import count_service
+from app.utils.auth_decorators import INVALID_TOKEN, active_user, auth_error_payload, bearer_user_id
+from app.utils.soft_delete import exclude_soft_deleted
+
+# Driver asíncrono equivalente a cada driver síncrono
+ASYNC_DRIVERS = {
+    'mysql+pymysql': 'mysql+aiomysql',
+    'mysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+class AsyncReadSession(Session):
+    """Sesión síncrona detrás de cada AsyncSession
+
+    Tiene el mismo criterio de borrado lógico que RoutingSession: las notas y
+    usuarios borrados no aparecen en listados ni en los GET por ID.
+    """
+
+
+event.listen(AsyncReadSession, 'do_orm_execute', exclude_soft_deleted)
+
+
+def async_database_uri(uri):
+    """Traducir la URI síncrona de la app a su driver asíncrono"""
+    scheme, sep, rest = uri.partition('://')
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def success_response(status_code=200, **payload):
+    """Respuesta exitosa estándar (cuerpo de BaseController.success_payload)"""
+    return BaseController.success_payload(**payload), status_code
+
+
+def error_response(message="Error", status_code=400):
+    """Respuesta de error estándar (cuerpo de BaseController.error_payload)"""
+    return BaseController.error_payload(message), status_code
+
+
+async def count_total(session, model, mode, statement=None):
+    """Equivalente async de CountService.count: mismas sentencias y misma caché de approx"""
+    if mode == 'none':
+        return None
+    if mode == 'approx' and statement is None:
+        value = count_service.cached_approx(model)
+        if value is None:
+            approx = count_service.approx_statement(model, session.bind.dialect.name)
+            value = (await session.execute(approx)).scalar() or 0
+            count_service.store_approx(model, value)
+        return value
+    return await session.scalar(count_service.exact_statement(
+        statement if statement is not None else select(model)))
+
+
+async def batch_response(session, controller, fields):
+    """GET ?ids=1,2,3 con una sola query IN (mismo formato que BaseController.batch_response)"""
+    ids, error = controller.parse_ids(request.args.get('ids'), current_app.config)
+    if error:
+        return error_response(error, 400)
+    service = controller.service
+    pk = inspect(service.model).primary_key[0]
+    instances = (await session.scalars(service.select_statement(fields).where(pk.in_(ids)))).all()
+    instances, missing = service.match_ids(ids, instances)
+    return success_response(**controller.batch_payload(ids, instances, missing, fields))
+
+
+def catalog_blueprint(controller, found_message, not_found_message):
+    """Blueprint con el GET por ID de un modelo de catálogo"""
+    service = controller.service
+    pk = inspect(service.model).primary_key[0]
+    bp = Blueprint(f'async_{service.model.__tablename__.lower()}', __name__)
+
+    @bp.route('/<int:instance_id>', methods=['GET'])
+    async def get_by_id(instance_id):
+        try:
+            fields, error = controller.get_fields(request.args)
+            if error:
+                return error_response(error, 400)
+
+            async with current_app.async_session() as session:
+                instance = (await session.scalars(
+                    service.select_statement(fields).where(pk == instance_id)
+                )).first()
+
+            if not instance:
+                return error_response(not_found_message, 404)
+            return success_response(
+                data=controller.serialize_many([instance], fields)[0],
+                message=found_message
+            )
+        except Exception as e:
+            return error_response(f'Error: {str(e)}', 500)
+
+    return bp
+
+
+def register_catalog(app, controller, url_prefix, label, found_message, not_found_message):
+    """GET lista completa (?fields=, ?ids=, ?count=) y GET por ID"""
+    bp = catalog_blueprint(controller, found_message, not_found_message)
+    model = controller.service.model
+
+    @bp.route('', methods=['GET'])
+    async def get_all():
+        try:
+            fields, error = controller.get_fields(request.args)
+            if error:
+                return error_response(error, 400)
+
+            async with current_app.async_session() as session:
+                if request.args.get('ids'):
+                    return await batch_response(session, controller, fields)
+
+                count_mode, error = controller.get_count_mode(args=request.args)
+                if error:
+                    return error_response(error, 400)
+
+                instances = (await session.scalars(controller.service.select_statement(fields))).all()
+                approx_total = await count_total(session, model, count_mode) if count_mode == 'approx' else None
+
+            return success_response(
+                data=controller.serialize_many(instances, fields),
+                message=f'Se encontraron {len(instances)} {label}',
+                meta=controller.count_meta(count_mode, instances, approx_total)
+            )
+        except Exception as e:
+            return error_response(f'Error: {str(e)}', 500)
+
+    app.register_blueprint(bp, url_prefix=url_prefix)
+
+
+def register_emprendimientos(app):
+    """Directorio paginado (?nombre=, ?ubicacion=, ?user_id=, ?limit=, ?cursor=, ?count=) y GET por ID"""
+    bp = catalog_blueprint(emprendimiento_controller, 'Emprendimiento encontrado', 'Emprendimiento no encontrado')
+
+    @bp.route('', methods=['GET'])
+    async def get_all():
+        try:
+            args = request.args
+            fields, error = emprendimiento_controller.get_fields(args)
+            if error:
+                return error_response(error, 400)
+
+            async with current_app.async_session() as session:
+                if args.get('ids'):
+                    return await batch_response(session, emprendimiento_controller, fields)
+
+                filters = emprendimiento_controller.directory_filters(args)
+                limit, cursor, error = emprendimiento_controller.get_page_params(args, current_app.config)
+                if error:
+                    return error_response(error, 400)
+                count_mode, error = emprendimiento_controller.get_count_mode(args=args)
+                if error:
+                    return error_response(error, 400)
+
+                statement, error = emprendimiento_service.search_statement(
+                    limit=limit, cursor=cursor, fields=fields, **filters)
+                if error:
+                    return error_response(error, 400)
+                emprendimientos, next_cursor = emprendimiento_service.finish_page(
+                    (await session.scalars(statement)).all(), limit)
+                total = await count_total(session, Emprendimiento, count_mode,
+                                          emprendimiento_controller.count_statement(filters))
+
+            return success_response(
+                data=emprendimiento_controller.serialize_many(emprendimientos, fields),
+                message=f'Se encontraron {len(emprendimientos)} emprendimientos',
+                meta=emprendimiento_controller.page_meta(limit, next_cursor, total)
+            )
+        except Exception as e:
+            return error_response(f'Error: {str(e)}', 500)
+
+    app.register_blueprint(bp, url_prefix='/api/emprendimientos')
+
+
+async def get_current_user(session):
+    """Equivalente asíncrono de token_required: retorna (usuario, respuesta de error)"""
+    user_id, error = bearer_user_id(request.headers.get('Authorization'))
+    if error:
+        return None, (auth_error_payload(error), 401)
+
+    try:
+        user = active_user(await session.get(User, user_id))
+    except Exception as e:
+        return None, (auth_error_payload('Error al verificar token', str(e)), 401)
+    if user is None:
+        return None, (auth_error_payload(INVALID_TOKEN), 401)
+    return user, None
+
+
+notes_bp = Blueprint('async_notes', __name__)
+
+
+@notes_bp.route('', methods=['GET'])
+async def get_notes():
+    """Página de notas por keyset (managers/admins ven todas, clients solo las suyas)"""
+    try:
+        args = request.args
+        async with current_app.async_session() as session:
+            current_user, error = await get_current_user(session)
+            if error:
+                return error
+
+            user_id = NoteController.visible_user_id(current_user, args.get('user_id', type=int))
+            limit, cursor, error = note_controller.get_page_params(args, current_app.config)
+            if error:
+                return error_response(error, 400)
+            count_mode, error = note_controller.get_count_mode(args=args)
+            if error:
+                return error_response(error, 400)
+
+            statement, error = note_service.page_statement(user_id, limit, cursor)
+            if error:
+                return error_response(error, 400)
+            notes, next_cursor = note_service.finish_page((await session.scalars(statement)).all(), limit)
+
+            # Mismo criterio que NoteController.count_total: el total de un usuario es su contador
+            if count_mode == 'none':
+                total = None
+            elif user_id:
+                user = await session.get(User, user_id)
+                total = user.notes_count if user else 0
+            else:
+                total = await count_total(session, Note, count_mode)
+
+        return success_response(**NoteController.page_payload(notes, user_id, limit, next_cursor, total))
+    except Exception as e:
+        return error_response(f'Error al obtener notas: {str(e)}', 500)
+
+
+@notes_bp.route('/<int:note_id>', methods=['GET'])
+async def get_note(note_id):
+    """Obtener nota por ID (usuarios solo pueden ver sus propias notas)"""
+    try:
+        async with current_app.async_session() as session:
+            current_user, error = await get_current_user(session)
+            if error:
+                return error
+
+            note = await session.get(Note, note_id)
+
+        if not note:
+            return error_response('Nota no encontrada', 404)
+
+        if not NoteController.can_read(current_user, note):
+            return error_response('No tienes permisos para ver esta nota', 403)
+
+        return success_response(data=note.to_dict(), message='Nota encontrada')
+    except Exception as e:
+        return error_response(f'Error al obtener nota: {str(e)}', 500)
+
+
+def create_async_app(config_name='default'):
+    """Crear la app ASGI de solo lectura"""
+    app = Quart(__name__)
+    app.config.from_object(config[config_name])
+
+    uri = app.config.get('ASYNC_DATABASE_URI') or \
+        async_database_uri(app.config['SQLALCHEMY_DATABASE_URI'])
+    app.async_engine = create_async_engine(uri, **app.config.get('ASYNC_ENGINE_OPTIONS', {}))
+    app.async_session = async_sessionmaker(app.async_engine, expire_on_commit=False,
+                                           sync_session_class=AsyncReadSession)
+
+    register_catalog(app, producto_controller, '/api/productos', 'productos',
+                     'Producto encontrado', 'Producto no encontrado')
+    register_catalog(app, categoria_controller, '/api/categorias', 'categorías',
+                     'Categoría encontrada', 'Categoría no encontrada')
+    register_emprendimientos(app)
+    app.register_blueprint(notes_bp, url_prefix='/api/notes')
+
+    @app.route('/health')
+    async def health_check():
+        return {'status': 'healthy', 'mode': 'async'}, 200
+
+    @app.after_serving
+    async def dispose_engine():
+        await app.async_engine.dispose()
+
+    return app
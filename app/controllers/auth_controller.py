@@ -144,21 +144,6 @@ class AuthController(BaseController):
                     'El teléfono debe tener al menos 7 caracteres', 400
                 )
 
-            # Verificar si el usuario ya existe
-            existing_user = User.query.filter(
-                (User.username == username) | (User.email == email)
-            ).first()
-
-            if existing_user:
-                if existing_user.username == username:
-                    return AuthController.error_response(
-                        'El nombre de usuario ya está en uso', 409
-                    )
-                else:
-                    return AuthController.error_response(
-                        'El email ya está registrado', 409
-                    )
-
             # Crear nuevo usuario
             user = User(
                 username=username,
@@ -172,8 +157,12 @@ class AuthController(BaseController):
             )
             user.set_password(password)
 
+            # Un solo INSERT: los índices únicos detectan username/email duplicados
             db.session.add(user)
-            db.session.commit()
+            try:
+                UserService.commit_unique()
+            except ValueError as e:
+                return AuthController.error_response(str(e), 409)
 
             # Generar token para el nuevo usuario
             token = user.generate_token(expires_in=3600)
@@ -294,7 +283,7 @@ class AuthController(BaseController):
     def list_all_users():
         """Listar todos los usuarios (solo admin)"""
         try:
-            users = User.query.all()
+            users = UserService.get_all()
 
             return AuthController.success_response(
                 data=[user.to_dict() for user in users],
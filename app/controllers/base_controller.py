@@ -1,4 +1,7 @@
-from flask import jsonify, request
+from flask import current_app, jsonify, request
+from app.utils.serialization import serialize
+from app.services.count_service import count_service
+from app.utils.tracing import traced
 
 class BaseController:
     """Controlador base con métodos comunes (DRY principle)"""
@@ -7,26 +10,40 @@ class BaseController:
         self.service = service
 
     @staticmethod
-    def success_response(data=None, message="Success", status_code=200):
-        """Respuesta exitosa estándar"""
+    def success_payload(data=None, message="Success", meta=None):
+        """Cuerpo de la respuesta exitosa estándar (también lo usa app/async_api.py)"""
         response = {
             'success': True,
             'message': message
         }
         if data is not None:
             response['data'] = data
-        return jsonify(response), status_code
+        if meta is not None:
+            response['meta'] = meta
+        return response
 
     @staticmethod
-    def error_response(message="Error", status_code=400, errors=None):
-        """Respuesta de error estándar"""
+    def error_payload(message="Error", errors=None):
+        """Cuerpo de la respuesta de error estándar"""
         response = {
             'success': False,
             'message': message
         }
         if errors:
             response['errors'] = errors
-        return jsonify(response), status_code
+        return response
+
+    @staticmethod
+    @traced('response.jsonify')
+    def success_response(data=None, message="Success", status_code=200, meta=None):
+        """Respuesta exitosa estándar"""
+        return jsonify(BaseController.success_payload(data, message, meta)), status_code
+
+    @staticmethod
+    @traced('response.jsonify')
+    def error_response(message="Error", status_code=400, errors=None):
+        """Respuesta de error estándar"""
+        return jsonify(BaseController.error_payload(message, errors)), status_code
 
     def get_json_data(self):
         """Obtener datos JSON de la request"""
@@ -39,6 +56,89 @@ class BaseController:
 
         return data, None
 
+    @staticmethod
+    def request_args(args=None):
+        """Query string de la request; el modo async (Quart) pasa el suyo"""
+        return request.args if args is None else args
+
+    def get_fields(self, args=None):
+        """Obtener la proyección de campos pedida con ?fields=a,b,c"""
+        return self.service.parse_fields(self.request_args(args).get('fields'))
+
+    @staticmethod
+    def serialize(instance, fields=None):
+        """Serializar una instancia completa o solo los campos pedidos"""
+        return serialize(instance, fields)
+
+    def serialize_many(self, instances, fields=None):
+        """Serializar un listado (los controllers pueden enriquecerlo en lote)"""
+        return [self.serialize(instance, fields) for instance in instances]
+
+    def get_page_params(self, args=None, config=None):
+        """Obtener ?limit= y ?cursor= para paginación keyset; retorna (limit, cursor, error)"""
+        args = self.request_args(args)
+        config = current_app.config if config is None else config
+        default_limit = config.get('PAGE_SIZE_DEFAULT', 20)
+        max_limit = config.get('PAGE_SIZE_MAX', 100)
+        limit = args.get('limit', default_limit, type=int)
+        if limit is None or limit < 1:
+            return None, None, "limit debe ser un entero positivo"
+        return min(limit, max_limit), args.get('cursor') or None, None
+
+    def get_count_mode(self, default='none', args=None):
+        """Obtener el modo de conteo pedido con ?count=exact|approx|none"""
+        return count_service.parse_mode(self.request_args(args).get('count'), default)
+
+    def count_meta(self, mode, instances, approx_total=None):
+        """Meta de conteo para listados completos (exact = filas ya cargadas)
+
+        approx_total permite pasar el total aproximado ya calculado (modo async).
+        """
+        if mode == 'none':
+            return None
+        if mode == 'approx':
+            if approx_total is None:
+                approx_total = count_service.approx(self.service.model)
+            return {'total': approx_total, 'count': 'approx'}
+        return {'total': len(instances), 'count': 'exact'}
+
+    def parse_ids(self, ids_param, config=None):
+        """Convertir '1,2,3' o [1, 2, 3] en una lista de IDs únicos (en orden)"""
+        if isinstance(ids_param, str):
+            ids_param = [i for i in ids_param.split(',') if i.strip()]
+        if not ids_param or not isinstance(ids_param, list):
+            return None, "ids es requerido (ej: ids=1,2,3)"
+
+        ids = []
+        for id_param in ids_param:
+            id_value, error = self.validate_id(id_param)
+            if error:
+                return None, error
+            if id_value not in ids:
+                ids.append(id_value)
+
+        config = current_app.config if config is None else config
+        max_ids = config.get('BATCH_MAX_IDS', 100)
+        if len(ids) > max_ids:
+            return None, f"Se permiten como máximo {max_ids} IDs por petición"
+
+        return ids, None
+
+    def batch_payload(self, ids, instances, missing, fields=None):
+        """data y message de la obtención por lotes de IDs"""
+        return {
+            'data': {
+                'items': self.serialize_many(instances, fields),
+                'missing_ids': missing
+            },
+            'message': f'Se encontraron {len(instances)} de {len(ids)} registros'
+        }
+
+    def batch_response(self, ids, fields=None):
+        """Respuesta estándar para la obtención por lotes de IDs"""
+        instances, missing = self.service.get_many(ids, fields=fields)
+        return self.success_response(**self.batch_payload(ids, instances, missing, fields))
+
     def validate_id(self, id_param):
         """Validar que el ID sea un entero válido"""
         try:
@@ -1,6 +1,8 @@
-from flask import Blueprint
+from flask import Blueprint, g
 from app.services.carrito_service import CarritoService
+from app.services.pricing_service import pricing_service
 from app.controllers.base_controller import BaseController
+from app.utils.auth_decorators import token_required
 
 carrito_bp = Blueprint('carritos', __name__)
 carrito_service = CarritoService()
@@ -13,9 +15,34 @@ class CarritoController(BaseController):
     @carrito_bp.route('', methods=['GET'])
     def get_all():
         try:
-            carritos = CarritoService.get_all()
+            fields, error = carrito_controller.get_fields()
+            if error:
+                return CarritoController.error_response(error, 400)
+            count_mode, error = carrito_controller.get_count_mode()
+            if error:
+                return CarritoController.error_response(error, 400)
+
+            carritos = carrito_service.get_all(fields=fields)
+            return CarritoController.success_response(
+                data=carrito_controller.serialize_many(carritos, fields),
+                message=f'Se encontraron {len(carritos)} carritos',
+                meta=carrito_controller.count_meta(count_mode, carritos)
+            )
+        except Exception as e:
+            return CarritoController.error_response(f'Error: {str(e)}', 500)
+
+    @staticmethod
+    @carrito_bp.route('/mine', methods=['GET'])
+    @token_required
+    def get_mine():
+        """Carritos del usuario autenticado"""
+        try:
+            fields, error = carrito_controller.get_fields()
+            if error:
+                return CarritoController.error_response(error, 400)
+            carritos = carrito_service.get_by_user(g.current_user.id, fields=fields)
             return CarritoController.success_response(
-                data=[c.to_dict() for c in carritos],
+                data=carrito_controller.serialize_many(carritos, fields),
                 message=f'Se encontraron {len(carritos)} carritos'
             )
         except Exception as e:
@@ -25,14 +52,70 @@ class CarritoController(BaseController):
     @carrito_bp.route('/<int:carrito_id>', methods=['GET'])
     def get_by_id(carrito_id):
         try:
-            carrito = CarritoService.get_by_id(carrito_id)
+            fields, error = carrito_controller.get_fields()
+            if error:
+                return CarritoController.error_response(error, 400)
+            carrito = carrito_service.get_by_id(carrito_id, fields=fields)
             if not carrito:
                 return CarritoController.error_response('Carrito no encontrado', 404)
             return CarritoController.success_response(
-                data=carrito.to_dict(),
+                data=CarritoController.serialize(carrito, fields),
                 message='Carrito encontrado'
             )
         except Exception as e:
             return CarritoController.error_response(f'Error: {str(e)}', 500)
 
+    @staticmethod
+    @carrito_bp.route('/cotizar', methods=['POST'])
+    def quote():
+        """Cotizar items sin crear carrito: {"items": [{"idProducto": 1, "cantidad": 2}]}"""
+        try:
+            data, error = carrito_controller.get_json_data()
+            if error:
+                return CarritoController.error_response(error, 400)
+            items = data.get('items')
+            if not isinstance(items, list) or not items or not all(isinstance(i, dict) for i in items):
+                return CarritoController.error_response('items debe ser una lista no vacía de objetos', 400)
+            quote, error = pricing_service.quote(items)
+            if error:
+                return CarritoController.error_response(error, 400)
+            return CarritoController.success_response(data=quote, message='Cotización calculada')
+        except Exception as e:
+            return CarritoController.error_response(f'Error: {str(e)}', 500)
+
+    @staticmethod
+    @carrito_bp.route('/<int:carrito_id>/precio', methods=['GET'])
+    def get_pricing(carrito_id):
+        """Precios actuales de las líneas y totales del carrito (sin guardarlos)"""
+        try:
+            if not carrito_service.get_by_id(carrito_id, fields=['idCarrito']):
+                return CarritoController.error_response('Carrito no encontrado', 404)
+            return CarritoController.success_response(
+                data=dict(pricing_service.price_carts([carrito_id])[carrito_id], idCarrito=carrito_id),
+                message='Precios del carrito calculados'
+            )
+        except Exception as e:
+            return CarritoController.error_response(f'Error: {str(e)}', 500)
+
+    @staticmethod
+    @carrito_bp.route('/<int:carrito_id>/recalcular', methods=['POST'])
+    @token_required
+    def reprice(carrito_id):
+        """Guardar precioUnitario/subtotalDetalle de cada línea y los totales del carrito"""
+        try:
+            carrito = carrito_service.get_by_id(carrito_id, fields=['idCarrito', 'idUsuario'])
+            if not carrito:
+                return CarritoController.error_response('Carrito no encontrado', 404)
+            if carrito.idUsuario != g.current_user.id and not g.current_user.has_permission('admin'):
+                return CarritoController.error_response('No tienes permisos para modificar este carrito', 403)
+            result, error = pricing_service.reprice_cart(carrito_id)
+            if error:
+                return CarritoController.error_response(f'Error al recalcular el carrito: {error}', 500)
+            return CarritoController.success_response(
+                data=dict(result, idCarrito=carrito_id),
+                message='Carrito recalculado'
+            )
+        except Exception as e:
+            return CarritoController.error_response(f'Error: {str(e)}', 500)
+
 carrito_controller = CarritoController()
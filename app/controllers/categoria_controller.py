@@ -1,4 +1,4 @@
-from flask import Blueprint
+from flask import Blueprint, request
 from app.services.categoria_service import CategoriaService
 from app.controllers.base_controller import BaseController
 
@@ -13,10 +13,26 @@ class CategoriaController(BaseController):
     @categoria_bp.route('', methods=['GET'])
     def get_all():
         try:
-            categorias = CategoriaService.get_all()
+            fields, error = categoria_controller.get_fields()
+            if error:
+                return CategoriaController.error_response(error, 400)
+
+            # GET ?ids=1,2,3 -> obtención por lotes con una sola query
+            if request.args.get('ids'):
+                ids, error = categoria_controller.parse_ids(request.args.get('ids'))
+                if error:
+                    return CategoriaController.error_response(error, 400)
+                return categoria_controller.batch_response(ids, fields)
+
+            count_mode, error = categoria_controller.get_count_mode()
+            if error:
+                return CategoriaController.error_response(error, 400)
+
+            categorias = categoria_service.get_all(fields=fields)
             return CategoriaController.success_response(
-                data=[c.to_dict() for c in categorias],
-                message=f'Se encontraron {len(categorias)} categorías'
+                data=categoria_controller.serialize_many(categorias, fields),
+                message=f'Se encontraron {len(categorias)} categorías',
+                meta=categoria_controller.count_meta(count_mode, categorias)
             )
         except Exception as e:
             return CategoriaController.error_response(f'Error: {str(e)}', 500)
@@ -25,14 +41,35 @@ class CategoriaController(BaseController):
     @categoria_bp.route('/<int:categoria_id>', methods=['GET'])
     def get_by_id(categoria_id):
         try:
-            categoria = CategoriaService.get_by_id(categoria_id)
+            fields, error = categoria_controller.get_fields()
+            if error:
+                return CategoriaController.error_response(error, 400)
+            categoria = categoria_service.get_by_id(categoria_id, fields=fields)
             if not categoria:
                 return CategoriaController.error_response('Categoría no encontrada', 404)
             return CategoriaController.success_response(
-                data=categoria.to_dict(),
+                data=CategoriaController.serialize(categoria, fields),
                 message='Categoría encontrada'
             )
         except Exception as e:
             return CategoriaController.error_response(f'Error: {str(e)}', 500)
 
+    @staticmethod
+    @categoria_bp.route('/batch', methods=['POST'])
+    def get_batch():
+        """Obtención por lotes para listas largas de IDs: {"ids": [...], "fields": [...]}"""
+        try:
+            data, error = categoria_controller.get_json_data()
+            if error:
+                return CategoriaController.error_response(error, 400)
+            ids, error = categoria_controller.parse_ids(data.get('ids'))
+            if error:
+                return CategoriaController.error_response(error, 400)
+            fields, error = categoria_service.parse_fields(data.get('fields'))
+            if error:
+                return CategoriaController.error_response(error, 400)
+            return categoria_controller.batch_response(ids, fields)
+        except Exception as e:
+            return CategoriaController.error_response(f'Error: {str(e)}', 500)
+
 categoria_controller = CategoriaController()
@@ -13,10 +13,18 @@ class DetalleController(BaseController):
     @detalle_bp.route('', methods=['GET'])
     def get_all():
         try:
-            detalles = DetalleService.get_all()
+            fields, error = detalle_controller.get_fields()
+            if error:
+                return DetalleController.error_response(error, 400)
+            count_mode, error = detalle_controller.get_count_mode()
+            if error:
+                return DetalleController.error_response(error, 400)
+
+            detalles = detalle_service.get_all(fields=fields)
             return DetalleController.success_response(
-                data=[d.to_dict() for d in detalles],
-                message=f'Se encontraron {len(detalles)} detalles'
+                data=detalle_controller.serialize_many(detalles, fields),
+                message=f'Se encontraron {len(detalles)} detalles',
+                meta=detalle_controller.count_meta(count_mode, detalles)
             )
         except Exception as e:
             return DetalleController.error_response(f'Error: {str(e)}', 500)
@@ -25,11 +33,14 @@ class DetalleController(BaseController):
     @detalle_bp.route('/<int:detalle_id>', methods=['GET'])
     def get_by_id(detalle_id):
         try:
-            detalle = DetalleService.get_by_id(detalle_id)
+            fields, error = detalle_controller.get_fields()
+            if error:
+                return DetalleController.error_response(error, 400)
+            detalle = detalle_service.get_by_id(detalle_id, fields=fields)
             if not detalle:
                 return DetalleController.error_response('Detalle no encontrado', 404)
             return DetalleController.success_response(
-                data=detalle.to_dict(),
+                data=DetalleController.serialize(detalle, fields),
                 message='Detalle encontrado'
             )
         except Exception as e:
@@ -1,9 +1,15 @@
-from flask import Blueprint
+from flask import Blueprint, request, g
 from app.services.emprendimiento_service import EmprendimientoService
+from app.services.producto_service import ProductoService
+from app.services.count_service import count_service
+from app.models.Emprendimiento import Emprendimiento
 from app.controllers.base_controller import BaseController
+from app.controllers.producto_controller import producto_controller
+from app.utils.auth_decorators import token_required
 
 emprendimiento_bp = Blueprint('emprendimientos', __name__)
 emprendimiento_service = EmprendimientoService()
+producto_service = ProductoService()
 
 class EmprendimientoController(BaseController):
     def __init__(self):
@@ -13,9 +19,50 @@ class EmprendimientoController(BaseController):
     @emprendimiento_bp.route('', methods=['GET'])
     def get_all():
         try:
-            emprendimientos = EmprendimientoService.get_all()
+            fields, error = emprendimiento_controller.get_fields()
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+
+            # GET ?ids=1,2,3 -> obtención por lotes con una sola query
+            if request.args.get('ids'):
+                ids, error = emprendimiento_controller.parse_ids(request.args.get('ids'))
+                if error:
+                    return EmprendimientoController.error_response(error, 400)
+                return emprendimiento_controller.batch_response(ids, fields)
+
+            filters = emprendimiento_controller.directory_filters()
+            limit, cursor, error = emprendimiento_controller.get_page_params()
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+            count_mode, error = emprendimiento_controller.get_count_mode()
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+
+            emprendimientos, next_cursor, error = emprendimiento_service.search(
+                limit=limit, cursor=cursor, fields=fields, **filters)
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+            return EmprendimientoController.success_response(
+                data=emprendimiento_controller.serialize_many(emprendimientos, fields),
+                message=f'Se encontraron {len(emprendimientos)} emprendimientos',
+                meta=emprendimiento_controller.page_meta(limit, next_cursor, count_service.count(
+                    Emprendimiento, count_mode, emprendimiento_controller.count_statement(filters)))
+            )
+        except Exception as e:
+            return EmprendimientoController.error_response(f'Error: {str(e)}', 500)
+
+    @staticmethod
+    @emprendimiento_bp.route('/mine', methods=['GET'])
+    @token_required
+    def get_mine():
+        """Emprendimientos del usuario autenticado"""
+        try:
+            fields, error = emprendimiento_controller.get_fields()
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+            emprendimientos = emprendimiento_service.get_by_user(g.current_user.id, fields=fields)
             return EmprendimientoController.success_response(
-                data=[e.to_dict() for e in emprendimientos],
+                data=emprendimiento_controller.serialize_many(emprendimientos, fields),
                 message=f'Se encontraron {len(emprendimientos)} emprendimientos'
             )
         except Exception as e:
@@ -25,14 +72,82 @@ class EmprendimientoController(BaseController):
     @emprendimiento_bp.route('/<int:emprendimiento_id>', methods=['GET'])
     def get_by_id(emprendimiento_id):
         try:
-            emprendimiento = EmprendimientoService.get_by_id(emprendimiento_id)
+            fields, error = emprendimiento_controller.get_fields()
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+            emprendimiento = emprendimiento_service.get_by_id(emprendimiento_id, fields=fields)
             if not emprendimiento:
                 return EmprendimientoController.error_response('Emprendimiento no encontrado', 404)
             return EmprendimientoController.success_response(
-                data=emprendimiento.to_dict(),
+                data=EmprendimientoController.serialize(emprendimiento, fields),
                 message='Emprendimiento encontrado'
             )
         except Exception as e:
             return EmprendimientoController.error_response(f'Error: {str(e)}', 500)
 
+    @staticmethod
+    @emprendimiento_bp.route('/<int:emprendimiento_id>/productos', methods=['GET'])
+    def get_productos(emprendimiento_id):
+        """Productos de un emprendimiento, paginados con ?limit=&cursor="""
+        try:
+            fields, error = producto_service.parse_fields(request.args.get('fields'))
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+            limit, cursor, error = emprendimiento_controller.get_page_params()
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+            if not emprendimiento_service.get_by_id(emprendimiento_id, fields=['idEmprendimiento']):
+                return EmprendimientoController.error_response('Emprendimiento no encontrado', 404)
+
+            productos, next_cursor, error = producto_service.get_by_emprendimiento(
+                emprendimiento_id, limit=limit, cursor=cursor, fields=fields)
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+            return EmprendimientoController.success_response(
+                data=producto_controller.serialize_many(productos, fields),
+                message=f'Se encontraron {len(productos)} productos',
+                meta={'limit': limit, 'next_cursor': next_cursor}
+            )
+        except Exception as e:
+            return EmprendimientoController.error_response(f'Error: {str(e)}', 500)
+
+    @staticmethod
+    @emprendimiento_bp.route('/batch', methods=['POST'])
+    def get_batch():
+        """Obtención por lotes para listas largas de IDs: {"ids": [...], "fields": [...]}"""
+        try:
+            data, error = emprendimiento_controller.get_json_data()
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+            ids, error = emprendimiento_controller.parse_ids(data.get('ids'))
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+            fields, error = emprendimiento_service.parse_fields(data.get('fields'))
+            if error:
+                return EmprendimientoController.error_response(error, 400)
+            return emprendimiento_controller.batch_response(ids, fields)
+        except Exception as e:
+            return EmprendimientoController.error_response(f'Error: {str(e)}', 500)
+
+    def directory_filters(self, args=None):
+        """Directorio: ?nombre= (prefijo), ?ubicacion= (ciudad, sin mayúsculas ni acentos) y ?user_id= (dueño)"""
+        args = self.request_args(args)
+        return {
+            'nombre': args.get('nombre', '').strip() or None,
+            'ubicacion': args.get('ubicacion', '').strip() or None,
+            'user_id': args.get('user_id', type=int),
+        }
+
+    def count_statement(self, filters):
+        """Qué se cuenta: el directorio filtrado, o None (tabla completa, admite approx)"""
+        return emprendimiento_service.directory_statement(**filters) if any(filters.values()) else None
+
+    @staticmethod
+    def page_meta(limit, next_cursor, total=None):
+        """Meta de paginación; total solo si se pidió ?count="""
+        meta = {'limit': limit, 'next_cursor': next_cursor}
+        if total is not None:
+            meta['total'] = total
+        return meta
+
 emprendimiento_controller = EmprendimientoController()
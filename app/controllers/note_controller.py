@@ -1,6 +1,8 @@
 from flask import Blueprint, request, g
-from app.services.note_service import NoteService
+from app.services.note_service import NoteService, SYNC_TOKEN_EXPIRED
 from app.services.user_service import UserService
+from app.services.count_service import count_service
+from app.models.note import Note
 from app.controllers.base_controller import BaseController
 from app.utils.auth_decorators import token_required, manager_required
 
@@ -20,29 +22,21 @@ class NoteController(BaseController):
     def get_all():
         """Obtener todas las notas (managers/admins ven todas, clients solo las suyas)"""
         try:
-            current_user = g.current_user
-            user_id = request.args.get('user_id', type=int)
+            user_id = NoteController.visible_user_id(g.current_user, request.args.get('user_id', type=int))
 
-            # Si no es manager/admin, solo puede ver sus propias notas
-            if not current_user.has_permission('manager'):
-                user_id = current_user.id
+            limit, cursor, error = note_controller.get_page_params()
+            if error:
+                return NoteController.error_response(error, 400)
+            count_mode, error = note_controller.get_count_mode()
+            if error:
+                return NoteController.error_response(error, 400)
 
-            if user_id:
-                # Verificar permisos para ver notas de otro usuario
-                if user_id != current_user.id and not current_user.has_permission('manager'):
-                    return NoteController.error_response(
-                        'No tienes permisos para ver las notas de otro usuario', 403
-                    )
-                notes = NoteService.get_by_user_id(user_id)
-                message = f'Se encontraron {len(notes)} notas del usuario {user_id}'
-            else:
-                notes = NoteService.get_all()
-                message = f'Se encontraron {len(notes)} notas'
+            notes, next_cursor, error = note_service.get_page(user_id=user_id, limit=limit, cursor=cursor)
+            if error:
+                return NoteController.error_response(error, 400)
 
-            return NoteController.success_response(
-                data=[note.to_dict() for note in notes],
-                message=message
-            )
+            return NoteController.success_response(**note_controller.page_payload(
+                notes, user_id, limit, next_cursor, note_controller.count_total(count_mode, user_id)))
         except Exception as e:
             return NoteController.error_response(f'Error al obtener notas: {str(e)}', 500)
 
@@ -52,14 +46,13 @@ class NoteController(BaseController):
     def get_by_id(note_id):
         """Obtener nota por ID (usuarios solo pueden ver sus propias notas)"""
         try:
-            current_user = g.current_user
             note = NoteService.get_by_id(note_id)
 
             if not note:
                 return NoteController.error_response('Nota no encontrada', 404)
 
             # Verificar permisos: usuarios solo pueden ver sus propias notas
-            if note.user_id != current_user.id and not current_user.has_permission('manager'):
+            if not NoteController.can_read(g.current_user, note):
                 return NoteController.error_response(
                     'No tienes permisos para ver esta nota', 403
                 )
@@ -71,6 +64,49 @@ class NoteController(BaseController):
         except Exception as e:
             return NoteController.error_response(f'Error al obtener nota: {str(e)}', 500)
 
+    @staticmethod
+    @note_bp.route('/changes', methods=['GET'])
+    @token_required
+    def get_changes():
+        """Sincronización incremental: notas creadas/actualizadas y eliminadas desde ?since="""
+        try:
+            current_user = g.current_user
+            user_id = request.args.get('user_id', type=int)
+
+            # Si no es manager/admin, solo puede sincronizar sus propias notas
+            if not current_user.has_permission('manager'):
+                user_id = current_user.id
+
+            limit, _, error = note_controller.get_page_params()
+            if error:
+                return NoteController.error_response(error, 400)
+
+            notes, deleted, next_token, has_more, error = note_service.get_changes(
+                user_id=user_id, since=request.args.get('since'), limit=limit
+            )
+            if error == SYNC_TOKEN_EXPIRED:
+                return NoteController.error_response(error, 410)
+            if error:
+                return NoteController.error_response(error, 400)
+
+            return NoteController.success_response(
+                data={
+                    'changes': [note.to_dict() for note in notes],
+                    'deleted': [
+                        {
+                            'id': note.id,
+                            'user_id': note.user_id,
+                            'deleted_at': note.deleted_at.isoformat()
+                        }
+                        for note in deleted
+                    ]
+                },
+                message=f'{len(notes)} notas modificadas y {len(deleted)} eliminadas',
+                meta={'next_token': next_token, 'has_more': has_more}
+            )
+        except Exception as e:
+            return NoteController.error_response(f'Error al obtener cambios: {str(e)}', 500)
+
     @staticmethod
     @note_bp.route('/search', methods=['GET'])
     @token_required
@@ -215,6 +251,38 @@ class NoteController(BaseController):
         except Exception as e:
             return NoteController.error_response(f'Error al eliminar nota: {str(e)}', 500)
 
+    @staticmethod
+    def visible_user_id(current_user, user_id=None):
+        """Notas que puede listar: managers/admins las de cualquiera (o todas), clients solo las suyas"""
+        if not current_user.has_permission('manager'):
+            return current_user.id
+        return user_id
+
+    @staticmethod
+    def can_read(current_user, note):
+        return note.user_id == current_user.id or current_user.has_permission('manager')
+
+    def count_total(self, count_mode, user_id=None):
+        """Total para ?count=; el de un usuario sale del contador mantenido"""
+        if count_mode == 'none':
+            return None
+        if user_id:
+            user = user_service.get_by_id(user_id)
+            return user.notes_count if user else 0
+        return count_service.count(Note, count_mode)
+
+    @staticmethod
+    def page_payload(notes, user_id, limit, next_cursor, total=None):
+        """data, message y meta de una página de notas (también la arma app/async_api.py)"""
+        if user_id:
+            message = f'Se encontraron {len(notes)} notas del usuario {user_id}'
+        else:
+            message = f'Se encontraron {len(notes)} notas'
+        meta = {'limit': limit, 'next_cursor': next_cursor}
+        if total is not None:
+            meta['total'] = total
+        return {'data': [note.to_dict() for note in notes], 'message': message, 'meta': meta}
+
 note_controller = NoteController()
 
 @note_bp.route('/', methods=['GET'])
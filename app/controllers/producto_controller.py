@@ -1,5 +1,7 @@
-from flask import Blueprint
+from flask import Blueprint, request
 from app.services.producto_service import ProductoService
+from app.services.storefront_service import storefront_service
+from app.services.pricing_service import pricing_service
 from app.controllers.base_controller import BaseController
 
 producto_bp = Blueprint('productos', __name__)
@@ -13,26 +15,97 @@ class ProductoController(BaseController):
     @producto_bp.route('', methods=['GET'])
     def get_all():
         try:
-            productos = ProductoService.get_all()
+            fields, error = producto_controller.get_fields()
+            if error:
+                return ProductoController.error_response(error, 400)
+
+            # GET ?ids=1,2,3 -> obtención por lotes con una sola query
+            if request.args.get('ids'):
+                ids, error = producto_controller.parse_ids(request.args.get('ids'))
+                if error:
+                    return ProductoController.error_response(error, 400)
+                return producto_controller.batch_response(ids, fields)
+
+            count_mode, error = producto_controller.get_count_mode()
+            if error:
+                return ProductoController.error_response(error, 400)
+
+            productos = producto_service.get_all(fields=fields)
             return ProductoController.success_response(
-                data=[p.to_dict() for p in productos],
-                message=f'Se encontraron {len(productos)} productos'
+                data=producto_controller.serialize_many(productos, fields),
+                message=f'Se encontraron {len(productos)} productos',
+                meta=producto_controller.count_meta(count_mode, productos)
             )
         except Exception as e:
             return ProductoController.error_response(f'Error: {str(e)}', 500)
 
+    @staticmethod
+    @producto_bp.route('/top', methods=['GET'])
+    def get_top():
+        """Más guardados en carritos (?categoria= para los de una categoría)"""
+        return producto_controller.storefront_response('top', 'productos más guardados')
+
+    @staticmethod
+    @producto_bp.route('/ofertas', methods=['GET'])
+    def get_ofertas():
+        """Productos con descuento, del mayor al menor (?categoria= opcional)"""
+        return producto_controller.storefront_response('ofertas', 'ofertas')
+
     @staticmethod
     @producto_bp.route('/<int:producto_id>', methods=['GET'])
     def get_by_id(producto_id):
         try:
-            producto = ProductoService.get_by_id(producto_id)
+            fields, error = producto_controller.get_fields()
+            if error:
+                return ProductoController.error_response(error, 400)
+            producto = producto_service.get_by_id(producto_id, fields=fields)
             if not producto:
                 return ProductoController.error_response('Producto no encontrado', 404)
             return ProductoController.success_response(
-                data=producto.to_dict(),
+                data=producto_controller.serialize_many([producto], fields)[0],
                 message='Producto encontrado'
             )
         except Exception as e:
             return ProductoController.error_response(f'Error: {str(e)}', 500)
 
+    @staticmethod
+    @producto_bp.route('/batch', methods=['POST'])
+    def get_batch():
+        """Obtención por lotes para listas largas de IDs: {"ids": [...], "fields": [...]}"""
+        try:
+            data, error = producto_controller.get_json_data()
+            if error:
+                return ProductoController.error_response(error, 400)
+            ids, error = producto_controller.parse_ids(data.get('ids'))
+            if error:
+                return ProductoController.error_response(error, 400)
+            fields, error = producto_service.parse_fields(data.get('fields'))
+            if error:
+                return ProductoController.error_response(error, 400)
+            return producto_controller.batch_response(ids, fields)
+        except Exception as e:
+            return ProductoController.error_response(f'Error: {str(e)}', 500)
+
+    def serialize_many(self, instances, fields=None):
+        """Productos serializados con precioFinal y ahorro calculados en lote"""
+        return pricing_service.annotate_products(super().serialize_many(instances, fields))
+
+    def storefront_response(self, listing, label):
+        """Página de un listado precalculado del storefront (sin consultar la base)"""
+        try:
+            limit, cursor, error = self.get_page_params()
+            if error:
+                return ProductoController.error_response(error, 400)
+            productos, meta, error = storefront_service.get_page(
+                listing, limit=limit, cursor=cursor, categoria_id=request.args.get('categoria', type=int))
+            if error:
+                return ProductoController.error_response(error, 400)
+            return ProductoController.success_response(
+                data=productos,
+                message=f'Se encontraron {len(productos)} {label}',
+                meta=meta
+            )
+        except Exception as e:
+            return ProductoController.error_response(f'Error: {str(e)}', 500)
+
 producto_controller = ProductoController()
@@ -1,12 +1,13 @@
 from flask import Blueprint, request, g
 from app.services.user_service import UserService
+from app.services.note_service import NoteService
 from app.controllers.base_controller import BaseController
 from app.utils.auth_decorators import token_required, admin_required, manager_required
-from app.services.usuario_service import UsuarioService
 
 
 user_bp = Blueprint('users', __name__)
 user_service = UserService()
+note_service = NoteService()
 
 class UserController(BaseController):
     """Controlador para operaciones de User"""
@@ -72,12 +73,21 @@ class UserController(BaseController):
             if not user:
                 return UserController.error_response('Usuario no encontrado', 404)
 
+            limit, cursor, error = user_controller.get_page_params()
+            if error:
+                return UserController.error_response(error, 400)
+
+            notes, next_cursor, error = note_service.get_page(user_id=user_id, limit=limit, cursor=cursor)
+            if error:
+                return UserController.error_response(error, 400)
+
             user_data = user.to_dict()
-            user_data['notes'] = [note.to_dict() for note in user.notes]
+            user_data['notes'] = [note.to_dict() for note in notes]
 
             return UserController.success_response(
                 data=user_data,
-                message=f'Usuario encontrado con {len(user.notes)} notas'
+                message=f'Usuario encontrado con {user.notes_count} notas',
+                meta={'limit': limit, 'next_cursor': next_cursor, 'total': user.notes_count}
             )
         except Exception as e:
             return UserController.error_response(f'Error al obtener usuario con notas: {str(e)}', 500)
@@ -1,13 +1,16 @@
 from flask import Blueprint, request, g
-from app.services.usuario_service import UsuarioService
+from app.services.user_service import UserService
 from app.controllers.base_controller import BaseController
 from app.utils.auth_decorators import token_required, admin_required
 
 usuario_bp = Blueprint('usuarios', __name__)
-usuario_service = UsuarioService()
+usuario_service = UserService()
 
 class UsuarioController(BaseController):
-    """Controlador para operaciones de Usuario"""
+    """Formato legado de usuarios (nombres, correoElectronico, ...) sobre la tabla users
+
+    La identidad es única: auth, carritos y emprendimientos usan users.id.
+    """
 
     def __init__(self):
         super().__init__(usuario_service)
@@ -18,9 +21,9 @@ class UsuarioController(BaseController):
     def get_all():
         """Obtener todos los usuarios"""
         try:
-            usuarios = UsuarioService.get_all()
+            usuarios = UserService.get_all()
             return UsuarioController.success_response(
-                data=[usuario.to_dict() for usuario in usuarios],
+                data=[usuario.to_usuario_dict() for usuario in usuarios],
                 message=f'Se encontraron {len(usuarios)} usuarios'
             )
         except Exception as e:
@@ -32,12 +35,12 @@ class UsuarioController(BaseController):
     def get_by_id(usuario_id):
         """Obtener usuario por ID"""
         try:
-            usuario = UsuarioService.get_by_id(usuario_id)
+            usuario = UserService.get_by_id(usuario_id)
             if not usuario:
                 return UsuarioController.error_response('Usuario no encontrado', 404)
 
             return UsuarioController.success_response(
-                data=usuario.to_dict(),
+                data=usuario.to_usuario_dict(),
                 message='Usuario encontrado'
             )
         except Exception as e:
@@ -62,9 +65,9 @@ class UsuarioController(BaseController):
                     f'Campos requeridos: {", ".join(missing_fields)}', 400
                 )
 
-            usuario = UsuarioService.create(data)
+            usuario = UserService.create(UserService.from_usuario_data(data, creating=True))
             return UsuarioController.success_response(
-                data=usuario.to_dict(),
+                data=usuario.to_usuario_dict(),
                 message=f'Usuario creado exitosamente',
                 status_code=201
             )
@@ -84,12 +87,18 @@ class UsuarioController(BaseController):
             if not data:
                 return UsuarioController.error_response('Datos JSON requeridos', 400)
 
-            usuario = UsuarioService.update(usuario_id, data)
+            # Con la identidad unificada, solo el propio usuario o un admin pueden modificarla
+            if g.current_user.id != usuario_id and not g.current_user.has_role('admin'):
+                return UsuarioController.error_response(
+                    'No tienes permisos para modificar a otro usuario', 403
+                )
+
+            usuario = UserService.update(usuario_id, UserService.from_usuario_data(data))
             if not usuario:
                 return UsuarioController.error_response('Usuario no encontrado', 404)
 
             return UsuarioController.success_response(
-                data=usuario.to_dict(),
+                data=usuario.to_usuario_dict(),
                 message='Usuario actualizado exitosamente'
             )
         except ValueError as e:
@@ -104,7 +113,7 @@ class UsuarioController(BaseController):
     def delete(usuario_id):
         """Eliminar usuario (solo admin)"""
         try:
-            success = UsuarioService.delete(usuario_id)
+            success = UserService.delete(usuario_id)
             if not success:
                 return UsuarioController.error_response('Usuario no encontrado', 404)
 
@@ -1,21 +1,24 @@
 from app import db
+from app.utils.money import Money, from_cents
 
 class Carrito(db.Model):
     __tablename__ = 'Carrito'
 
     idCarrito = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    subtotal = db.Column(db.Numeric(10, 2), nullable=False)
-    montoTotal = db.Column(db.Numeric(10, 2), nullable=False)
+    subtotal = db.Column(Money, nullable=False)  # centavos, sin descuentos
+    montoTotal = db.Column(Money, nullable=False)
 
-    idUsuario = db.Column(db.Integer, db.ForeignKey('Usuario.idUsuario'), nullable=False)
+    # Dueño del carrito: la misma identidad que autentica (users.id)
+    idUsuario = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'),
+                          nullable=False, index=True)
 
-    # Relación opcional (si tenés el modelo Usuario)
-    usuario = db.relationship('Usuario', backref=db.backref('carritos', lazy=True))
+    usuario = db.relationship('User', lazy=True, backref=db.backref(
+        'carritos', lazy=True, cascade='all, delete-orphan', passive_deletes=True))
 
     def to_dict(self):
         return {
             'idCarrito': self.idCarrito,
-            'subtotal': float(self.subtotal),
-            'montoTotal': float(self.montoTotal),
+            'subtotal': from_cents(self.subtotal),
+            'montoTotal': from_cents(self.montoTotal),
             'idUsuario': self.idUsuario
         }
@@ -7,9 +7,13 @@ class Categoria(db.Model):
     nombreCategoria = db.Column(db.String(100), nullable=False)
     descripcion = db.Column(db.String(255), nullable=True)
 
+    # Contador mantenido por eventos de Producto (ver app/utils/counters.py)
+    productos_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
     def to_dict(self):
         return {
             'idCategoria': self.idCategoria,
             'nombreCategoria': self.nombreCategoria,
-            'descripcion': self.descripcion
+            'descripcion': self.descripcion,
+            'productos_count': self.productos_count
         }
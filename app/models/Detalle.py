@@ -1,13 +1,14 @@
 from app import db
+from app.utils.money import Money, from_cents
 
 class Detalle(db.Model):
     __tablename__ = 'Detalle'
 
     idDetalle = db.Column(db.Integer, primary_key=True, autoincrement=True)
     cantidadProductos = db.Column(db.Integer, nullable=False)
-    precioUnitario = db.Column(db.Numeric(5, 2), nullable=False)
-    subtotalDetalle = db.Column(db.Numeric(5, 2), nullable=False)
-    idCarrito = db.Column(db.Integer, db.ForeignKey('Carrito.idCarrito'), nullable=False)
+    precioUnitario = db.Column(Money, nullable=False)  # centavos
+    subtotalDetalle = db.Column(Money, nullable=False)
+    idCarrito = db.Column(db.Integer, db.ForeignKey('Carrito.idCarrito', ondelete='CASCADE'), nullable=False)
     idProducto = db.Column(db.Integer, db.ForeignKey('Producto.idProducto'), nullable=False)
 
     def to_dict(self):
@@ -15,8 +16,8 @@ class Detalle(db.Model):
         return {
             'idDetalle': self.idDetalle,
             'cantidadProductos': self.cantidadProductos,
-            'precioUnitario': float(self.precioUnitario),
-            'subtotalDetalle': float(self.subtotalDetalle),
+            'precioUnitario': from_cents(self.precioUnitario),
+            'subtotalDetalle': from_cents(self.subtotalDetalle),
             'idCarrito': self.idCarrito,
             'idProducto': self.idProducto
         }
\ No newline at end of file
@@ -1,14 +1,45 @@
+import unicodedata
+from sqlalchemy.orm import validates
 from app import db
 
 class Emprendimiento(db.Model):
     __tablename__ = 'Emprendimiento'
+    __table_args__ = (
+        # Directorio ordenado por (nombre, id): búsqueda por prefijo y paginación keyset
+        db.Index('ix_emprendimiento_nombre_id', 'nombreEmprendimiento', 'idEmprendimiento'),
+        db.Index('ix_emprendimiento_ciudad_nombre_id', 'ciudad', 'nombreEmprendimiento', 'idEmprendimiento'),
+        # "Mis emprendimientos": también cubre la FK idUsuario
+        db.Index('ix_emprendimiento_usuario_nombre_id', 'idUsuario', 'nombreEmprendimiento', 'idEmprendimiento'),
+    )
 
     idEmprendimiento = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    nombreEmprendimiento = db.Column(db.String(100), nullable=False)
+    # En SQLite, NOCASE como el collation _ci de MySQL: el LIKE por prefijo recorre un rango del índice
+    nombreEmprendimiento = db.Column(
+        db.String(100).with_variant(db.String(100, collation='NOCASE'), 'sqlite'), nullable=False)
     descripcion = db.Column(db.String(255), nullable=True)
     ubicacion = db.Column(db.String(150), nullable=True)
+    # Ciudad normalizada de ubicacion (se mantiene sola): el filtro ?ubicacion= es una igualdad indexada
+    ciudad = db.Column(db.String(150), nullable=True)
     telefono = db.Column(db.String(20), nullable=True)
-    idUsuario = db.Column(db.Integer, db.ForeignKey('Usuario.idUsuario'), nullable=False)
+    # Dueño del emprendimiento: la misma identidad que autentica (users.id)
+    idUsuario = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+
+    usuario = db.relationship('User', lazy=True, backref=db.backref(
+        'emprendimientos', lazy=True, cascade='all, delete-orphan', passive_deletes=True))
+
+    @staticmethod
+    def city_key(ubicacion):
+        """Ciudad normalizada de una ubicación: 'Córdoba,  Centro' -> 'cordoba'"""
+        if not ubicacion:
+            return None
+        city = unicodedata.normalize('NFKD', ubicacion.split(',')[0])
+        city = ''.join(ch for ch in city if not unicodedata.combining(ch))
+        return ' '.join(city.casefold().split()) or None
+
+    @validates('ubicacion')
+    def validate_ubicacion(self, key, value):
+        self.ciudad = self.city_key(value)
+        return value
 
     def to_dict(self):
         return {
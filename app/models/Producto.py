@@ -1,21 +1,32 @@
 from app import db
+from app.utils.money import Money, from_cents
+from app.utils.counters import maintain_counter
 
 class Producto(db.Model):
     __tablename__ = 'Producto'
+    __table_args__ = (
+        # Productos de un emprendimiento paginados por id (keyset)
+        db.Index('ix_producto_emprendimiento_id', 'idEmprendimiento', 'idProducto'),
+    )
 
     idProducto = db.Column(db.Integer, primary_key=True, autoincrement=True)
     nombreProducto = db.Column(db.String(255), nullable=False)
     descripcionProducto = db.Column(db.Text)
-    precio = db.Column(db.Numeric(5, 2), nullable=False)
+    precio = db.Column(Money, nullable=False)  # centavos
     disponibilidad = db.Column(db.Integer, nullable=False)
     descuento = db.Column(db.Numeric(5, 2))
     imagenProductoPrincipal = db.Column(db.String(255))
     imagenProductoAdicionales = db.Column(db.String(255))
     vecesGuardadoEnCarrito = db.Column(db.Integer, default=0)
     idCategoria = db.Column(db.Integer, db.ForeignKey('Categoria.idCategoria'))
+    # Vendedor; si se borra el emprendimiento el producto queda sin vendedor (los detalles lo referencian)
+    idEmprendimiento = db.Column(db.Integer, db.ForeignKey('Emprendimiento.idEmprendimiento', ondelete='SET NULL'))
 
     # Relación con Detalle (un producto puede estar en muchos detalles)
+    # Lazy: ningún serializador las recorre; pedirlas con selectinload() donde se necesiten
     detalles = db.relationship('Detalle', backref='producto', lazy=True)
+    emprendimiento = db.relationship('Emprendimiento', lazy=True, backref=db.backref(
+        'productos', lazy=True, passive_deletes=True))
 
     def to_dict(self):
         """Convertir a diccionario"""
@@ -23,11 +34,15 @@ class Producto(db.Model):
             'idProducto': self.idProducto,
             'nombreProducto': self.nombreProducto,
             'descripcionProducto': self.descripcionProducto,
-            'precio': float(self.precio),
+            'precio': from_cents(self.precio),
             'disponibilidad': self.disponibilidad,
             'descuento': float(self.descuento) if self.descuento else None,
             'imagenProductoPrincipal': self.imagenProductoPrincipal,
             'imagenProductoAdicionales': self.imagenProductoAdicionales,
             'vecesGuardadoEnCarrito': self.vecesGuardadoEnCarrito,
-            'idCategoria': self.idCategoria
-        }
\ No newline at end of file
+            'idCategoria': self.idCategoria,
+            'idEmprendimiento': self.idEmprendimiento
+        }
+
+# Mantener Categoria.productos_count al crear, borrar o mover productos
+maintain_counter(Producto, 'idCategoria', 'Categoria', 'idCategoria', 'productos_count')
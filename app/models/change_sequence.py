@@ -0,0 +1,11 @@
+from app import db
+
+class ChangeSequence(db.Model):
+    """Contador por tabla que numera los cambios para los feeds de sincronización"""
+    __tablename__ = 'change_sequences'
+
+    name = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+
+    def __repr__(self):
+        return f'<ChangeSequence {self.name}={self.value}>'
@@ -1,8 +1,19 @@
 from datetime import datetime
 from app import db
+from app.utils.change_sequence import ChangeSequenceMixin
+from app.utils.counters import maintain_counter
+from app.utils.soft_delete import SoftDeleteMixin
 
-class Note(db.Model):
+class Note(SoftDeleteMixin, ChangeSequenceMixin, db.Model):
     __tablename__ = 'notes'
+    __table_args__ = (
+        # Paginación keyset por (created_at, id): notas de un usuario y listado global
+        db.Index('ix_notes_user_created_id', 'user_id', 'created_at', 'id'),
+        db.Index('ix_notes_created_id', 'created_at', 'id'),
+        # Feed de cambios (/api/notes/changes) por (change_seq, id): de un usuario y global
+        db.Index('ix_notes_user_change_seq_id', 'user_id', 'change_seq', 'id'),
+        db.Index('ix_notes_change_seq_id', 'change_seq', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -10,8 +21,8 @@ class Note(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Foreign key hacia User
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    # Foreign key hacia User (la base de datos borra las notas junto con el usuario)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
 
     def __repr__(self):
         return f'<Note {self.title}>'
@@ -24,8 +35,12 @@ class Note(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'user_id': self.user_id,
+            'deleted_at': self.deleted_at.isoformat() if self.deleted_at else None,
             'user': {
                 'id': self.user.id,
                 'username': self.user.username
             } if self.user else None
         }
+
+# Mantener users.notes_count al crear, borrar o reasignar notas
+maintain_counter(Note, 'user_id', 'users', 'id', 'notes_count', soft_delete_attr='deleted_at')
@@ -2,9 +2,10 @@ from datetime import datetime, timedelta
 from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
 from app import db
+from app.utils.soft_delete import SoftDeleteMixin
 from config import Config
 
-class User(db.Model):
+class User(SoftDeleteMixin, db.Model):
     __tablename__ = 'users'
 
     id = db.Column(db.Integer, primary_key=True)
@@ -18,6 +19,9 @@ class User(db.Model):
     phone = db.Column(db.String(20), nullable=True)
     address = db.Column(db.Text, nullable=True)
     gender = db.Column(db.Enum('male', 'female', 'other', 'prefer_not_to_say', name='user_gender'), nullable=True)
+    country = db.Column(db.String(13), nullable=True)
+    department = db.Column(db.String(12), nullable=True)
+    profile_photo = db.Column(db.String(200), nullable=True)
 
     # Sistema
     role = db.Column(db.Enum('admin', 'manager', 'client', name='user_roles'),
@@ -27,8 +31,14 @@ class User(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_login = db.Column(db.DateTime)
 
+    # Contador mantenido por eventos de Note (ver app/utils/counters.py)
+    notes_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
     # Relación con Notes (un usuario puede tener muchas notas)
-    notes = db.relationship('Note', backref='user', lazy=True, cascade='all, delete-orphan')
+    # passive_deletes: al borrar el usuario no se cargan sus notas, las borra ON DELETE CASCADE
+    # Note.user se carga con selectin: una query IN por lista de notas (Note.to_dict lo usa)
+    notes = db.relationship('Note', backref=db.backref('user', lazy='selectin'), lazy=True,
+                            cascade='all, delete-orphan', passive_deletes=True)
 
     def __repr__(self):
         full_name = f"{self.name} {self.last_name}".strip() if self.name or self.last_name else self.username
@@ -54,18 +64,24 @@ class User(db.Model):
         return jwt.encode(payload, Config.SECRET_KEY, algorithm='HS256')
 
     @staticmethod
-    def verify_token(token):
-        """Verificar y decodificar token JWT"""
+    def decode_token(token):
+        """Decodificar token JWT; retorna el user_id o None si es inválido o expiró"""
         try:
             payload = jwt.decode(token, Config.SECRET_KEY, algorithms=['HS256'])
-            user = User.query.get(payload['user_id'])
-            if user and user.is_active:
-                return user
         except jwt.ExpiredSignatureError:
             return None  # Token expirado
         except jwt.InvalidTokenError:
             return None  # Token inválido
-        return None
+        return payload.get('user_id')
+
+    @staticmethod
+    def verify_token(token):
+        """Verificar y decodificar token JWT"""
+        user_id = User.decode_token(token)
+        if user_id is None:
+            return None
+        user = User.query.get(user_id)
+        return user if user and user.is_active else None
 
     def has_role(self, role):
         """Verificar si el usuario tiene un rol específico"""
@@ -111,12 +127,15 @@ class User(db.Model):
             'phone': self.phone,
             'address': self.address,
             'gender': self.gender,
+            'country': self.country,
+            'department': self.department,
+            'profile_photo': self.profile_photo,
             'role': self.role,
             'is_active': self.is_active,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'last_login': self.last_login.isoformat() if self.last_login else None,
-            'notes_count': len(self.notes)
+            'notes_count': self.notes_count
         }
 
         if include_sensitive:
@@ -124,6 +143,20 @@ class User(db.Model):
 
         return data
 
+    def to_usuario_dict(self):
+        """Formato legado de /api/usuarios (antigua tabla Usuario)"""
+        return {
+            'idUsuario': self.id,
+            'nombres': self.name,
+            'apellidos': self.last_name,
+            'correoElectronico': self.email,
+            'telefono': self.phone,
+            'direccion': self.address,
+            'pais': self.country,
+            'departamento': self.department,
+            'fotoPerfil': self.profile_photo
+        }
+
     def to_public_dict(self):
         """Convertir a diccionario público (sin información sensible)"""
         return {
@@ -132,5 +165,5 @@ class User(db.Model):
             'full_name': self.full_name,
             'role': self.role,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'notes_count': len(self.notes)
+            'notes_count': self.notes_count
         }
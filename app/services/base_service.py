@@ -1,20 +1,119 @@
-from app import db
+from datetime import datetime
+from app import db, replica_read
+from sqlalchemy import inspect, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import lazyload, load_only
+from sqlalchemy.orm.util import identity_key
+from app.utils.change_sequence import next_change_seq
+from app.utils.counters import affected_parents, recount
+from app.utils.integrity import unique_violation_message
+from app.utils.tracing import trace_methods
 
 class BaseService:
     """Servicio base con operaciones CRUD comunes (DRY principle)"""
 
+    # columna única -> mensaje al violar su índice (ver app/utils/integrity.py)
+    unique_messages = {}
+
     def __init__(self, model):
         self.model = model
 
-    def get_all(self):
+    def __init_subclass__(cls, **kwargs):
+        """Cada servicio concreto registra un span por método público (ver app/utils/tracing.py)"""
+        super().__init_subclass__(**kwargs)
+        trace_methods(cls)
+
+    def parse_fields(self, fields_param):
+        """Convertir el parámetro ?fields=a,b,c en una lista de columnas válidas"""
+        if not fields_param:
+            return None, None
+
+        if isinstance(fields_param, str):
+            fields_param = fields_param.split(',')
+        fields = [str(f).strip() for f in fields_param if str(f).strip()]
+        if not fields:
+            return None, None
+
+        mapper = inspect(self.model)
+        valid_fields = set(mapper.column_attrs.keys())
+        invalid_fields = [f for f in fields if f not in valid_fields]
+        if invalid_fields:
+            return None, f'Campos inválidos: {", ".join(invalid_fields)}'
+
+        # La clave primaria siempre se incluye para mantener la identidad del objeto
+        pk_fields = [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+        for pk in reversed(pk_fields):
+            if pk not in fields:
+                fields.insert(0, pk)
+
+        return fields, None
+
+    def projection(self, fields):
+        """Opciones de carga para ?fields=: solo esas columnas y ninguna relación
+
+        fields solo admite columnas, así que la serialización no recorre
+        relaciones; sin lazyload('*') un selectin (Note.user) se dispararía igual
+        y, sin la FK en load_only, con un JOIN de vuelta a la tabla padre.
+        """
+        return [load_only(*[getattr(self.model, f) for f in fields]), lazyload('*')]
+
+    def _query(self, fields=None):
+        """Query base; si hay fields, solo se seleccionan esas columnas"""
+        query = self.model.query
+        if fields:
+            query = query.options(*self.projection(fields))
+        return query
+
+    def select_statement(self, fields=None):
+        """Equivalente 2.0 de _query (select) para ejecutar también en una AsyncSession"""
+        statement = select(self.model)
+        if fields:
+            statement = statement.options(*self.projection(fields))
+        return statement
+
+    @replica_read
+    def get_all(self, fields=None):
         """Obtener todos los registros"""
-        return self.model.query.all()
+        return self._query(fields).all()
 
-    def get_by_id(self, id):
+    @replica_read
+    def get_by_id(self, id, fields=None):
         """Obtener registro por ID"""
+        if fields:
+            pk = inspect(self.model).primary_key[0]
+            return self._query(fields).filter(pk == id).first()
         return self.model.query.get(id)
 
+    @replica_read
+    def get_many(self, ids, fields=None):
+        """Obtener varios registros por ID con una sola query IN
+
+        Retorna (instancias en el orden pedido, IDs no encontrados).
+        Primero se consulta el identity map de la sesión para no volver a
+        pedir a la base de datos objetos ya cargados en esta request.
+        """
+        instances = []
+        pending = []
+        for id in ids:
+            instance = db.session.identity_map.get(identity_key(self.model, id))
+            if instance is not None:
+                instances.append(instance)
+            else:
+                pending.append(id)
+
+        if pending:
+            pk = inspect(self.model).primary_key[0]
+            instances.extend(self._query(fields).filter(pk.in_(pending)).all())
+
+        return self.match_ids(ids, instances)
+
+    def match_ids(self, ids, instances):
+        """Ordenar instancias según los IDs pedidos; retorna (instancias, IDs no encontrados)"""
+        mapper = inspect(self.model)
+        pk_attr = mapper.get_property_by_column(mapper.primary_key[0]).key
+        found = {getattr(instance, pk_attr): instance for instance in instances}
+        return [found[id] for id in ids if id in found], [id for id in ids if id not in found]
+
     def create(self, data):
         """Crear nuevo registro"""
         try:
@@ -24,7 +123,7 @@ class BaseService:
             return instance, None
         except IntegrityError as e:
             db.session.rollback()
-            return None, str(e)
+            return None, unique_violation_message(e, self.unique_messages) or str(e)
         except Exception as e:
             db.session.rollback()
             return None, str(e)
@@ -32,7 +131,8 @@ class BaseService:
     def update(self, id, data):
         """Actualizar registro existente"""
         try:
-            instance = self.get_by_id(id)
+            # Las escrituras leen siempre del primario
+            instance = self.model.query.get(id)
             if not instance:
                 return None, "Registro no encontrado"
 
@@ -44,7 +144,7 @@ class BaseService:
             return instance, None
         except IntegrityError as e:
             db.session.rollback()
-            return None, str(e)
+            return None, unique_violation_message(e, self.unique_messages) or str(e)
         except Exception as e:
             db.session.rollback()
             return None, str(e)
@@ -52,13 +152,55 @@ class BaseService:
     def delete(self, id):
         """Eliminar registro"""
         try:
-            instance = self.get_by_id(id)
+            instance = self.model.query.get(id)
             if not instance:
                 return False, "Registro no encontrado"
 
-            db.session.delete(instance)
+            # Los modelos con SoftDeleteMixin quedan como tombstone
+            if hasattr(instance, 'soft_delete'):
+                instance.soft_delete()
+            else:
+                db.session.delete(instance)
             db.session.commit()
             return True, None
         except Exception as e:
             db.session.rollback()
             return False, str(e)
+
+    def delete_where(self, *criteria, hard=False):
+        """Borrar en una sola sentencia todas las filas que cumplen el filtro
+
+        No carga las instancias: los modelos con SoftDeleteMixin reciben un
+        UPDATE de deleted_at (salvo hard=True) y el resto un DELETE, con los
+        hijos borrados por ON DELETE CASCADE. Como no hay eventos ORM, los
+        contadores mantenidos de los padres afectados se recalculan en la
+        misma transacción. Retorna (filas_afectadas, error).
+        """
+        if not criteria:
+            return None, "Se requiere al menos un filtro"
+        try:
+            soft = hasattr(self.model, 'deleted_at') and not hard
+            if soft:
+                criteria = criteria + (self.model.deleted_at.is_(None),)
+            parents = affected_parents(self.model, criteria)
+            query = self.model.query.filter(*criteria)
+            if soft:
+                now = datetime.utcnow()
+                values = {self.model.deleted_at: now}
+                if hasattr(self.model, 'updated_at'):
+                    values[self.model.updated_at] = now
+                if hasattr(self.model, 'change_seq'):
+                    values[self.model.change_seq] = next_change_seq(
+                        db.session.connection(), self.model.__tablename__)
+                affected = query.update(values, synchronize_session=False)
+            else:
+                affected = query.delete(synchronize_session=False)
+            recount(parents)
+            db.session.commit()
+            return affected, None
+        except Exception as e:
+            db.session.rollback()
+            return None, str(e)
+
+
+trace_methods(BaseService)
@@ -1,6 +1,12 @@
 from app.models.Carrito import Carrito
 from app.services.base_service import BaseService
+from app import replica_read
 
 class CarritoService(BaseService):
     def __init__(self):
         super().__init__(Carrito)
+
+    @replica_read
+    def get_by_user(self, user_id, fields=None):
+        """Carritos de un usuario (índice sobre idUsuario -> users.id)"""
+        return self._query(fields).filter(Carrito.idUsuario == user_id).all()
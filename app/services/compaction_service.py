@@ -0,0 +1,78 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from app import db
+from app.models.note import Note
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+class CompactionService:
+    """Purga de tombstones (filas con deleted_at) más viejos que la retención
+
+    Se borra en lotes acotados, con un commit por lote, para no mantener
+    locks largos ni generar una transacción enorme. Las notas de usuarios
+    borrados se purgan antes que los propios usuarios (FK notes.user_id).
+    """
+
+    def cutoff(self):
+        """Fecha límite: los tombstones anteriores se pueden purgar"""
+        days = current_app.config['SOFT_DELETE_RETENTION_DAYS']
+        return datetime.utcnow() - timedelta(days=days)
+
+    def _purge(self, model, criteria, batch_size):
+        """Borrar en lotes las filas que cumplen el criterio; retorna cuántas se borraron"""
+        pk = model.__mapper__.primary_key[0]
+        total = 0
+        while True:
+            ids = [row[0] for row in db.session.query(pk)
+                   .filter(*criteria)
+                   .execution_options(include_deleted=True)
+                   .limit(batch_size).all()]
+            if not ids:
+                return total
+            db.session.execute(model.__table__.delete().where(pk.in_(ids)))
+            db.session.commit()
+            total += len(ids)
+
+    def compact(self, batch_size=None):
+        """Purgar tombstones vencidos de notas y usuarios; retorna los totales"""
+        batch_size = batch_size or current_app.config['COMPACTION_BATCH_SIZE']
+        cutoff = self.cutoff()
+        expired_users = (db.session.query(User.id)
+                         .filter(User.deleted_at < cutoff)
+                         .execution_options(include_deleted=True))
+
+        notes = self._purge(Note, [Note.deleted_at < cutoff], batch_size)
+        notes += self._purge(Note, [Note.user_id.in_(expired_users.scalar_subquery())], batch_size)
+        users = self._purge(User, [User.deleted_at < cutoff], batch_size)
+        return {'notes': notes, 'users': users}
+
+    def start_background(self, app, interval=None):
+        """Compactar periódicamente en un thread daemon (COMPACTION_INTERVAL > 0)"""
+        interval = interval or app.config['COMPACTION_INTERVAL']
+        if not interval:
+            return None
+
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                with app.app_context():
+                    try:
+                        purged = self.compact()
+                        if purged['notes'] or purged['users']:
+                            logger.info(f"🧹 Tombstones purgados: {purged}")
+                    except Exception as e:
+                        db.session.rollback()
+                        logger.error(f"❌ Error en la compactación de tombstones: {e}")
+                    finally:
+                        db.session.remove()
+
+        thread = threading.Thread(target=run, name='tombstone-compaction', daemon=True)
+        thread.start()
+        return stop
+
+
+compaction_service = CompactionService()
@@ -0,0 +1,101 @@
+import threading
+import time
+from sqlalchemy import Select, func, select, text
+from app import db, replica_read
+from app.utils.tracing import trace_methods
+
+@trace_methods
+class CountService:
+    """Servicio de conteos: exacto, aproximado o ninguno según el endpoint
+
+    - exact: COUNT(*) sobre la query filtrada (para conjuntos pequeños)
+    - approx: estadísticas de la tabla (information_schema en MySQL), cacheadas
+    - none: no se cuenta
+    Los agregados calientes (notas por usuario, productos por categoría) se
+    leen de contadores mantenidos, ver app/utils/counters.py.
+    """
+
+    MODES = ('exact', 'approx', 'none')
+
+    def __init__(self, approx_ttl=60):
+        self.approx_ttl = approx_ttl
+        self._approx_cache = {}
+        self._lock = threading.Lock()
+
+    def parse_mode(self, mode, default='exact'):
+        """Validar el parámetro ?count=exact|approx|none"""
+        mode = (mode or default).lower()
+        if mode not in self.MODES:
+            return None, f'count inválido. Opciones: {", ".join(self.MODES)}'
+        return mode, None
+
+    @replica_read
+    def exact(self, query):
+        """COUNT(*) exacto de una query o un select (sin ORDER BY, que no aporta al conteo)"""
+        if isinstance(query, Select):
+            return db.session.scalar(self.exact_statement(query))
+        return query.order_by(None).count()
+
+    def exact_statement(self, statement):
+        """SELECT COUNT(*) sobre un select (también para la AsyncSession de app/async_api.py)"""
+        return select(func.count()).select_from(statement.order_by(None).subquery())
+
+    def approx_statement(self, model, dialect_name):
+        """Sentencia del total aproximado de la tabla del modelo"""
+        if dialect_name == 'mysql':
+            return text("SELECT TABLE_ROWS FROM information_schema.TABLES "
+                        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+                        ).bindparams(table=model.__table__.name)
+        # Otros motores (SQLite en tests) no exponen estadísticas: conteo exacto cacheado
+        return select(func.count()).select_from(model.__table__)
+
+    def cached_approx(self, model):
+        """Total aproximado cacheado y vigente, o None"""
+        with self._lock:
+            cached = self._approx_cache.get(model.__table__.name)
+        if cached and time.monotonic() - cached[1] < self.approx_ttl:
+            return cached[0]
+        return None
+
+    def store_approx(self, model, value):
+        with self._lock:
+            self._approx_cache[model.__table__.name] = (value, time.monotonic())
+
+    @replica_read
+    def approx(self, model):
+        """Total aproximado de filas de la tabla completa del modelo"""
+        value = self.cached_approx(model)
+        if value is None:
+            statement = self.approx_statement(model, db.session.get_bind().dialect.name)
+            value = db.session.execute(statement).scalar() or 0
+            self.store_approx(model, value)
+        return value
+
+    def count(self, model, mode, query=None):
+        """Contar según el modo; approx solo aplica a totales de tabla completa"""
+        if mode == 'none':
+            return None
+        if mode == 'approx' and query is None:
+            return self.approx(model)
+        return self.exact(query if query is not None else model.query)
+
+    def rebuild_counters(self):
+        """Recalcular los contadores mantenidos (tras cargas o borrados masivos)"""
+        from app.models.Categoria import Categoria
+        from app.models.Producto import Producto
+        from app.models.note import Note
+        from app.models.user import User
+
+        notes_per_user = (select(func.count(Note.id))
+                          .where(Note.user_id == User.id, Note.deleted_at.is_(None))
+                          .scalar_subquery())
+        db.session.execute(User.__table__.update().values(notes_count=notes_per_user))
+
+        products_per_category = (select(func.count(Producto.idProducto))
+                                 .where(Producto.idCategoria == Categoria.idCategoria)
+                                 .scalar_subquery())
+        db.session.execute(Categoria.__table__.update().values(productos_count=products_per_category))
+        db.session.commit()
+
+
+count_service = CountService()
@@ -1,6 +1,81 @@
 from app.models.Emprendimiento import Emprendimiento
 from app.services.base_service import BaseService
+from app import db, replica_read
+from app.utils.pagination import decode_cursor, encode_cursor
+from sqlalchemy import tuple_
+
+def like_prefix(value):
+    """Patrón LIKE 'valor%' con los comodines del valor escapados (escape '/')"""
+    escaped = value.replace('/', '//').replace('%', '/%').replace('_', '/_')
+    return f'{escaped}%'
+
 
 class EmprendimientoService(BaseService):
     def __init__(self):
         super().__init__(Emprendimiento)
+
+    @replica_read
+    def get_by_user(self, user_id, fields=None):
+        """Emprendimientos de un usuario (índice sobre idUsuario -> users.id)"""
+        return self._query(fields).filter(Emprendimiento.idUsuario == user_id).all()
+
+    def directory_statement(self, nombre=None, ubicacion=None, user_id=None, fields=None):
+        """select del directorio filtrado por prefijo de nombre, ciudad y dueño (sin orden ni cursor)
+
+        La ciudad se compara por igualdad con la columna normalizada y el
+        nombre con un LIKE 'prefijo%' cuyo patrón viaja armado como parámetro:
+        así ambos filtros son un rango del índice (ciudad, nombre, id).
+        """
+        model = self.model
+        statement = self.select_statement(fields)
+        if user_id:
+            statement = statement.where(model.idUsuario == user_id)
+        if ubicacion:
+            statement = statement.where(model.ciudad == model.city_key(ubicacion))
+        if nombre:
+            statement = statement.where(model.nombreEmprendimiento.like(like_prefix(nombre), escape='/'))
+        return statement
+
+    def search_statement(self, nombre=None, ubicacion=None, user_id=None, limit=20, cursor=None, fields=None):
+        """select de una página del directorio (lo ejecuta search o el modo async); retorna (select, error)"""
+        model = self.model
+        if fields and 'nombreEmprendimiento' not in fields:
+            # El cursor necesita el nombre: se carga aunque no se serialice
+            fields = fields + ['nombreEmprendimiento']
+        statement = self.directory_statement(nombre, ubicacion, user_id, fields)
+
+        if cursor:
+            values, error = decode_cursor(cursor)
+            if error:
+                return None, error
+            if len(values) != 2 or not isinstance(values[0], str) or not isinstance(values[1], int):
+                return None, 'cursor inválido'
+            statement = statement.where(
+                tuple_(model.nombreEmprendimiento, model.idEmprendimiento) > tuple_(values[0], values[1])
+            )
+
+        return statement.order_by(model.nombreEmprendimiento, model.idEmprendimiento).limit(limit + 1), None
+
+    @staticmethod
+    def finish_page(emprendimientos, limit):
+        """Recortar las limit + 1 filas leídas; retorna (emprendimientos, next_cursor)"""
+        if len(emprendimientos) <= limit:
+            return emprendimientos, None
+        emprendimientos = emprendimientos[:limit]
+        last = emprendimientos[-1]
+        return emprendimientos, encode_cursor(last.nombreEmprendimiento, last.idEmprendimiento)
+
+    @replica_read
+    def search(self, nombre=None, ubicacion=None, user_id=None, limit=20, cursor=None, fields=None):
+        """Directorio por prefijo de nombre/ubicación y dueño, paginado por keyset
+
+        Orden alfabético por (nombreEmprendimiento, idEmprendimiento); cada
+        combinación de filtros tiene un índice que termina en esas columnas
+        (ver __table_args__ del modelo), así que una página es un range scan
+        de limit + 1 filas sin OFFSET. Retorna (emprendimientos, next_cursor, error).
+        """
+        statement, error = self.search_statement(nombre, ubicacion, user_id, limit, cursor, fields)
+        if error:
+            return None, None, error
+        emprendimientos, next_cursor = self.finish_page(db.session.scalars(statement).all(), limit)
+        return emprendimientos, next_cursor, None
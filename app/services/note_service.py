@@ -1,6 +1,12 @@
 from app.models.note import Note
 from app.services.base_service import BaseService
-from app import db
+from datetime import datetime, timedelta
+from flask import current_app
+from app import db, replica_read
+from app.utils.pagination import decode_cursor, encode_cursor, parse_datetime
+from sqlalchemy import select, tuple_
+
+SYNC_TOKEN_EXPIRED = 'token since expirado: sincronizar de nuevo desde el inicio'
 
 class NoteService(BaseService):
     """Servicio para operaciones específicas de Note"""
@@ -9,21 +15,25 @@ class NoteService(BaseService):
         super().__init__(Note)
 
     @staticmethod
+    @replica_read
     def get_all():
         """Obtener todas las notas"""
         return Note.query.all()
 
     @staticmethod
+    @replica_read
     def get_by_id(note_id):
         """Obtener nota por ID"""
         return Note.query.get(note_id)
 
     @staticmethod
+    @replica_read
     def get_by_user_id(user_id):
         """Obtener todas las notas de un usuario"""
         return Note.query.filter_by(user_id=user_id).all()
 
     @staticmethod
+    @replica_read
     def search_by_title_and_user(user_id, title_query):
         """Buscar notas por título y usuario"""
         return Note.query.filter(
@@ -95,29 +105,114 @@ class NoteService(BaseService):
 
     @staticmethod
     def delete(note_id):
-        """Eliminar nota"""
+        """Eliminar nota (borrado lógico, queda como tombstone)"""
         try:
             note = Note.query.get(note_id)
             if not note:
                 return False
 
-            db.session.delete(note)
+            note.soft_delete()
             db.session.commit()
             return True
         except Exception as e:
             db.session.rollback()
             return False
 
+    @replica_read
     def get_notes_by_user(self, user_id):
         """Obtener todas las notas de un usuario (método de instancia para compatibilidad)"""
         return self.model.query.filter_by(user_id=user_id).all()
 
-    def get_notes_by_user_paginated(self, user_id, page=1, per_page=10):
-        """Obtener notas de un usuario con paginación"""
-        return self.model.query.filter_by(user_id=user_id).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+    def page_statement(self, user_id=None, limit=20, cursor=None):
+        """select de una página keyset (lo ejecuta get_page o el modo async); retorna (select, error)"""
+        statement = select(self.model)
+        if user_id:
+            statement = statement.where(self.model.user_id == user_id)
+
+        if cursor:
+            values, error = decode_cursor(cursor)
+            if error:
+                return None, error
+            created_at = parse_datetime(values[0]) if len(values) == 2 else None
+            if created_at is None or not isinstance(values[1], int):
+                return None, 'cursor inválido'
+            statement = statement.where(
+                tuple_(self.model.created_at, self.model.id) < tuple_(created_at, values[1])
+            )
+
+        return statement.order_by(
+            self.model.created_at.desc(), self.model.id.desc()
+        ).limit(limit + 1), None
 
+    @staticmethod
+    def finish_page(notes, limit):
+        """Recortar las limit + 1 filas leídas; retorna (notas, next_cursor)"""
+        if len(notes) <= limit:
+            return notes, None
+        notes = notes[:limit]
+        return notes, encode_cursor(notes[-1].created_at, notes[-1].id)
+
+    @replica_read
+    def get_page(self, user_id=None, limit=20, cursor=None):
+        """Página de notas por keyset sobre (created_at, id), de la más nueva a la más vieja
+
+        Retorna (notas, next_cursor, error). El costo de cada página no depende
+        de su posición (sin OFFSET) y no se ejecuta COUNT(*).
+        """
+        statement, error = self.page_statement(user_id, limit, cursor)
+        if error:
+            return None, None, error
+        notes, next_cursor = self.finish_page(db.session.scalars(statement).all(), limit)
+        return notes, next_cursor, None
+
+    @replica_read
+    def get_changes(self, user_id=None, since=None, limit=100):
+        """Cambios de notas desde un token: creadas/actualizadas y eliminadas
+
+        Las notas borradas siguen en la tabla como tombstones (deleted_at), así
+        que un único recorrido por (change_seq, id) devuelve ambos tipos de
+        cambio. change_seq se asigna en orden de commit, así que el token no se
+        saltea notas confirmadas tarde ni varias escrituras en el mismo segundo.
+        El token lleva además el updated_at de la última nota: uno más viejo que
+        la retención de tombstones ya no puede ver todas las eliminaciones y se
+        rechaza con SYNC_TOKEN_EXPIRED (igual que los tokens del formato anterior).
+        Retorna (notas, eliminadas, next_token, has_more, error).
+        """
+        query = self.model.query.execution_options(include_deleted=True)
+        if user_id:
+            query = query.filter(self.model.user_id == user_id)
+
+        if since:
+            values, error = decode_cursor(since)
+            if error:
+                return None, None, None, False, 'token since inválido'
+            # Formato anterior (updated_at, id): el cliente debe sincronizar de nuevo
+            if len(values) == 2 and parse_datetime(values[0]) is not None:
+                return None, None, None, False, SYNC_TOKEN_EXPIRED
+
+            updated_at = parse_datetime(values[2]) if len(values) == 3 else None
+            if updated_at is None or not all(isinstance(v, int) for v in values[:2]):
+                return None, None, None, False, 'token since inválido'
+
+            retention = timedelta(days=current_app.config['SOFT_DELETE_RETENTION_DAYS'])
+            if updated_at < datetime.utcnow() - retention:
+                return None, None, None, False, SYNC_TOKEN_EXPIRED
+
+            query = query.filter(
+                tuple_(self.model.change_seq, self.model.id) > tuple_(values[0], values[1])
+            )
+
+        rows = query.order_by(self.model.change_seq, self.model.id).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_token = encode_cursor(rows[-1].change_seq, rows[-1].id, rows[-1].updated_at) if rows else since
+        changed = [note for note in rows if not note.is_deleted]
+        deleted = [note for note in rows if note.is_deleted]
+
+        return changed, deleted, next_token, has_more, None
+
+    @replica_read
     def search_notes_by_title(self, user_id, title_query):
         """Buscar notas por título (método de instancia para compatibilidad)"""
         return self.model.query.filter(
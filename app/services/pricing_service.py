@@ -0,0 +1,141 @@
+from sqlalchemy import update
+from sqlalchemy.orm import load_only
+from app import db, replica_read
+from app.models.Carrito import Carrito
+from app.models.Detalle import Detalle
+from app.models.Producto import Producto
+from app.utils.money import from_cents
+from app.utils.pricing import effective_prices, price_lines, to_cents
+from app.utils.tracing import trace_methods
+
+@trace_methods
+class PricingService:
+    """Motor de precios: precio final, subtotales de línea y totales de carrito
+
+    Todo se calcula en lote y en centavos enteros (ver app/utils/pricing.py),
+    así catálogo, cotizaciones y carritos usan la misma regla de descuento y
+    los clientes no tienen que recalcular nada.
+    """
+
+    def annotate_products(self, items):
+        """Agregar precioFinal y ahorro a productos serializados que traen precio y descuento"""
+        rows = [item for item in items if item.get('precio') is not None and 'descuento' in item]
+        prices = [to_cents(item['precio']) for item in rows]
+        finals = effective_prices(prices, [to_cents(item['descuento']) or 0 for item in rows])
+        for item, price, final in zip(rows, prices, finals):
+            item['precioFinal'] = from_cents(final)
+            item['ahorro'] = from_cents(price - final)
+        return items
+
+    @replica_read
+    def catalog(self, product_ids):
+        """{idProducto: (precio en centavos, descuento en puntos básicos)} con una query"""
+        productos = (Producto.query
+                     .options(load_only(Producto.idProducto, Producto.precio, Producto.descuento))
+                     .filter(Producto.idProducto.in_(set(product_ids)))
+                     .all())
+        return {p.idProducto: (p.precio, to_cents(p.descuento) or 0) for p in productos}
+
+    def quote(self, items):
+        """Cotizar [{"idProducto", "cantidad"}] sin guardar nada; retorna (cotización, error)"""
+        lines = []
+        for item in items:
+            product_id, quantity = item.get('idProducto'), item.get('cantidad', 1)
+            if not isinstance(product_id, int) or not isinstance(quantity, int) or quantity < 1:
+                return None, 'Cada item requiere idProducto y cantidad enteros (cantidad >= 1)'
+            lines.append((None, product_id, quantity))
+
+        catalog = self.catalog(product_id for _, product_id, _ in lines)
+        missing = sorted({product_id for _, product_id, _ in lines if product_id not in catalog})
+        if missing:
+            return None, f'Productos no encontrados: {", ".join(map(str, missing))}'
+
+        priced, totals = price_lines(lines, catalog)
+        return self._result(
+            [{'idProducto': product_id, 'cantidadProductos': quantity}
+             for _, product_id, quantity in lines],
+            priced, totals.get(None, (0, 0))
+        ), None
+
+    def _cart_lines(self, carrito_ids):
+        """Detalles de los carritos y sus líneas cotizadas contra el catálogo actual"""
+        detalles = (Detalle.query
+                    .filter(Detalle.idCarrito.in_(carrito_ids))
+                    .order_by(Detalle.idCarrito, Detalle.idDetalle)
+                    .all())
+        lines = [(d.idCarrito, d.idProducto, d.cantidadProductos) for d in detalles]
+        priced, totals = price_lines(lines, self.catalog(d.idProducto for d in detalles))
+        return detalles, priced, totals
+
+    @staticmethod
+    def _detalle_item(detalle):
+        return {
+            'idDetalle': detalle.idDetalle,
+            'idProducto': detalle.idProducto,
+            'cantidadProductos': detalle.cantidadProductos,
+        }
+
+    @replica_read
+    def price_carts(self, carrito_ids):
+        """Precios actuales de los detalles de varios carritos: {idCarrito: cotización}"""
+        detalles, priced, totals = self._cart_lines(carrito_ids)
+        by_cart = {carrito_id: ([], []) for carrito_id in carrito_ids}
+        for detalle, line in zip(detalles, priced):
+            by_cart[detalle.idCarrito][0].append(self._detalle_item(detalle))
+            by_cart[detalle.idCarrito][1].append(line)
+        return {
+            carrito_id: self._result(items, lines, totals.get(carrito_id, (0, 0)))
+            for carrito_id, (items, lines) in by_cart.items()
+        }
+
+    def reprice_cart(self, carrito_id):
+        """Guardar precios de detalles y totales del carrito; retorna (cotización, error)"""
+        try:
+            detalles, priced, totals = self._cart_lines([carrito_id])
+            gross, net = totals.get(carrito_id, (0, 0))
+            rows = [
+                {'idDetalle': detalle.idDetalle,
+                 'precioUnitario': line[1],
+                 'subtotalDetalle': line[3]}
+                for detalle, line in zip(detalles, priced) if line is not None
+            ]
+            if rows:
+                db.session.execute(update(Detalle), rows)
+            db.session.execute(
+                update(Carrito).where(Carrito.idCarrito == carrito_id)
+                .values(subtotal=gross, montoTotal=net)
+            )
+            db.session.commit()
+            items = [self._detalle_item(detalle) for detalle in detalles]
+            return self._result(items, priced, (gross, net)), None
+        except Exception as e:
+            db.session.rollback()
+            return None, str(e)
+
+    @staticmethod
+    def _result(items, priced, totals):
+        """Cotización: líneas con precio lista/final y totales (subtotal sin descuentos)"""
+        lineas = []
+        for item, line in zip(items, priced):
+            if line is None:
+                # Producto que ya no existe en el catálogo: no se puede cotizar
+                lineas.append(dict(item, precioUnitario=None, subtotalDetalle=None))
+                continue
+            list_price, unit, list_subtotal, subtotal = line
+            lineas.append(dict(
+                item,
+                precioLista=from_cents(list_price),
+                precioUnitario=from_cents(unit),
+                subtotalLista=from_cents(list_subtotal),
+                subtotalDetalle=from_cents(subtotal),
+            ))
+        gross, net = totals
+        return {
+            'lineas': lineas,
+            'subtotal': from_cents(gross),
+            'descuento': from_cents(gross - net),
+            'montoTotal': from_cents(net),
+        }
+
+
+pricing_service = PricingService()
@@ -1,6 +1,33 @@
 from app.models.Producto import Producto
 from app.services.base_service import BaseService
+from app import replica_read
+from app.utils.pagination import decode_cursor, encode_cursor
 
 class ProductoService(BaseService):
     def __init__(self):
         super().__init__(Producto)
+
+    @replica_read
+    def get_by_emprendimiento(self, emprendimiento_id, limit=20, cursor=None, fields=None):
+        """Productos de un emprendimiento por keyset sobre idProducto
+
+        Usa el índice (idEmprendimiento, idProducto). Retorna (productos, next_cursor, error).
+        """
+        query = self._query(fields).filter(self.model.idEmprendimiento == emprendimiento_id)
+
+        if cursor:
+            values, error = decode_cursor(cursor)
+            if error:
+                return None, None, error
+            if len(values) != 1 or not isinstance(values[0], int):
+                return None, None, 'cursor inválido'
+            query = query.filter(self.model.idProducto > values[0])
+
+        productos = query.order_by(self.model.idProducto).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(productos) > limit:
+            productos = productos[:limit]
+            next_cursor = encode_cursor(productos[-1].idProducto)
+
+        return productos, next_cursor, None
@@ -0,0 +1,263 @@
+import threading
+from bisect import bisect_right, insort
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+from app import db, replica_read, RoutingSession
+from app.models.Producto import Producto
+from app.services.pricing_service import pricing_service
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.tracing import trace_methods
+
+
+class Ranking:
+    """Claves ordenadas (la última componente es el idProducto) para paginar por keyset"""
+
+    def __init__(self):
+        self.keys = []
+
+    def add(self, key):
+        insort(self.keys, key)
+
+    def remove(self, key):
+        index = bisect_right(self.keys, key) - 1
+        if index >= 0 and self.keys[index] == key:
+            del self.keys[index]
+
+    def page(self, after, limit):
+        """limit + 1 claves posteriores a `after` (búsqueda binaria + slice)"""
+        start = bisect_right(self.keys, after) if after is not None else 0
+        return self.keys[start:start + limit + 1]
+
+
+class StorefrontSnapshot:
+    """Rankings de la home: más guardados y ofertas, globales y por categoría
+
+    Guarda el to_dict() de cada producto disponible y una lista ordenada por
+    ranking, así que servir una página es O(log n + página) sin tocar la base.
+    """
+
+    def __init__(self):
+        self.products = {}
+        self.top = Ranking()
+        self.ofertas = Ranking()
+        self.categories = {}
+        self.built_at = datetime.utcnow()
+
+    @staticmethod
+    def keys(product):
+        """(clave top, clave oferta o None) de un producto serializado"""
+        top_key = (-(product['vecesGuardadoEnCarrito'] or 0), product['idProducto'])
+        oferta_key = None
+        if product['descuento']:
+            oferta_key = (-product['descuento'], product['idProducto'])
+        return top_key, oferta_key
+
+    def put(self, product):
+        self.discard(product['idProducto'])
+        if product['disponibilidad'] <= 0:
+            return
+        top_key, oferta_key = self.keys(product)
+        self.products[product['idProducto']] = product
+        category = self.categories.setdefault(product['idCategoria'], {'top': Ranking(), 'ofertas': Ranking()})
+        self.top.add(top_key)
+        category['top'].add(top_key)
+        if oferta_key:
+            self.ofertas.add(oferta_key)
+            category['ofertas'].add(oferta_key)
+
+    def apply(self, producto_id, product):
+        """Alta/modificación (producto serializado) o baja (None)"""
+        if product is None:
+            self.discard(producto_id)
+        else:
+            self.put(product)
+
+    def discard(self, producto_id):
+        product = self.products.pop(producto_id, None)
+        if product is None:
+            return
+        top_key, oferta_key = self.keys(product)
+        category = self.categories[product['idCategoria']]
+        self.top.remove(top_key)
+        category['top'].remove(top_key)
+        if oferta_key:
+            self.ofertas.remove(oferta_key)
+            category['ofertas'].remove(oferta_key)
+
+
+@trace_methods
+class StorefrontService:
+    """Listados precalculados de la home del storefront (snapshot en memoria)
+
+    El snapshot se construye con una sola lectura de Producto y se actualiza
+    de forma incremental con los commits de este proceso (eventos del ORM).
+    Los cambios hechos por otros procesos o con UPDATE masivos no disparan
+    eventos: para esos, el snapshot se reconstruye en segundo plano cada
+    STOREFRONT_REFRESH_SECONDS mientras se sigue sirviendo el anterior.
+    """
+
+    LISTS = ('top', 'ofertas')
+
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+        self._replay = None
+
+    @replica_read
+    def build(self):
+        """Snapshot completo a partir de la tabla Producto"""
+        snapshot = StorefrontSnapshot()
+        products = [p.to_dict() for p in Producto.query.filter(Producto.disponibilidad > 0).yield_per(1000)]
+        for product in pricing_service.annotate_products(products):
+            snapshot.put(product)
+        return snapshot
+
+    def refresh(self):
+        """Reconstruir el snapshot ya mismo (p. ej. tras una carga masiva)
+
+        Los commits que llegan mientras se lee la tabla se aplican al snapshot
+        viejo y se vuelven a aplicar (en orden) sobre el nuevo antes de publicarlo.
+        """
+        with self._lock:
+            self._replay = []
+        try:
+            snapshot = self.build()
+        except Exception:
+            with self._lock:
+                self._replay = None
+            raise
+        with self._lock:
+            for producto_id, product in self._replay:
+                snapshot.apply(producto_id, product)
+            self._replay = None
+            self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        """Descartar el snapshot: la próxima lectura lo reconstruye"""
+        with self._lock:
+            self._snapshot = None
+
+    def _current(self):
+        """Snapshot vigente; si venció se reconstruye en un thread sin bloquear la request"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.refresh()
+
+        max_age = current_app.config['STOREFRONT_REFRESH_SECONDS']
+        age = (datetime.utcnow() - snapshot.built_at).total_seconds()
+        with self._lock:
+            start = bool(max_age) and age > max_age and not self._rebuilding
+            if start:
+                self._rebuilding = True
+        if start:
+            app = current_app._get_current_object()
+
+            def rebuild():
+                with app.app_context():
+                    try:
+                        self.refresh()
+                    finally:
+                        self._rebuilding = False
+                        db.session.remove()
+
+            threading.Thread(target=rebuild, name='storefront-refresh', daemon=True).start()
+        return snapshot
+
+    def apply(self, changes):
+        """Aplicar cambios confirmados: [(idProducto, producto serializado o None si se borró)]"""
+        with self._lock:
+            if self._replay is not None:
+                self._replay.extend(changes)
+            snapshot = self._snapshot
+            if snapshot is None:
+                return
+            for producto_id, product in changes:
+                snapshot.apply(producto_id, product)
+
+    def apply_committed(self, changes):
+        """Aplicar cambios ya confirmados: [(idProducto, borrado)]
+
+        Los productos que siguen vivos se releen del primario en una sesión
+        aparte (la del commit ya no puede ejecutar SQL) con una sola query.
+        Si todavía no hay snapshot no se lee nada: se construirá completo.
+        """
+        if self._snapshot is None and self._replay is None:
+            return
+        deleted = dict(changes)
+        alive = [producto_id for producto_id, is_deleted in deleted.items() if not is_deleted]
+        products = {}
+        if alive:
+            with Session(db.engine) as session:
+                rows = session.scalars(select(Producto).where(Producto.idProducto.in_(alive))).all()
+                products = {p['idProducto']: p
+                            for p in pricing_service.annotate_products([row.to_dict() for row in rows])}
+        self.apply([(producto_id, products.get(producto_id)) for producto_id in deleted])
+
+    def get_page(self, listing, limit=20, cursor=None, categoria_id=None):
+        """Página de un listado ('top' u 'ofertas'); retorna (productos, meta, error)"""
+        if listing not in self.LISTS:
+            return None, None, f'Listado inválido. Opciones: {", ".join(self.LISTS)}'
+
+        after = None
+        if cursor:
+            values, error = decode_cursor(cursor)
+            if error:
+                return None, None, error
+            if len(values) != 2 or not all(isinstance(v, (int, float)) for v in values):
+                return None, None, 'cursor inválido'
+            after = tuple(values)
+
+        snapshot = self._current()
+        with self._lock:
+            if categoria_id is not None:
+                ranking = snapshot.categories.get(categoria_id, {}).get(listing, Ranking())
+            else:
+                ranking = getattr(snapshot, listing)
+            keys = ranking.page(after, limit)
+            total = len(ranking.keys)
+            products = [snapshot.products[key[-1]] for key in keys[:limit]]
+
+        meta = {
+            'limit': limit,
+            'next_cursor': encode_cursor(*keys[limit - 1]) if len(keys) > limit else None,
+            'total': total,
+            'snapshot_at': snapshot.built_at.isoformat(),
+        }
+        return products, meta, None
+
+
+storefront_service = StorefrontService()
+
+
+def _record_change(target, deleted=False):
+    """Anotar solo (idProducto, borrado) durante el flush; se serializa tras el commit"""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('storefront_changes', []).append((target.idProducto, deleted))
+
+
+@event.listens_for(Producto, 'after_insert')
+@event.listens_for(Producto, 'after_update')
+def _producto_saved(mapper, connection, target):
+    _record_change(target)
+
+
+@event.listens_for(Producto, 'after_delete')
+def _producto_deleted(mapper, connection, target):
+    _record_change(target, deleted=True)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _apply_storefront_changes(session):
+    changes = session.info.pop('storefront_changes', None)
+    if changes:
+        storefront_service.apply_committed(changes)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _discard_storefront_changes(session):
+    session.info.pop('storefront_changes', None)
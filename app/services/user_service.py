@@ -1,6 +1,30 @@
+from datetime import datetime
+from app.models.note import Note
 from app.models.user import User
 from app.services.base_service import BaseService
-from app import db
+from app import db, replica_read
+from app.utils.change_sequence import next_change_seq
+from app.utils.integrity import unique_violation_message
+from sqlalchemy.exc import IntegrityError
+
+# Campos del formato legado de /api/usuarios -> columnas de User
+USUARIO_FIELDS = {
+    'nombres': 'name',
+    'apellidos': 'last_name',
+    'correoElectronico': 'email',
+    'contraseña': 'password',
+    'telefono': 'phone',
+    'direccion': 'address',
+    'pais': 'country',
+    'departamento': 'department',
+    'fotoPerfil': 'profile_photo',
+}
+
+# Mensajes para las violaciones de los índices únicos de users
+USER_UNIQUE_MESSAGES = {
+    'username': 'El nombre de usuario ya está en uso',
+    'email': 'El email ya está registrado',
+}
 
 class UserService(BaseService):
     """Servicio para operaciones específicas de User"""
@@ -9,30 +33,68 @@ class UserService(BaseService):
         super().__init__(User)
 
     @staticmethod
+    @replica_read
     def get_all():
         """Obtener todos los usuarios"""
         return User.query.all()
 
     @staticmethod
+    @replica_read
     def get_by_id(user_id):
         """Obtener usuario por ID"""
         return User.query.get(user_id)
 
     @staticmethod
     def delete(user_id):
-        """Eliminar usuario"""
+        """Eliminar usuario (borrado lógico del usuario y sus notas)"""
         try:
             user = User.query.get(user_id)
             if not user:
                 return False
 
-            db.session.delete(user)
+            now = datetime.utcnow()
+            user.deleted_at = now
+            user.is_active = False
+            user.notes_count = 0
+            # Las notas pasan a tombstones en un solo UPDATE para que el feed de cambios las informe
+            # (las ya borradas conservan su deleted_at y no vuelven a aparecer en el feed)
+            Note.query.filter(Note.user_id == user_id, Note.deleted_at.is_(None)).update(
+                {Note.deleted_at: now, Note.updated_at: now,
+                 Note.change_seq: next_change_seq(db.session.connection(), Note.__tablename__)},
+                synchronize_session=False
+            )
             db.session.commit()
             return True
         except Exception as e:
             db.session.rollback()
             return False
 
+    @staticmethod
+    def from_usuario_data(data, creating=False):
+        """Traducir un payload legado de /api/usuarios a los campos de User
+
+        Solo se aceptan los campos legados: rol y estado no se pueden tocar por esta vía.
+        Con creating=True el username se deriva del correo; al actualizar no se toca,
+        para que cambiar el email no renombre el usuario de login.
+        """
+        translated = {USUARIO_FIELDS[key]: value for key, value in data.items() if key in USUARIO_FIELDS}
+        # La API legada no tenía username: al crear se usa el correo, único por definición
+        if creating and 'username' not in translated and translated.get('email'):
+            translated['username'] = translated['email'].strip().lower()
+        return translated
+
+    @staticmethod
+    def commit_unique():
+        """Commit que traduce violaciones de username/email únicos a ValueError"""
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            message = unique_violation_message(e, USER_UNIQUE_MESSAGES)
+            if message is None:
+                raise
+            raise ValueError(message) from e
+
     @staticmethod
     def create(data):
         """Crear nuevo usuario con validaciones"""
@@ -53,6 +115,9 @@ class UserService(BaseService):
         phone = data.get('phone', '').strip() if data.get('phone') else None
         address = data.get('address', '').strip() if data.get('address') else None
         gender = data.get('gender')
+        country = data.get('country')
+        department = data.get('department')
+        profile_photo = data.get('profile_photo')
 
         # Validaciones
         if len(username) < 3:
@@ -72,17 +137,6 @@ class UserService(BaseService):
         if phone and len(phone) < 7:
             raise ValueError('El teléfono debe tener al menos 7 caracteres')
 
-        # Verificar si el usuario ya existe
-        existing_user = User.query.filter(
-            (User.username == username) | (User.email == email)
-        ).first()
-
-        if existing_user:
-            if existing_user.username == username:
-                raise ValueError('El nombre de usuario ya está en uso')
-            else:
-                raise ValueError('El email ya está registrado')
-
         # Crear usuario
         user = User(
             username=username,
@@ -92,13 +146,17 @@ class UserService(BaseService):
             phone=phone,
             address=address,
             gender=gender,
+            country=country,
+            department=department,
+            profile_photo=profile_photo,
             role=role,
             is_active=data.get('is_active', True)
         )
         user.set_password(password)
 
+        # Los índices únicos de username/email validan la duplicación en el mismo INSERT
         db.session.add(user)
-        db.session.commit()
+        UserService.commit_unique()
 
         return user
 
@@ -110,7 +168,8 @@ class UserService(BaseService):
             return None
 
         # Campos que se pueden actualizar
-        updatable_fields = ['username', 'email', 'name', 'last_name', 'phone', 'address', 'gender', 'role', 'is_active']
+        updatable_fields = ['username', 'email', 'name', 'last_name', 'phone', 'address', 'gender',
+                            'country', 'department', 'profile_photo', 'role', 'is_active']
 
         for field in updatable_fields:
             if field in data:
@@ -119,14 +178,6 @@ class UserService(BaseService):
                     if len(new_username) < 3:
                         raise ValueError('El username debe tener al menos 3 caracteres')
 
-                    # Verificar que no exista otro usuario con ese username
-                    existing = User.query.filter(
-                        User.username == new_username,
-                        User.id != user_id
-                    ).first()
-                    if existing:
-                        raise ValueError('El nombre de usuario ya está en uso')
-
                     user.username = new_username
 
                 elif field == 'email':
@@ -134,14 +185,6 @@ class UserService(BaseService):
                     if '@' not in new_email:
                         raise ValueError('Email inválido')
 
-                    # Verificar que no exista otro usuario con ese email
-                    existing = User.query.filter(
-                        User.email == new_email,
-                        User.id != user_id
-                    ).first()
-                    if existing:
-                        raise ValueError('El email ya está registrado')
-
                     user.email = new_email
 
                 elif field == 'name':
@@ -171,6 +214,9 @@ class UserService(BaseService):
                         raise ValueError(f'Rol inválido. Roles válidos: {", ".join(valid_roles)}')
                     user.role = data[field]
 
+                elif field in ('country', 'department', 'profile_photo'):
+                    setattr(user, field, data[field] or None)
+
                 elif field == 'is_active':
                     user.is_active = bool(data[field])
 
@@ -181,30 +227,35 @@ class UserService(BaseService):
                 raise ValueError('La contraseña debe tener al menos 6 caracteres')
             user.set_password(new_password)
 
-        db.session.commit()
+        UserService.commit_unique()
         return user
 
     @staticmethod
+    @replica_read
     def get_user_with_notes(user_id):
         """Obtener usuario con sus notas"""
         return User.query.filter_by(id=user_id).first()
 
     @staticmethod
+    @replica_read
     def get_by_username(username):
         """Obtener usuario por username"""
         return User.query.filter_by(username=username).first()
 
     @staticmethod
+    @replica_read
     def get_by_email(email):
         """Obtener usuario por email"""
         return User.query.filter_by(email=email.lower()).first()
 
     @staticmethod
+    @replica_read
     def get_active_users():
         """Obtener solo usuarios activos"""
         return User.query.filter_by(is_active=True).all()
 
     @staticmethod
+    @replica_read
     def get_by_role(role):
         """Obtener usuarios por rol"""
         return User.query.filter_by(role=role).all()
@@ -0,0 +1,161 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('app.access')
+logger.propagate = False
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro con los campos de record.access"""
+
+    def format(self, record):
+        return json.dumps(getattr(record, 'access', {'message': record.getMessage()}),
+                          separators=(',', ':'), default=str)
+
+
+class BatchedStreamHandler(logging.StreamHandler):
+    """Acumula líneas y las escribe en bloque (un write por lote)"""
+
+    def __init__(self, stream=None, capacity=100):
+        super().__init__(stream)
+        self.capacity = capacity
+        self.buffer = []
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record))
+            if len(self.buffer) >= self.capacity:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.buffer:
+                self.stream.write('\n'.join(self.buffer) + '\n')
+                self.buffer = []
+            super().flush()
+        finally:
+            self.release()
+
+
+class BatchingQueueListener(QueueListener):
+    """QueueListener que vacía los lotes cuando la cola queda vacía
+
+    Con tráfico alto los registros se escriben de a `capacity`; cuando no hay
+    más pendientes se escribe lo acumulado en lugar de esperar a llenar el lote.
+    """
+
+    def dequeue(self, block):
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return super().dequeue(block)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        super().stop()
+        for handler in self.handlers:
+            handler.flush()
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started')
+    if has_request_context() and started:
+        g.db_time = g.get('db_time', 0.0) + time.perf_counter() - started.pop()
+        g.db_queries = g.get('db_queries', 0) + 1
+
+
+def init_access_log(app):
+    """Access log JSON por request, escrito desde un thread aparte (QueueListener)
+
+    Los threads de request solo encolan el registro; el I/O lo hace el
+    listener en lotes. Las respuestas 2xx/3xx se muestrean con
+    ACCESS_LOG_SAMPLE_RATE; errores y requests lentas se registran siempre.
+    """
+    app.config.setdefault('ACCESS_LOG_ENABLED', True)
+    app.config.setdefault('ACCESS_LOG_FILE', None)
+    app.config.setdefault('ACCESS_LOG_SAMPLE_RATE', 1.0)
+    app.config.setdefault('ACCESS_LOG_SLOW_MS', 500)
+    app.config.setdefault('ACCESS_LOG_BATCH_SIZE', 100)
+
+    if not app.config['ACCESS_LOG_ENABLED']:
+        return None
+
+    # Un solo pipeline por proceso: si se crea otra app, reemplaza al anterior
+    previous = getattr(logger, 'listener', None)
+    if previous is not None:
+        previous.stop()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    path = app.config['ACCESS_LOG_FILE']
+    stream = open(path, 'a', encoding='utf-8') if path else sys.stdout
+    sink = BatchedStreamHandler(stream, capacity=app.config['ACCESS_LOG_BATCH_SIZE'])
+    sink.setFormatter(JsonFormatter())
+
+    records = queue.Queue(-1)
+    listener = BatchingQueueListener(records, sink)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(QueueHandler(records))
+    logger.setLevel(logging.INFO)
+    logger.listener = app.extensions['access_log'] = listener
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+        g.db_time = 0.0
+        g.db_queries = 0
+
+    @app.after_request
+    def log_request(response):
+        started = g.get('request_started')
+        if started is None:
+            return response
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        sample_rate = 1.0
+        if response.status_code < 400 and latency_ms < app.config['ACCESS_LOG_SLOW_MS']:
+            sample_rate = app.config['ACCESS_LOG_SAMPLE_RATE']
+            if random.random() >= sample_rate:
+                return response
+
+        user = g.get('current_user')
+        logger.info('access', extra={'access': {
+            'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'method': request.method,
+            'route': request.url_rule.rule if request.url_rule else None,
+            'endpoint': request.endpoint,
+            'path': request.path,
+            'status': response.status_code,
+            'latency_ms': round(latency_ms, 2),
+            'db_ms': round(g.get('db_time', 0.0) * 1000, 2),
+            'queries': g.get('db_queries', 0),
+            'user_id': user.id if user is not None else None,
+            'trace_id': g.get('trace_id'),
+            'bytes': response.calculate_content_length(),
+            'sample_rate': sample_rate,
+        }})
+        return response
+
+    return listener
@@ -1,46 +1,72 @@
 from functools import wraps
 from flask import request, jsonify, g
 from app.models.user import User
+from app.utils.tracing import start_span
 
-def token_required(f):
-    """Decorador para requerir token JWT válido"""
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        token = None
+INVALID_TOKEN = 'Token inválido o expirado'
 
-        # Buscar token en headers
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            try:
-                token = auth_header.split(" ")[1]  # Bearer TOKEN
-            except IndexError:
-                return jsonify({
-                    'success': False,
-                    'message': 'Formato de token inválido. Use: Bearer <token>'
-                }), 401
+def bearer_user_id(auth_header):
+    """Header Authorization 'Bearer <token>' -> (user_id, mensaje de error)
 
-        if not token:
-            return jsonify({
-                'success': False,
-                'message': 'Token de acceso requerido'
-            }), 401
+    Compartido con el modo async (app/async_api.py), que solo cambia cómo
+    se carga el usuario.
+    """
+    if auth_header is None:
+        return None, 'Token de acceso requerido'
 
-        try:
-            current_user = User.verify_token(token)
-            if current_user is None:
-                return jsonify({
-                    'success': False,
-                    'message': 'Token inválido o expirado'
-                }), 401
+    try:
+        token = auth_header.split(" ")[1]  # Bearer TOKEN
+    except IndexError:
+        return None, 'Formato de token inválido. Use: Bearer <token>'
+
+    if not token:
+        return None, 'Token de acceso requerido'
+
+    user_id = User.decode_token(token)
+    if user_id is None:
+        return None, INVALID_TOKEN
+    return user_id, None
+
+def active_user(user):
+    """El usuario del token si puede autenticarse (existe y está activo), si no None"""
+    return user if user is not None and user.is_active else None
+
+def auth_error_payload(message, error=None):
+    """Cuerpo JSON de un 401 de autenticación"""
+    payload = {
+        'success': False,
+        'message': message
+    }
+    if error is not None:
+        payload['error'] = error
+    return payload
+
+def _authenticate():
+    """Validar el Bearer token y cargar g.current_user; retorna la respuesta de error o None"""
+    user_id, error = bearer_user_id(request.headers.get('Authorization'))
+    if error:
+        return jsonify(auth_error_payload(error)), 401
 
-            g.current_user = current_user
+    try:
+        current_user = active_user(User.query.get(user_id))
+        if current_user is None:
+            return jsonify(auth_error_payload(INVALID_TOKEN)), 401
 
-        except Exception as e:
-            return jsonify({
-                'success': False,
-                'message': 'Error al verificar token',
-                'error': str(e)
-            }), 401
+        g.current_user = current_user
+
+    except Exception as e:
+        return jsonify(auth_error_payload('Error al verificar token', str(e))), 401
+
+    return None
+
+def token_required(f):
+    """Decorador para requerir token JWT válido"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        with start_span('auth.token_required'):
+            error = _authenticate()
+        if error is not None:
+            return error
 
         return f(*args, **kwargs)
 
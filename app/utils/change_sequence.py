@@ -0,0 +1,47 @@
+from sqlalchemy import event, select
+from app import db, RoutingSession
+from app.models.change_sequence import ChangeSequence
+
+
+def next_change_seq(connection, name):
+    """Reservar el siguiente número de la secuencia `name`
+
+    El UPDATE bloquea la fila de la secuencia hasta el commit, así que las
+    transacciones que escriben en la tabla se numeran en el mismo orden en que
+    se confirman: un lector nunca ve el cambio N + 1 sin ver también el N.
+    """
+    table = ChangeSequence.__table__
+    result = connection.execute(
+        table.update().where(table.c.name == name).values(value=table.c.value + 1)
+    )
+    if not result.rowcount:
+        connection.execute(table.insert().values(name=name, value=1))
+        return 1
+    return connection.execute(select(table.c.value).where(table.c.name == name)).scalar_one()
+
+
+class ChangeSequenceMixin:
+    """Número de cambio (change_seq) monótono por tabla para feeds incrementales
+
+    Cada flush que crea o modifica filas del modelo reserva un número de la
+    secuencia de su tabla y lo asigna a todas ellas; los UPDATE masivos deben
+    asignarlo con next_change_seq. Un cursor (change_seq, id) no se saltea
+    filas confirmadas tarde ni cambios dentro del mismo segundo, a costa de
+    serializar las transacciones que escriben en la tabla.
+    """
+
+    change_seq = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def assign_change_seq(session, flush_context, instances):
+    """Numerar las filas nuevas o modificadas de los modelos con ChangeSequenceMixin"""
+    changed = {}
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, ChangeSequenceMixin) and (obj in session.new or session.is_modified(obj)):
+            changed.setdefault(obj.__tablename__, []).append(obj)
+
+    for name, objs in changed.items():
+        seq = next_change_seq(session.connection(), name)
+        for obj in objs:
+            obj.change_seq = seq
@@ -0,0 +1,119 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import request
+
+# Codificaciones opcionales: solo se ofrecen si la librería está instalada
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def _available_encodings():
+    """Codificaciones soportadas, en orden de preferencia del servidor"""
+    encodings = []
+    if brotli is not None:
+        encodings.append('br')
+    if zstandard is not None:
+        encodings.append('zstd')
+    encodings.append('gzip')
+    return encodings
+
+
+def compress(data, encoding, level=6):
+    """Comprimir bytes con la codificación indicada"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=min(level, 11))
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return gzip.compress(data, compresslevel=level)
+
+
+class CompressionCache:
+    """Caché LRU de cuerpos comprimidos indexada por (ETag, codificación)"""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def init_compression(app):
+    """Registrar la compresión de respuestas negociada por Accept-Encoding"""
+    app.config.setdefault('COMPRESS_ENABLED', True)
+    app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+    app.config.setdefault('COMPRESS_LEVEL', 6)
+    app.config.setdefault('COMPRESS_CACHE_SIZE', 256)
+    app.config.setdefault('COMPRESS_MIMETYPES', ['application/json', 'text/html'])
+
+    cache = CompressionCache(app.config['COMPRESS_CACHE_SIZE'])
+    app.extensions['compression_cache'] = cache
+    encodings = _available_encodings()
+
+    @app.after_request
+    def compress_response(response):
+        if not app.config['COMPRESS_ENABLED']:
+            return response
+
+        if (response.direct_passthrough
+                or response.status_code != 200
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in app.config['COMPRESS_MIMETYPES']):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+
+        encoding = request.accept_encodings.best_match(encodings)
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            encoding = None
+
+        # Solo los GET son cacheables: ETag por representación y 304 si no cambió
+        if request.method == 'GET':
+            digest = hashlib.md5(data).hexdigest()
+            response.set_etag(f'{digest}-{encoding}' if encoding else digest)
+            response.make_conditional(request)
+            if response.status_code == 304:
+                return response
+
+            if encoding:
+                key = (digest, encoding)
+                compressed = cache.get(key)
+                if compressed is None:
+                    compressed = compress(data, encoding, app.config['COMPRESS_LEVEL'])
+                    cache.set(key, compressed)
+            else:
+                return response
+        elif encoding:
+            compressed = compress(data, encoding, app.config['COMPRESS_LEVEL'])
+        else:
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
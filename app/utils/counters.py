@@ -0,0 +1,112 @@
+from collections import namedtuple
+from sqlalchemy import event, func, inspect, select
+from app import db
+
+CounterSpec = namedtuple('CounterSpec', 'child_model fk_attr parent_table parent_pk counter_column soft_delete_attr')
+
+# Modelo hijo -> contadores que mantiene (para recontar tras operaciones masivas)
+_counters = {}
+
+
+def maintain_counter(child_model, fk_attr, parent_table, parent_pk, counter_column,
+                     soft_delete_attr=None):
+    """Mantener un contador desnormalizado en la tabla padre
+
+    Cada INSERT/DELETE del hijo (o cambio de padre en un UPDATE) ajusta el
+    contador con un UPDATE atómico dentro de la misma transacción, así que
+    leer "notas por usuario" o "productos por categoría" no necesita COUNT(*).
+    Con soft_delete_attr, marcar la fila como borrada también descuenta (y
+    restaurarla vuelve a sumar). Las operaciones masivas (query.update/delete)
+    no disparan estos eventos: deben tomar los padres afectados con
+    affected_parents antes de ejecutarse y llamar a recount después
+    (BaseService.delete_where ya lo hace).
+    """
+    _counters.setdefault(child_model, []).append(
+        CounterSpec(child_model, fk_attr, parent_table, parent_pk, counter_column, soft_delete_attr))
+
+    def _adjust(connection, parent_id, delta):
+        if parent_id is None:
+            return
+        table = db.metadata.tables[parent_table]
+        connection.execute(
+            table.update()
+            .where(table.c[parent_pk] == parent_id)
+            .values({counter_column: table.c[counter_column] + delta})
+        )
+
+    def _alive(value):
+        return value is None
+
+    def _previous(target, attr):
+        """Valor antes del flush (o el actual si no cambió)"""
+        history = inspect(target).attrs[attr].history
+        if history.has_changes():
+            return history.deleted[0] if history.deleted else None, True
+        return getattr(target, attr), False
+
+    # Cargar los valores anteriores al reasignarlos, para poder descontarlos
+    tracked = [fk_attr] + ([soft_delete_attr] if soft_delete_attr else [])
+    for attr in tracked:
+        event.listen(getattr(child_model, attr), 'set',
+                     lambda target, value, oldvalue, initiator: None, active_history=True)
+
+    def _is_counted(target):
+        return not soft_delete_attr or _alive(getattr(target, soft_delete_attr))
+
+    @event.listens_for(child_model, 'after_insert')
+    def increment(mapper, connection, target):
+        if _is_counted(target):
+            _adjust(connection, getattr(target, fk_attr), 1)
+
+    @event.listens_for(child_model, 'after_delete')
+    def decrement(mapper, connection, target):
+        # Un tombstone ya fue descontado al marcarse como borrado
+        if _is_counted(target):
+            _adjust(connection, getattr(target, fk_attr), -1)
+
+    @event.listens_for(child_model, 'after_update')
+    def move(mapper, connection, target):
+        old_parent, parent_changed = _previous(target, fk_attr)
+        was_counted, now_counted = True, True
+        deleted_changed = False
+        if soft_delete_attr:
+            old_deleted, deleted_changed = _previous(target, soft_delete_attr)
+            was_counted = _alive(old_deleted)
+            now_counted = _is_counted(target)
+
+        if not parent_changed and not deleted_changed:
+            return
+        if was_counted:
+            _adjust(connection, old_parent, -1)
+        if now_counted:
+            _adjust(connection, getattr(target, fk_attr), 1)
+
+    return child_model
+
+
+def affected_parents(child_model, criteria):
+    """Padres cuyos contadores cambia una operación masiva sobre las filas de criteria: [(spec, ids)]"""
+    scope = []
+    for spec in _counters.get(child_model, []):
+        fk = getattr(child_model, spec.fk_attr)
+        ids = db.session.scalars(
+            select(fk).where(*criteria, fk.isnot(None)).distinct()
+            .execution_options(include_deleted=True)
+        ).all()
+        if ids:
+            scope.append((spec, ids))
+    return scope
+
+
+def recount(scope):
+    """Recalcular con COUNT(*) los contadores de los padres de affected_parents (misma transacción)"""
+    for spec, ids in scope:
+        child = spec.child_model.__table__
+        parent = db.metadata.tables[spec.parent_table]
+        conditions = [child.c[spec.fk_attr] == parent.c[spec.parent_pk]]
+        if spec.soft_delete_attr:
+            conditions.append(child.c[spec.soft_delete_attr].is_(None))
+        count = select(func.count()).select_from(child).where(*conditions).scalar_subquery()
+        db.session.execute(
+            parent.update().where(parent.c[spec.parent_pk].in_(ids)).values({spec.counter_column: count})
+        )
@@ -0,0 +1,59 @@
+import threading
+import time
+from sqlalchemy import text
+from app import db
+
+
+class ReadinessProbe:
+    """Chequeo de conectividad a la base de datos con resultado cacheado (TTL corto)"""
+
+    def __init__(self, ttl=5):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._result = None
+        self._checked_at = 0.0
+
+    def check(self):
+        """Retorna (ok, error, checked_at); consulta la BD como máximo una vez por TTL"""
+        with self._lock:
+            if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                try:
+                    db.session.execute(text("SELECT 1"))
+                    self._result = (True, None)
+                except Exception as e:
+                    db.session.rollback()
+                    self._result = (False, str(e))
+                self._checked_at = time.monotonic()
+            ok, error = self._result
+            return ok, error, self._checked_at
+
+
+class StatsSnapshot:
+    """Snapshot en memoria de estadísticas, refrescado cada `ttl` segundos
+
+    Mientras un thread recalcula, el resto sigue sirviendo el snapshot
+    anterior en lugar de esperar o repetir las mismas queries.
+    """
+
+    def __init__(self, loader, ttl=60):
+        self.loader = loader
+        self.ttl = ttl
+        self._refresh_lock = threading.Lock()
+        self._data = None
+        self._refreshed_at = 0.0
+
+    @property
+    def age(self):
+        return time.monotonic() - self._refreshed_at
+
+    def get(self):
+        if self._data is None or self.age >= self.ttl:
+            # Solo un thread refresca; si ya hay datos, el resto usa los anteriores
+            if self._refresh_lock.acquire(blocking=self._data is None):
+                try:
+                    if self._data is None or self.age >= self.ttl:
+                        self._data = self.loader()
+                        self._refreshed_at = time.monotonic()
+                finally:
+                    self._refresh_lock.release()
+        return self._data
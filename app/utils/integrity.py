@@ -0,0 +1,36 @@
+import re
+from sqlalchemy.exc import IntegrityError
+
+# MySQL: "Duplicate entry 'x' for key 'users.ix_users_email'" (antes de 8.0.19 sin "users.")
+MYSQL_DUPLICATE_KEY = re.compile(r"Duplicate entry '.*' for key '([^']+)'", re.DOTALL)
+# SQLite: "UNIQUE constraint failed: users.email" (o varias columnas separadas por coma)
+SQLITE_UNIQUE_FAILED = re.compile(r'UNIQUE constraint failed: ([\w.,\s]+)')
+
+
+def _violated_keys(detail):
+    """Nombres del índice (MySQL) o de las columnas (SQLite) de la restricción violada"""
+    match = MYSQL_DUPLICATE_KEY.search(detail)
+    if match:
+        return [match.group(1).rsplit('.', 1)[-1]]
+    match = SQLITE_UNIQUE_FAILED.search(detail)
+    if match:
+        return [part.strip().rsplit('.', 1)[-1] for part in match.group(1).split(',')]
+    return []
+
+
+def unique_violation_message(error, messages):
+    """Traducir una violación de índice único a un mensaje amigable
+
+    `messages` mapea nombre de columna -> mensaje. Se compara contra el nombre
+    de la restricción que informa el driver, nunca contra el valor duplicado:
+    la columna coincide con el índice `ix_<tabla>_<columna>` (o uno que
+    termine en `_<columna>`) en MySQL y con `<tabla>.<columna>` en SQLite.
+    Retorna None si el error no corresponde a ninguna de las columnas.
+    """
+    if not isinstance(error, IntegrityError):
+        return None
+    keys = _violated_keys(str(error.orig))
+    for column, message in messages.items():
+        if any(key == column or key.endswith(f'_{column}') for key in keys):
+            return message
+    return None
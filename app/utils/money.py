@@ -0,0 +1,39 @@
+from functools import lru_cache
+from sqlalchemy import BigInteger, inspect
+from sqlalchemy.types import TypeDecorator
+
+
+class Money(TypeDecorator):
+    """Monto en centavos enteros (BIGINT)
+
+    Dentro de la app los montos son int en centavos: se suman y multiplican
+    sin redondeos ni Decimal, y solo se convierten a unidades al serializar
+    (from_cents). Un Decimal o float al guardar es casi siempre un monto en
+    unidades pasado por error, así que se rechaza en lugar de truncarlo.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or (isinstance(value, int) and not isinstance(value, bool)):
+            return value
+        raise TypeError(f'Money espera centavos enteros, se recibió {type(value).__name__}: {value!r}')
+
+
+def from_cents(cents):
+    """Centavos -> número JSON en unidades
+
+    Una sola división entera/float: el repr más corto del resultado es
+    exactamente el decimal con dos cifras (1999 -> 19.99), sin pasar por Decimal.
+    """
+    return None if cents is None else cents / 100
+
+
+@lru_cache(maxsize=None)
+def money_fields(model):
+    """Atributos del modelo guardados como Money (para serializar proyecciones)"""
+    return frozenset(
+        attr.key for attr in inspect(model).column_attrs
+        if isinstance(attr.columns[0].type, Money)
+    )
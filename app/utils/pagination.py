@@ -0,0 +1,30 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(*values):
+    """Codificar los valores de la última fila como cursor opaco (base64 url-safe)"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decodificar un cursor; retorna (valores, error)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list):
+            raise ValueError
+        return values, None
+    except (ValueError, TypeError):
+        return None, 'cursor inválido'
+
+
+def parse_datetime(value):
+    """Convertir un valor ISO del cursor en datetime; retorna None si no es válido"""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,65 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+# Un descuento es un porcentaje con dos decimales: 12.50 -> 1250 puntos básicos
+FULL_DISCOUNT_BPS = 10000
+
+
+def to_cents(value):
+    """Monto en unidades (Decimal/int/float/str) -> centavos enteros (half-up); None -> None"""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value * 100
+    if isinstance(value, float):
+        # Los floats vienen de JSON con a lo sumo dos decimales: redondear basta
+        return round(value * 100)
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.scaleb(2).to_integral_value(ROUND_HALF_UP))
+
+
+def effective_prices(prices, discounts):
+    """Precio final por unidad de cada producto, en lote
+
+    prices: centavos; discounts: puntos básicos (0 = sin descuento).
+    El descuento se redondea half-up al centavo y se limita a [0, 100 %].
+    Todo es aritmética entera: el resultado es exacto y no depende del orden.
+    """
+    return [
+        price - (price * min(max(bps, 0), FULL_DISCOUNT_BPS) + 5000) // FULL_DISCOUNT_BPS
+        for price, bps in zip(prices, discounts)
+    ]
+
+
+def price_lines(lines, catalog):
+    """Cotizar líneas de carrito contra el catálogo, en lote
+
+    lines: [(idCarrito, idProducto, cantidad)]
+    catalog: {idProducto: (precio en centavos, descuento en puntos básicos)}
+    Retorna (líneas, totales): cada línea como (precio lista, precio unitario,
+    subtotal lista, subtotal) y {idCarrito: (subtotal lista, total)}.
+    El precio final se calcula una vez por producto del catálogo y cada línea
+    queda en dos multiplicaciones enteras. Las líneas de productos que no
+    están en el catálogo no se pueden cotizar y se devuelven como None.
+    """
+    product_ids = list(catalog)
+    finals = dict(zip(product_ids, effective_prices(
+        [catalog[product_id][0] for product_id in product_ids],
+        [catalog[product_id][1] for product_id in product_ids],
+    )))
+
+    priced = []
+    gross, net = {}, {}
+    for cart_id, product_id, quantity in lines:
+        entry = catalog.get(product_id)
+        if entry is None:
+            priced.append(None)
+            continue
+        list_price, unit = entry[0], finals[product_id]
+        list_subtotal, subtotal = list_price * quantity, unit * quantity
+        gross[cart_id] = gross.get(cart_id, 0) + list_subtotal
+        net[cart_id] = net.get(cart_id, 0) + subtotal
+        priced.append((list_price, unit, list_subtotal, subtotal))
+
+    return priced, {cart_id: (gross[cart_id], net[cart_id]) for cart_id in gross}
+
@@ -0,0 +1,176 @@
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from html import escape
+from flask import g, request
+
+
+class StackSampler:
+    """Profiler por muestreo del thread de una request
+
+    Un thread auxiliar toma el stack del thread objetivo cada `interval`
+    segundos y acumula stacks colapsados ("a;b;c" -> muestras), el formato
+    de entrada de los flame graphs. No instrumenta cada llamada como cProfile,
+    así que el overhead es bajo y se puede usar con muestreo en producción.
+    """
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+
+def collapsed_text(stacks):
+    """Stacks colapsados, una línea por stack: 'a;b;c <muestras>'"""
+    return '\n'.join(f'{stack} {count}' for stack, count in stacks.most_common()) + '\n'
+
+
+def render_flamegraph(stacks, title='Flame graph', width=1200, row_height=16):
+    """SVG de flame graph autocontenido a partir de stacks colapsados"""
+    root = {'name': 'all', 'value': 0, 'children': {}}
+    for stack, count in stacks.items():
+        root['value'] += count
+        node = root
+        for name in stack.split(';'):
+            node = node['children'].setdefault(name, {'name': name, 'value': 0, 'children': {}})
+            node['value'] += count
+
+    total = root['value'] or 1
+    rects = []
+
+    def layout(node, x, depth):
+        rects.append((node, x, depth))
+        child_x = x
+        for child in sorted(node['children'].values(), key=lambda c: c['name']):
+            layout(child, child_x, depth + 1)
+            child_x += child['value'] / total * width
+
+    layout(root, 0.0, 0)
+    max_depth = max(depth for _, _, depth in rects)
+    height = (max_depth + 1) * row_height + 40
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">',
+        f'<text x="{width / 2}" y="20" text-anchor="middle" font-size="14">{escape(title)}</text>',
+    ]
+    for node, x, depth in rects:
+        w = node['value'] / total * width
+        if w < 0.5:
+            continue
+        y = height - (depth + 1) * row_height
+        # Color cálido estable por nombre de función
+        hue = zlib.crc32(node['name'].encode()) % 60
+        label = escape(node['name'])
+        percent = node['value'] / total * 100
+        parts.append(
+            f'<g><title>{label} ({node["value"]} muestras, {percent:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" '
+            f'fill="hsl({hue},85%,60%)"/>'
+        )
+        max_chars = int(w / 7)
+        if max_chars >= 3:
+            text = label if len(node['name']) <= max_chars else escape(node['name'][:max_chars - 2]) + '..'
+            parts.append(f'<text x="{x + 3:.1f}" y="{y + row_height - 4}">{text}</text>')
+        parts.append('</g>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+def init_profiling(app):
+    """Registrar el profiler por request (opt-in por header/query o muestreo)
+
+    - X-Profile: svg | collapsed -> la respuesta se reemplaza por el flame graph
+    - X-Profile: 1 (o ?_profile=1) -> se guarda en PROFILE_DIR y se informa en X-Profile-File
+    Los pedidos explícitos solo se aceptan con PROFILE_ON_DEMAND (no en producción);
+    PROFILE_SAMPLE_RATE perfila y guarda una fracción de las requests.
+    """
+    app.config.setdefault('PROFILE_ON_DEMAND', False)
+    app.config.setdefault('PROFILE_SAMPLE_RATE', 0.0)
+    app.config.setdefault('PROFILE_INTERVAL', 0.001)
+    app.config.setdefault('PROFILE_DIR', 'profiles')
+
+    def requested_mode():
+        if app.config['PROFILE_ON_DEMAND']:
+            mode = request.headers.get('X-Profile') or request.args.get('_profile')
+            if mode:
+                return mode.lower()
+        rate = app.config['PROFILE_SAMPLE_RATE']
+        if rate and random.random() < rate:
+            return 'store'
+        return None
+
+    def store(endpoint, duration, stacks, title):
+        """Guardar por endpoint: <PROFILE_DIR>/<endpoint>/<timestamp>.{collapsed,svg}"""
+        directory = os.path.join(app.config['PROFILE_DIR'], endpoint)
+        os.makedirs(directory, exist_ok=True)
+        name = f'{time.strftime("%Y%m%d-%H%M%S")}-{int(duration * 1000)}ms-{uuid.uuid4().hex[:6]}'
+        base = os.path.join(directory, name)
+        with open(base + '.collapsed', 'w') as f:
+            f.write(collapsed_text(stacks))
+        with open(base + '.svg', 'w') as f:
+            f.write(render_flamegraph(stacks, title))
+        return base + '.svg'
+
+    @app.before_request
+    def start_profiler():
+        mode = requested_mode()
+        if mode:
+            g.profile_mode = mode
+            g.profiler = StackSampler(threading.get_ident(), app.config['PROFILE_INTERVAL']).start()
+
+    @app.after_request
+    def finish_profiler(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+
+        stacks = profiler.stop()
+        mode = g.pop('profile_mode')
+        endpoint = request.endpoint or 'unknown'
+        title = f'{request.method} {request.path} ({endpoint}) {profiler.duration * 1000:.1f} ms'
+
+        if mode == 'svg':
+            response = app.response_class(render_flamegraph(stacks, title), mimetype='image/svg+xml')
+        elif mode == 'collapsed':
+            response = app.response_class(collapsed_text(stacks), mimetype='text/plain')
+        else:
+            response.headers['X-Profile-File'] = store(endpoint, profiler.duration, stacks, title)
+        response.headers['X-Profile-Samples'] = str(sum(stacks.values()))
+        return response
+
+    @app.teardown_request
+    def discard_profiler(exc):
+        # Si la request terminó sin pasar por after_request, detener el thread de muestreo
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.stop()
@@ -0,0 +1,25 @@
+from datetime import date, datetime
+from decimal import Decimal
+from app.utils.money import from_cents, money_fields
+
+def serialize_value(value):
+    """Convertir un valor de columna a un tipo serializable en JSON"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def to_dict_fields(instance, fields):
+    """Serializar solo los campos pedidos (sin tocar columnas no cargadas)"""
+    money = money_fields(type(instance))
+    return {
+        field: from_cents(getattr(instance, field)) if field in money else serialize_value(getattr(instance, field))
+        for field in fields
+    }
+
+def serialize(instance, fields=None):
+    """Usar to_dict() completo o la proyección de campos si se especificó"""
+    if fields:
+        return to_dict_fields(instance, fields)
+    return instance.to_dict()
@@ -0,0 +1,39 @@
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import with_loader_criteria
+from app import db, RoutingSession
+
+
+class SoftDeleteMixin:
+    """Borrado lógico: la fila queda como tombstone con deleted_at
+
+    Las queries ORM excluyen automáticamente las filas borradas; para verlas
+    usar .execution_options(include_deleted=True). CompactionService purga
+    los tombstones antiguos en lotes.
+    """
+
+    deleted_at = db.Column(db.DateTime, nullable=True, index=True)
+
+    @property
+    def is_deleted(self):
+        return self.deleted_at is not None
+
+    def soft_delete(self):
+        """Marcar como borrado (no hace commit)"""
+        self.deleted_at = datetime.utcnow()
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def exclude_soft_deleted(execute_state):
+    """Criterio por defecto: deleted_at IS NULL en todas las SELECT ORM"""
+    if (execute_state.is_select
+            and not execute_state.is_column_load
+            and not execute_state.is_relationship_load
+            and not execute_state.execution_options.get('include_deleted', False)):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(
+                SoftDeleteMixin,
+                lambda cls: cls.deleted_at.is_(None),
+                include_aliases=True
+            )
+        )
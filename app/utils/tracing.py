@@ -0,0 +1,322 @@
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from functools import wraps
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapper
+
+logger = logging.getLogger(__name__)
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+# Códigos de SpanKind y StatusCode de OTLP
+KINDS = {'internal': 1, 'server': 2, 'client': 3}
+STATUS_OK, STATUS_ERROR = 1, 2
+
+
+class Trace:
+    """Spans de una request; se exportan juntos cuando termina"""
+
+    def __init__(self, trace_id, max_spans):
+        self.trace_id = trace_id
+        self.max_spans = max_spans
+        self.spans = []
+        self.dropped = 0
+
+
+class Span:
+    __slots__ = ('trace', 'name', 'span_id', 'parent_id', 'kind', 'start', 'end', 'attributes', 'status')
+
+    def __init__(self, trace, name, parent_id=None, kind='internal', span_id=None, attributes=None):
+        self.trace = trace
+        self.name = name
+        self.span_id = span_id or os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start = time.time_ns()
+        self.end = None
+        self.attributes = dict(attributes or {})
+        self.status = (STATUS_OK, '')
+        trace.spans.append(self)
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def to_otlp(self):
+        return {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id or '',
+            'name': self.name,
+            'kind': KINDS[self.kind],
+            'startTimeUnixNano': str(self.start),
+            'endTimeUnixNano': str(self.end or time.time_ns()),
+            'attributes': [{'key': k, 'value': _otlp_value(v)} for k, v in self.attributes.items()],
+            'status': {'code': self.status[0], 'message': self.status[1]},
+        }
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def current_span():
+    return _current_span.get()
+
+
+def begin_span(name, kind='internal', **attributes):
+    """Abrir un span hijo del actual; retorna (span, token) o (None, None) si no hay traza"""
+    parent = _current_span.get()
+    if parent is None:
+        return None, None
+    trace = parent.trace
+    if len(trace.spans) >= trace.max_spans:
+        trace.dropped += 1
+        return None, None
+    span = Span(trace, name, parent.span_id, kind, attributes=attributes)
+    return span, _current_span.set(span)
+
+
+def end_span(span, token, error=None):
+    if span is None:
+        return
+    span.end = time.time_ns()
+    if error is not None:
+        span.status = (STATUS_ERROR, str(error))
+    _current_span.reset(token)
+
+
+@contextmanager
+def start_span(name, kind='internal', **attributes):
+    span, token = begin_span(name, kind, **attributes)
+    try:
+        yield span
+    except Exception as e:
+        end_span(span, token, e)
+        raise
+    else:
+        end_span(span, token)
+
+
+def traced(name=None):
+    """Decorador: span alrededor de la función (sin costo si la request no se traza)"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with start_span(span_name):
+                return func(*args, **kwargs)
+        wrapper.__traced__ = True
+        return wrapper
+    return decorator
+
+
+def trace_methods(cls):
+    """Envolver en spans los métodos públicos definidos en la clase (servicios)"""
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith('_'):
+            continue
+        name = f'{cls.__name__}.{attr}'
+        if isinstance(value, staticmethod):
+            if not getattr(value.__func__, '__traced__', False):
+                setattr(cls, attr, staticmethod(traced(name)(value.__func__)))
+        elif callable(value) and not isinstance(value, type) and not getattr(value, '__traced__', False):
+            setattr(cls, attr, traced(name)(value))
+    return cls
+
+
+@event.listens_for(Mapper, 'mapper_configured')
+def _trace_serializers(mapper, cls):
+    """Span de serialización para los to_dict de los modelos"""
+    to_dict = cls.__dict__.get('to_dict')
+    if to_dict is not None and not getattr(to_dict, '__traced__', False):
+        cls.to_dict = traced(f'{cls.__name__}.to_dict')(to_dict)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_sql_span(conn, cursor, statement, parameters, context, executemany):
+    span, token = begin_span('db.query', kind='client', **{
+        'db.system': conn.dialect.name,
+        'db.statement': ' '.join(statement.split())[:500],
+    })
+    if span is not None:
+        conn.info.setdefault('trace_spans', []).append((span, token))
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _end_sql_span(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get('trace_spans')
+    if spans:
+        end_span(*spans.pop())
+
+
+@event.listens_for(Engine, 'handle_error')
+def _fail_sql_span(exception_context):
+    connection = exception_context.connection
+    spans = connection.info.get('trace_spans') if connection is not None else None
+    if spans:
+        end_span(*spans.pop(), error=exception_context.original_exception)
+
+
+class TraceExporter:
+    """Exporta las trazas terminadas en formato OTLP/JSON desde un thread aparte
+
+    - file: una línea JSON (ExportTraceServiceRequest) por lote en TRACING_FILE
+    - otlp: POST a un collector OTLP/HTTP (p. ej. http://localhost:4318/v1/traces)
+    """
+
+    def __init__(self, service_name, exporter='file', path='traces.jsonl', endpoint=None, batch_size=50):
+        self.resource = {'attributes': [{'key': 'service.name', 'value': {'stringValue': service_name}}]}
+        self.exporter = exporter
+        self.path = path
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='trace-exporter', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def submit(self, trace):
+        self.queue.put(trace)
+
+    def stop(self):
+        if self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get())
+            stop = None in batch
+            traces = [trace for trace in batch if trace is not None]
+            if traces:
+                try:
+                    self.export(traces)
+                except Exception as e:
+                    logger.warning(f"⚠️  No se pudieron exportar {len(traces)} trazas: {e}")
+            if stop:
+                return
+
+    def export(self, traces):
+        payload = {'resourceSpans': [{
+            'resource': self.resource,
+            'scopeSpans': [{
+                'scope': {'name': 'app.utils.tracing'},
+                'spans': [span.to_otlp() for trace in traces for span in trace.spans],
+            }],
+        }]}
+        body = json.dumps(payload, separators=(',', ':'))
+        if self.exporter == 'otlp':
+            req = urllib.request.Request(self.endpoint, data=body.encode(), method='POST',
+                                         headers={'Content-Type': 'application/json'})
+            urllib.request.urlopen(req, timeout=5).close()
+        else:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(body + '\n')
+
+
+def parse_traceparent(header):
+    """W3C traceparent '00-<trace_id>-<span_id>-<flags>' -> (trace_id, span_id, sampled)"""
+    try:
+        version, trace_id, span_id, flags = header.strip().split('-')
+        int(trace_id, 16), int(span_id, 16), int(flags, 16)
+    except (AttributeError, ValueError):
+        return None
+    if len(trace_id) != 32 or len(span_id) != 16 or trace_id == '0' * 32:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & 1)
+
+
+def init_tracing(app):
+    """Trazas por request: request -> auth -> servicio -> SQL -> serialización
+
+    Se propaga el traceparent W3C entrante, se devuelve en la respuesta (junto
+    con X-Trace-Id) y el trace_id queda en g para el access log.
+    """
+    app.config.setdefault('TRACING_ENABLED', False)
+    app.config.setdefault('TRACING_SAMPLE_RATE', 1.0)
+    app.config.setdefault('TRACING_EXPORTER', 'file')
+    app.config.setdefault('TRACING_FILE', 'traces.jsonl')
+    app.config.setdefault('TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces')
+    app.config.setdefault('TRACING_SERVICE_NAME', 'tennismanager-api')
+    app.config.setdefault('TRACING_MAX_SPANS', 1000)
+
+    if not app.config['TRACING_ENABLED']:
+        return None
+
+    exporter = TraceExporter(
+        app.config['TRACING_SERVICE_NAME'],
+        exporter=app.config['TRACING_EXPORTER'],
+        path=app.config['TRACING_FILE'],
+        endpoint=app.config['TRACING_OTLP_ENDPOINT'],
+    )
+    app.extensions['tracing'] = exporter
+
+    @app.before_request
+    def start_trace():
+        incoming = parse_traceparent(request.headers.get('traceparent'))
+        if incoming:
+            trace_id, parent_id, sampled = incoming
+        else:
+            trace_id, parent_id = os.urandom(16).hex(), None
+            sampled = random.random() < app.config['TRACING_SAMPLE_RATE']
+        if not sampled:
+            return
+
+        trace = Trace(trace_id, app.config['TRACING_MAX_SPANS'])
+        root = Span(trace, f'{request.method} {request.url_rule.rule if request.url_rule else request.path}',
+                    parent_id=parent_id, kind='server', attributes={
+                        'http.method': request.method,
+                        'http.target': request.full_path.rstrip('?'),
+                        'http.route': request.url_rule.rule if request.url_rule else '',
+                    })
+        g.trace_root = root
+        g.trace_token = _current_span.set(root)
+        g.trace_id, g.span_id = trace_id, root.span_id
+
+    @app.after_request
+    def add_trace_headers(response):
+        root = g.get('trace_root')
+        if root is not None:
+            root.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 500:
+                root.status = (STATUS_ERROR, response.status)
+            response.headers['traceparent'] = f'00-{root.trace.trace_id}-{root.span_id}-01'
+            response.headers['X-Trace-Id'] = root.trace.trace_id
+        return response
+
+    @app.teardown_request
+    def finish_trace(exc):
+        root = g.pop('trace_root', None)
+        if root is None:
+            return
+        root.end = time.time_ns()
+        if exc is not None:
+            root.status = (STATUS_ERROR, str(exc))
+        if root.trace.dropped:
+            root.set_attribute('trace.dropped_spans', root.trace.dropped)
+        _current_span.reset(g.pop('trace_token'))
+        exporter.submit(root.trace)
+
+    return exporter
@@ -0,0 +1,5 @@
+import os
+from app.async_api import create_async_app
+
+# Servidor ASGI para los endpoints de solo lectura: hypercorn asgi:app
+app = create_async_app(os.getenv('FLASK_ENV', 'default'))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: borrar un usuario con muchas notas.
+
+- orm: cascada cargada por el ORM (lo que hacía cascade='all, delete-orphan'
+  sin passive_deletes): SELECT de todas las notas y un DELETE por fila
+- passive: db.session.delete(user) con passive_deletes=True; las notas las
+  borra la base de datos con ON DELETE CASCADE
+- delete_where: BaseService.delete_where(hard=True), un solo DELETE sin cargar nada
+
+Uso:
+    python -m benchmarks.cascade_delete --notes 100000
+"""
+import argparse
+import time
+import tracemalloc
+from sqlalchemy import event
+from app import db
+from app.models.note import Note
+from app.models.user import User
+from app.services.user_service import UserService
+from benchmarks.common import build_app
+
+
+def seed(notes):
+    user = User(username='bench', email='bench@example.com')
+    user.set_password('bench123')
+    db.session.add(user)
+    db.session.flush()
+    db.session.execute(Note.__table__.insert(), [
+        {'title': f'Nota {i}', 'content': 'x' * 100, 'user_id': user.id}
+        for i in range(notes)
+    ])
+    db.session.commit()
+    user_id = user.id
+    db.session.expunge_all()
+    return user_id
+
+
+def delete_orm(user_id):
+    user = db.session.get(User, user_id)
+    for note in Note.query.filter_by(user_id=user_id).all():
+        db.session.delete(note)
+    db.session.delete(user)
+    db.session.commit()
+
+
+def delete_passive(user_id):
+    db.session.delete(db.session.get(User, user_id))
+    db.session.commit()
+
+
+def delete_where(user_id):
+    UserService().delete_where(User.id == user_id, hard=True)
+
+
+def measure(func, notes):
+    user_id = seed(notes)
+    statements = []
+    listener = lambda *args: statements.append(1)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(user_id)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    event.remove(db.engine, 'before_cursor_execute', listener)
+    remaining = Note.query.execution_options(include_deleted=True).filter_by(user_id=user_id).count()
+    return elapsed * 1000, len(statements), peak / 1024 / 1024, remaining
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--notes', type=int, default=100000)
+    args = parser.parse_args()
+
+    app = build_app()
+    with app.app_context():
+        db.create_all()
+        print(f'Borrar un usuario con {args.notes} notas')
+        print(f'{"estrategia":>14} {"ms":>10} {"sentencias":>11} {"pico MB":>9} {"restantes":>10}')
+        for name, func in (('orm', delete_orm), ('passive', delete_passive), ('delete_where', delete_where)):
+            ms, statements, peak, remaining = measure(func, args.notes)
+            print(f'{name:>14} {ms:>10.1f} {statements:>11} {peak:>9.1f} {remaining:>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Piezas compartidas por los benchmarks offline: la app mínima sobre
+TestingConfig y el cronómetro de promedio por llamada.
+"""
+import time
+from flask import Flask
+from config import TestingConfig
+from app import db
+
+REPEAT = 20
+
+
+def build_app(url=None, blueprints=()):
+    """App Flask con TestingConfig (SQLite en memoria salvo `url`)
+
+    blueprints: [(blueprint, url_prefix)] a registrar, para los benchmarks
+    que pegan a endpoints con el test client.
+    """
+    app = Flask(__name__)
+    app.config.from_object(TestingConfig)
+    if url:
+        app.config['SQLALCHEMY_DATABASE_URI'] = url
+    db.init_app(app)
+    for blueprint, url_prefix in blueprints:
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
+    return app
+
+
+def timed(func, repeat=REPEAT, reset=None):
+    """Milisegundos promedio por llamada de func, sobre `repeat` llamadas
+
+    reset (p. ej. db.session.expunge_all) se llama entre llamadas, fuera de
+    la medición, para que ninguna aproveche lo que cargó la anterior.
+    """
+    elapsed = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed += time.perf_counter() - start
+        if reset:
+            reset()
+    return elapsed / repeat * 1000
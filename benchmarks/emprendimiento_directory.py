@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark: directorio de emprendimientos (prefijo de nombre/ubicación, dueño,
+productos por emprendimiento) con decenas de miles de vendedores.
+
+Mide la latencia promedio de una página con EmprendimientoService.search y
+ProductoService.get_by_emprendimiento y revisa el plan de la query principal
+de cada una: debe ser una búsqueda por rango o igualdad en un índice (SEARCH),
+sin ordenar en una tabla temporal. Solo la primera página sin filtros puede
+recorrer el índice en orden, porque el LIMIT la corta tras limit + 1 filas.
+Termina con código 1 si algún plan no usa el índice o si alguna página supera
+el presupuesto (--budget-ms).
+
+Uso:
+    python -m benchmarks.emprendimiento_directory --sellers 30000 --limit 20
+"""
+import argparse
+import random
+import sys
+from sqlalchemy import event
+from app import db
+from app.models.Carrito import Carrito  # noqa: F401 (todos los modelos relacionados deben estar mapeados)
+from app.models.Categoria import Categoria  # noqa: F401
+from app.models.Detalle import Detalle  # noqa: F401
+from app.models.Emprendimiento import Emprendimiento
+from app.models.note import Note  # noqa: F401
+from app.models.Producto import Producto
+from app.models.user import User
+from app.services.emprendimiento_service import EmprendimientoService
+from app.services.producto_service import ProductoService
+from app.utils.pagination import encode_cursor
+from benchmarks.common import REPEAT, build_app, timed
+
+CITIES = ['Asunción', 'Buenos Aires', 'Córdoba', 'Lima', 'Montevideo', 'Rosario', 'Santiago', 'Quito']
+WORDS = ['Almacén', 'Bazar', 'Café', 'Dulces', 'Estudio', 'Ferretería', 'Granja', 'Huerta',
+         'Joyas', 'Kiosco', 'Librería', 'Mercado', 'Panadería', 'Rincón', 'Taller', 'Vivero']
+
+
+def seed(sellers, owners=1000, products_per_seller=5):
+    rng = random.Random(42)
+    db.session.execute(User.__table__.insert(), [
+        {'username': f'owner{i}', 'email': f'owner{i}@example.com', 'password_hash': 'x',
+         'role': 'client', 'is_active': True, 'notes_count': 0}
+        for i in range(owners)
+    ])
+    db.session.execute(Emprendimiento.__table__.insert(), [
+        {'nombreEmprendimiento': f'{rng.choice(WORDS)} {rng.choice(WORDS)} {i}',
+         'ubicacion': ubicacion, 'ciudad': Emprendimiento.city_key(ubicacion),
+         'idUsuario': rng.randint(1, owners)}
+        for i, ubicacion in enumerate(
+            f'{rng.choice(CITIES)}, Barrio {rng.randint(1, 40)}' for _ in range(sellers))
+    ])
+    db.session.execute(Producto.__table__.insert(), [
+        {'nombreProducto': f'Producto {i}', 'precio': 10, 'disponibilidad': 1,
+         'idEmprendimiento': i % sellers + 1}
+        for i in range(sellers * products_per_seller)
+    ])
+    db.session.commit()
+
+
+def query_plan(func):
+    """Plan (EXPLAIN QUERY PLAN) de la primera query que ejecuta func (la página, antes de cargar relaciones)"""
+    statements = []
+    engine = db.engine
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        func()
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+    db.session.expunge_all()
+    statement, parameters = statements[0]
+    rows = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    return [row[-1] for row in rows]
+
+
+def uses_index(plan, ordered_scan=False):
+    """Cada paso es SEARCH por índice (u ordered_scan: SCAN en el orden de un índice), sin TEMP B-TREE"""
+    for step in plan:
+        if 'TEMP B-TREE' in step:
+            return False
+        if step.startswith('SEARCH') and ' USING ' in step:
+            continue
+        if ordered_scan and step.startswith('SCAN') and 'INDEX' in step:
+            continue
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sellers', type=int, default=30000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--budget-ms', type=float, default=50.0)
+    args = parser.parse_args()
+
+    app = build_app()
+    emprendimientos, productos = EmprendimientoService(), ProductoService()
+    with app.app_context():
+        db.create_all()
+        seed(args.sellers)
+
+        # Cursor a mitad del directorio para medir una página profunda
+        middle = Emprendimiento.query.order_by(
+            Emprendimiento.nombreEmprendimiento, Emprendimiento.idEmprendimiento
+        ).offset(args.sellers // 2).first()
+        deep_cursor = encode_cursor(middle.nombreEmprendimiento, middle.idEmprendimiento)
+        db.session.expunge_all()
+
+        # (nombre, función, puede recorrer el índice en orden)
+        cases = [
+            ('directorio, página 1', lambda: emprendimientos.search(limit=args.limit), True),
+            ('directorio, página media', lambda: emprendimientos.search(limit=args.limit, cursor=deep_cursor), False),
+            ('nombre=Pan', lambda: emprendimientos.search(nombre='Pan', limit=args.limit), False),
+            ('ubicacion=Lima', lambda: emprendimientos.search(ubicacion='Lima', limit=args.limit), False),
+            ('ubicacion=lima + nombre=café', lambda: emprendimientos.search(
+                nombre='café', ubicacion='lima', limit=args.limit), False),
+            ('user_id=7', lambda: emprendimientos.search(user_id=7, limit=args.limit), False),
+            ('productos del emprendimiento 123',
+             lambda: productos.get_by_emprendimiento(123, limit=args.limit), False),
+        ]
+
+        print(f'{args.sellers} emprendimientos, limit={args.limit} (ms por página, promedio de {REPEAT})')
+        failures = 0
+        for name, func, ordered_scan in cases:
+            ms = timed(func, reset=db.session.expunge_all)
+            plan = query_plan(func)
+            ok = ms <= args.budget_ms and uses_index(plan, ordered_scan)
+            failures += not ok
+            print(f'{name:<36} {ms:>8.2f} ms {"✅" if ok else "❌"}')
+            print(f'    plan: {"; ".join(plan)}')
+
+    if failures:
+        print(f'\n❌ {failures} consultas sin índice o sobre {args.budget_ms} ms')
+        return 1
+    print(f'\n✅ Todas las páginas usan índices y quedan bajo {args.budget_ms} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Suite de carga: escenarios ponderados construidos desde la colección de Postman.
+
+Cada escenario repite flujos de Helps/TennisManager_API_Collection (login,
+listar notas, búsqueda) o de la API de catálogo (categorías, productos,
+carritos) con N peticiones en vuelo y reporta p50/p95/p99, throughput y
+sentencias SQL por escenario. Los resultados se comparan con un baseline JSON
+y el proceso termina con código 1 si algún escenario empeora.
+
+Destinos:
+- por defecto la app en proceso (Flask test client) sobre SQLite temporal
+- --database-url mysql+pymysql://... para la app en proceso sobre MySQL local
+- --base-url http://localhost:5001 contra un servidor ya levantado (sin conteo de queries)
+
+Uso:
+    python -m benchmarks.load_suite --requests 2000 --concurrency 16
+    python -m benchmarks.load_suite --save-baseline
+    python -m benchmarks.load_suite --base-url http://localhost:5001
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+COLLECTION = ROOT / 'Helps' / 'TennisManager_API_Collection.postman_collection.json'
+BASELINE_DIR = Path(__file__).resolve().parent / 'baselines'
+
+# (escenario, peso, login de la colección, pasos)
+# Un paso es el nombre de un request de la colección o (método, path) para
+# flujos que la colección no cubre (catálogo y carritos).
+SCENARIOS = [
+    ('login', 2, None, ['Login - Client (Eidan)']),
+    ('list_notes', 4, 'Login - Manager', ['Listar Todas las Notas', 'Listar Notas por Usuario']),
+    ('search_notes', 2, 'Login - Manager', ['Buscar Notas por Título']),
+    ('browse_catalog', 4, None, [('GET', '/api/categorias'), ('GET', '/api/productos?count=none')]),
+    ('cart', 2, 'Login - Client (Eidan)', [('GET', '/api/carritos/mine'), ('GET', '/api/detalles')]),
+]
+
+# Usuarios de la colección (mismas credenciales que reset_db.py)
+SEED_USERS = [
+    {'username': 'admin', 'email': 'admin@tennismanager.com', 'password': 'admin123', 'role': 'admin'},
+    {'username': 'manager1', 'email': 'manager@tennismanager.com', 'password': 'manager123', 'role': 'manager'},
+    {'username': 'eidan', 'email': 'eidan@tennismanager.com', 'password': 'eidan123', 'role': 'client'},
+]
+
+
+def load_collection(path=COLLECTION):
+    """Aplanar la colección de Postman en {nombre: (método, path, body)}"""
+    with open(path, encoding='utf-8') as f:
+        collection = json.load(f)
+
+    requests = {}
+
+    def walk(items):
+        for item in items:
+            if 'item' in item:
+                walk(item['item'])
+                continue
+            request = item['request']
+            url = request['url']['raw'] if isinstance(request['url'], dict) else request['url']
+            body = (request.get('body') or {}).get('raw')
+            requests[item['name']] = (
+                request['method'],
+                url.replace('{{base_url}}', ''),
+                json.loads(body) if body else None
+            )
+
+    walk(collection['item'])
+    return requests
+
+
+def resolve_steps(collection):
+    """Traducir los pasos de cada escenario a (método, path, body)"""
+    resolved = []
+    for name, weight, login, steps in SCENARIOS:
+        calls = [collection[step] if isinstance(step, str) else (step[0], step[1], None)
+                 for step in steps]
+        resolved.append((name, weight, collection[login] if login else None, calls))
+    return resolved
+
+
+class InProcessClient:
+    """App en proceso con el test client; cuenta sentencias SQL por thread"""
+
+    def __init__(self, database_url):
+        from sqlalchemy import event
+        from config import TestingConfig, config
+        from app import create_app, db
+
+        config['bench'] = type('BenchConfig', (TestingConfig,), {'SQLALCHEMY_DATABASE_URI': database_url})
+        self.app = create_app('bench')
+        self.db = db
+        self._local = threading.local()
+        with self.app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self._local.statements = getattr(self._local, 'statements', 0) + 1
+
+    def seed(self, notes_per_user, products):
+        from app.models.Carrito import Carrito
+        from app.models.Categoria import Categoria
+        from app.models.Detalle import Detalle
+        from app.models.note import Note
+        from app.models.Producto import Producto
+        from app.models.user import User
+
+        db = self.db
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            users = []
+            for data in SEED_USERS:
+                user = User(username=data['username'], email=data['email'], role=data['role'])
+                user.set_password(data['password'])
+                users.append(user)
+            db.session.add_all(users)
+            db.session.flush()
+
+            db.session.add_all([
+                Note(title=f'Reserva Cancha {i}', content='Reserva para partido', user_id=user.id)
+                for user in users for i in range(notes_per_user)
+            ])
+            categorias = [Categoria(nombreCategoria=f'Categoría {i}') for i in range(10)]
+            db.session.add_all(categorias)
+            db.session.flush()
+            productos = [
+                Producto(nombreProducto=f'Producto {i}', descripcionProducto='x' * 200, precio=10,
+                         disponibilidad=1, idCategoria=categorias[i % len(categorias)].idCategoria)
+                for i in range(products)
+            ]
+            db.session.add_all(productos)
+            carrito = Carrito(subtotal=30, montoTotal=30, idUsuario=users[-1].id)
+            db.session.add(carrito)
+            db.session.flush()
+            db.session.add_all([
+                Detalle(cantidadProductos=1, precioUnitario=10, subtotalDetalle=10,
+                        idCarrito=carrito.idCarrito, idProducto=producto.idProducto)
+                for producto in productos[:3]
+            ])
+            db.session.commit()
+
+    def request(self, method, path, body=None, token=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        self._local.statements = 0
+        start = time.perf_counter()
+        response = client.open(path, method=method, json=body, headers=headers)
+        elapsed = time.perf_counter() - start
+        return response.status_code, elapsed, self._local.statements, response.get_json(silent=True)
+
+
+class HttpClient:
+    """Servidor ya levantado; sin acceso al engine no se cuentan queries"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def seed(self, *args):
+        pass
+
+    def request(self, method, path, body=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                status, payload = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, payload = e.code, e.read()
+        elapsed = time.perf_counter() - start
+        try:
+            payload = json.loads(payload)
+        except ValueError:
+            payload = None
+        return status, elapsed, None, payload
+
+
+def percentile(values, pct):
+    """Percentil por rango más cercano"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def login(client, call):
+    method, path, body = call
+    status, _, _, payload = client.request(method, path, body)
+    if status != 200:
+        raise RuntimeError(f'Login {body.get("username")} falló con {status}')
+    return payload['data']['token']
+
+
+def run(client, scenarios, total, concurrency, seed):
+    """Ejecutar `total` escenarios elegidos por peso con `concurrency` en vuelo"""
+    tokens = {id(login_call): login(client, login_call) for _, _, login_call, _ in scenarios if login_call}
+    rng = random.Random(seed)
+    plan = rng.choices(scenarios, weights=[weight for _, weight, _, _ in scenarios], k=total)
+    samples = defaultdict(lambda: {'latencies': [], 'statements': [], 'errors': 0})
+    lock = threading.Lock()
+
+    def execute(scenario):
+        name, _, login_call, calls = scenario
+        token = tokens.get(id(login_call)) if login_call else None
+        elapsed, statements, failed = 0.0, 0, False
+        for method, path, body in calls:
+            status, seconds, count, _ = client.request(method, path, body, token)
+            elapsed += seconds
+            statements = statements + count if count is not None and statements is not None else None
+            failed = failed or status >= 400
+        with lock:
+            sample = samples[name]
+            sample['latencies'].append(elapsed * 1000)
+            if statements is not None:
+                sample['statements'].append(statements)
+            sample['errors'] += failed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(execute, plan))
+    wall = time.perf_counter() - start
+
+    results = {}
+    for name, sample in samples.items():
+        latencies, statements = sample['latencies'], sample['statements']
+        results[name] = {
+            'count': len(latencies),
+            'errors': sample['errors'],
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'throughput_rps': round(len(latencies) / wall, 1),
+            'queries': round(sum(statements) / len(statements), 2) if statements else None,
+        }
+    return results, total / wall
+
+
+def compare(results, baseline, tolerance):
+    """Escenarios que empeoran frente al baseline (p95 fuera de tolerancia o más queries)"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f'{name}: p95 {previous["p95_ms"]} -> {current["p95_ms"]} ms')
+        if current['queries'] is not None and previous.get('queries') is not None \
+                and current['queries'] > previous['queries']:
+            regressions.append(f'{name}: queries {previous["queries"]} -> {current["queries"]}')
+        if current['errors'] > previous.get('errors', 0):
+            regressions.append(f'{name}: errores {previous.get("errors", 0)} -> {current["errors"]}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=42, help='semilla del reparto de escenarios')
+    parser.add_argument('--notes', type=int, default=200, help='notas por usuario sembradas')
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--database-url', help='base para la app en proceso (por defecto SQLite temporal)')
+    parser.add_argument('--base-url', help='servidor ya levantado, p. ej. http://localhost:5001')
+    parser.add_argument('--baseline', help='archivo JSON de baseline')
+    parser.add_argument('--save-baseline', action='store_true', help='guardar el resultado como baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='margen de p95 antes de marcar regresión')
+    args = parser.parse_args()
+
+    path = None
+    if args.base_url:
+        client, target = HttpClient(args.base_url), 'http'
+    else:
+        url = args.database_url
+        if not url:
+            fd, path = tempfile.mkstemp(suffix='.db')
+            os.close(fd)
+            url = f'sqlite:///{path}'
+        client = InProcessClient(url)
+        target = url.split(':', 1)[0].split('+')[0]
+        client.seed(args.notes, args.products)
+
+    try:
+        scenarios = resolve_steps(load_collection())
+        results, throughput = run(client, scenarios, args.requests, args.concurrency, args.seed)
+    finally:
+        if path:
+            os.remove(path)
+
+    print(f'{args.requests} escenarios, concurrencia {args.concurrency}, destino {target}: {throughput:.1f} escenarios/s')
+    print(f'{"escenario":>16} {"n":>6} {"err":>5} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"rps":>8} {"queries":>8}')
+    for name, r in sorted(results.items()):
+        queries = '-' if r['queries'] is None else f'{r["queries"]:.1f}'
+        print(f'{name:>16} {r["count"]:>6} {r["errors"]:>5} {r["p50_ms"]:>9.2f} {r["p95_ms"]:>9.2f} '
+              f'{r["p99_ms"]:>9.2f} {r["throughput_rps"]:>8.1f} {queries:>8}')
+
+    baseline_path = Path(args.baseline) if args.baseline else BASELINE_DIR / f'load_{target}.json'
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True))
+        print(f'Baseline guardado en {baseline_path}')
+        return 0
+
+    if not baseline_path.exists():
+        print(f'Sin baseline en {baseline_path} (usar --save-baseline)')
+        return 0
+
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+    if regressions:
+        print('⚠️  Regresiones frente al baseline:')
+        for line in regressions:
+            print(f'   {line}')
+        return 1
+    print(f'✅ Sin regresiones frente a {baseline_path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks de primitivas calientes: servicios, serializadores y auth.
+
+Corre offline sobre SQLite en memoria (TestingConfig) con un dataset de tamaño
+fijo y mide cada primitiva por separado: ops/s y memoria asignada por operación
+(tracemalloc). Con --output se guarda el resultado y con --compare se imprime
+la diferencia contra una corrida anterior, para acompañar cada cambio de
+performance con números de antes/después.
+
+Uso:
+    python -m benchmarks.micro
+    python -m benchmarks.micro --only token --output /tmp/antes.json
+    python -m benchmarks.micro --compare /tmp/antes.json
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from app import db
+from app.models.Carrito import Carrito
+from app.models.Categoria import Categoria  # noqa: F401 (modelos referenciados por Producto)
+from app.models.Detalle import Detalle  # noqa: F401
+from app.models.Emprendimiento import Emprendimiento  # noqa: F401
+from app.models.note import Note
+from app.models.Producto import Producto
+from app.models.user import User
+from app.services.base_service import BaseService
+from app.services.note_service import NoteService
+from app.services.storefront_service import StorefrontService
+from benchmarks.common import build_app
+
+USERS = 50
+NOTES_PER_USER = 20
+PRODUCTS = 10000
+PASSWORD = 'bench123'
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Registrar un benchmark: la función recibe el contexto y retorna la operación a medir"""
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+@benchmark('BaseService.get_all(notes)')
+def bench_get_all(ctx):
+    service = BaseService(Note)
+
+    def op():
+        service.get_all()
+        db.session.expunge_all()
+    return op
+
+
+@benchmark('BaseService.get_all(notes, fields)')
+def bench_get_all_fields(ctx):
+    service = BaseService(Note)
+    fields, _ = service.parse_fields('id,title')
+
+    def op():
+        service.get_all(fields=fields)
+        db.session.expunge_all()
+    return op
+
+
+@benchmark('NoteService.get_page(limit=20)')
+def bench_get_page(ctx):
+    service = NoteService()
+
+    def op():
+        service.get_page(limit=20)
+        db.session.expunge_all()
+    return op
+
+
+@benchmark('StorefrontService.get_page(top)')
+def bench_storefront_top(ctx):
+    service = StorefrontService()
+    service.refresh()
+    _, meta, _ = service.get_page('top', limit=20)
+    cursor = meta['next_cursor']
+    return lambda: service.get_page('top', limit=20, cursor=cursor)
+
+
+@benchmark('Producto.query top 20 (ORDER BY)')
+def bench_top_query(ctx):
+    query = Producto.query.order_by(Producto.vecesGuardadoEnCarrito.desc(), Producto.idProducto).limit(20)
+
+    def op():
+        [p.to_dict() for p in query.all()]
+        db.session.expunge_all()
+    return op
+
+
+@benchmark('User.to_dict')
+def bench_user_to_dict(ctx):
+    user = ctx['user']
+    return user.to_dict
+
+
+@benchmark('Note.to_dict')
+def bench_note_to_dict(ctx):
+    note = ctx['note']
+    return note.to_dict
+
+
+@benchmark('Producto.to_dict')
+def bench_producto_to_dict(ctx):
+    producto = ctx['producto']
+    return producto.to_dict
+
+
+@benchmark('Carrito.to_dict')
+def bench_carrito_to_dict(ctx):
+    carrito = ctx['carrito']
+    return carrito.to_dict
+
+
+@benchmark('User.generate_token')
+def bench_generate_token(ctx):
+    user = ctx['user']
+    return user.generate_token
+
+
+@benchmark('User.verify_token')
+def bench_verify_token(ctx):
+    token = ctx['token']
+    return lambda: User.verify_token(token)
+
+
+@benchmark('User.check_password')
+def bench_check_password(ctx):
+    user = ctx['user']
+    return lambda: user.check_password(PASSWORD)
+
+
+def seed():
+    """Dataset fijo: USERS usuarios con NOTES_PER_USER notas cada uno y PRODUCTS productos"""
+    users = []
+    for i in range(USERS):
+        user = User(username=f'user{i}', email=f'user{i}@example.com')
+        user.set_password(PASSWORD)
+        users.append(user)
+    db.session.add_all(users)
+    db.session.flush()
+    db.session.add_all([
+        Note(title=f'Nota {i}', content='x' * 200, user_id=user.id)
+        for user in users for i in range(NOTES_PER_USER)
+    ])
+    db.session.execute(Producto.__table__.insert(), [
+        {'nombreProducto': f'Producto {i}', 'precio': 10, 'disponibilidad': 1,
+         'vecesGuardadoEnCarrito': i * 7919 % 1000, 'descuento': i % 30 or None}
+        for i in range(PRODUCTS)
+    ])
+    carrito = Carrito(subtotal=12345, montoTotal=11111, idUsuario=users[0].id)
+    db.session.add(carrito)
+    db.session.commit()
+
+    # Un solo commit y después las lecturas: otro commit expiraría estas instancias
+    user = db.session.get(User, users[0].id)
+    note = Note.query.filter_by(user_id=user.id).first()
+    note.user  # relación ya cargada: se mide solo la serialización
+    carrito = db.session.get(Carrito, carrito.idCarrito)
+    producto = Producto.query.filter(Producto.descuento.isnot(None)).first()
+    return {'user': user, 'note': note, 'producto': producto, 'carrito': carrito,
+            'token': user.generate_token()}
+
+
+def measure(op, min_time):
+    """ops/s (iterando al menos min_time segundos) y bytes asignados por operación"""
+    op()  # warmup
+    iterations, start = 0, time.perf_counter()
+    while True:
+        op()
+        iterations += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+
+    samples = max(1, min(iterations, 50))
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for _ in range(samples):
+        op()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'ops_per_sec': round(iterations / elapsed, 1),
+        'us_per_op': round(elapsed / iterations * 1e6, 2),
+        'peak_kb': round((peak - before) / 1024, 1),
+        'retained_bytes_per_op': round((after - before) / samples, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', help='ejecutar solo los benchmarks cuyo nombre contiene este texto')
+    parser.add_argument('--min-time', type=float, default=0.5, help='segundos mínimos por benchmark')
+    parser.add_argument('--output', help='guardar resultados en JSON')
+    parser.add_argument('--compare', help='JSON de una corrida anterior para mostrar la diferencia')
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+
+    app = build_app()
+    results = {}
+    with app.app_context():
+        db.create_all()
+        ctx = seed()
+
+        print(f'Dataset: {USERS} usuarios x {NOTES_PER_USER} notas, {PRODUCTS} productos (SQLite en memoria)')
+        print(f'{"benchmark":<36} {"ops/s":>12} {"µs/op":>10} {"pico KB":>9} {"ret B/op":>9} {"vs antes":>9}')
+        for name, setup in BENCHMARKS:
+            if args.only and args.only.lower() not in name.lower():
+                continue
+            result = results[name] = measure(setup(ctx), args.min_time)
+            delta = ''
+            if name in previous:
+                change = result['ops_per_sec'] / previous[name]['ops_per_sec'] - 1
+                delta = f'{change:+.1%}'
+            print(f'{name:<36} {result["ops_per_sec"]:>12,.1f} {result["us_per_op"]:>10.2f} '
+                  f'{result["peak_kb"]:>9.1f} {result["retained_bytes_per_op"]:>9.1f} {delta:>9}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f'Resultados guardados en {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latencia de la página N de notas con keyset vs OFFSET.
+
+Con keyset (NoteService.get_page) la página N cuesta lo mismo que la página 1;
+con OFFSET la base de datos recorre y descarta N * limit filas.
+
+Uso:
+    python -m benchmarks.notes_pagination --notes 100000 --limit 20
+"""
+import argparse
+from datetime import datetime, timedelta
+from app import db
+from app.models.note import Note
+from app.models.user import User
+from app.services.note_service import NoteService
+from app.utils.pagination import encode_cursor
+from benchmarks.common import REPEAT, build_app, timed
+
+
+def seed(notes):
+    user = User(username='bench', email='bench@example.com')
+    user.set_password('bench123')
+    db.session.add(user)
+    db.session.flush()
+
+    base = datetime(2025, 1, 1)
+    db.session.execute(Note.__table__.insert(), [
+        {'title': f'Nota {i}', 'content': 'x' * 100, 'user_id': user.id,
+         'created_at': base + timedelta(seconds=i), 'updated_at': base + timedelta(seconds=i)}
+        for i in range(notes)
+    ])
+    db.session.commit()
+    return user.id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--notes', type=int, default=50000)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    app = build_app()
+    service = NoteService()
+    with app.app_context():
+        db.create_all()
+        user_id = seed(args.notes)
+        ordered = Note.query.filter_by(user_id=user_id).order_by(Note.created_at.desc(), Note.id.desc())
+
+        print(f'{args.notes} notas, limit={args.limit} (ms por página, promedio de {REPEAT})')
+        print(f'{"página":>8} {"keyset":>10} {"offset":>10}')
+        last_page = args.notes // args.limit - 1
+        for page in sorted({1, 10, 100, last_page // 2, last_page}):
+            if page < 1 or page > last_page:
+                continue
+            offset = page * args.limit
+            # Cursor = última fila de la página anterior
+            anchor = ordered.offset(offset - 1).limit(1).one()
+            cursor = encode_cursor(anchor.created_at, anchor.id)
+
+            keyset_ms = timed(lambda: service.get_page(user_id=user_id, limit=args.limit, cursor=cursor),
+                              reset=db.session.expunge_all)
+            offset_ms = timed(lambda: ordered.offset(offset).limit(args.limit).all(), reset=db.session.expunge_all)
+            print(f'{page:>8} {keyset_ms:>10.2f} {offset_ms:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
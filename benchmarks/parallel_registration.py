@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Prueba de concurrencia: registros en paralelo con el mismo username/email.
+
+Lanza N registros simultáneos contra /api/auth/register (la mitad repite el
+mismo username, la otra mitad el mismo email) y verifica que exactamente uno
+de cada grupo termina en 201 y el resto en 409, sin errores 500. También
+cuenta las sentencias SQL por registro (una sola escritura, sin SELECT previo).
+
+Uso:
+    python -m benchmarks.parallel_registration --workers 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
+from app import db
+from app.controllers.auth_controller import auth_bp
+from benchmarks.common import build_app
+
+
+def register(app, barrier, payload):
+    client = app.test_client()
+    barrier.wait()
+    return client.post('/api/auth/register', json=payload).status_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=20)
+    parser.add_argument('--url', help='URL de la base (por defecto SQLite temporal)')
+    args = parser.parse_args()
+
+    path = None
+    url = args.url
+    if not url:
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        url = f'sqlite:///{path}'
+
+    app = build_app(url, [(auth_bp, '/api/auth')])
+    half = args.workers // 2
+    payloads = (
+        [{'username': 'duplicado', 'email': f'user{i}@example.com', 'password': 'secret123'}
+         for i in range(half)] +
+        [{'username': f'user{i}', 'email': 'duplicado@example.com', 'password': 'secret123'}
+         for i in range(args.workers - half)]
+    )
+
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+
+            statements = Counter()
+            lock = threading.Lock()
+
+            def count_statement(conn, cursor, statement, parameters, context, executemany):
+                with lock:
+                    statements[statement.split()[0].upper()] += 1
+
+            event.listen(db.engine, 'before_cursor_execute', count_statement)
+
+            barrier = threading.Barrier(args.workers)
+            with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                codes = list(pool.map(lambda p: register(app, barrier, p), payloads))
+
+            event.remove(db.engine, 'before_cursor_execute', count_statement)
+            results = Counter(codes)
+
+        print(f'{args.workers} registros en paralelo: {dict(results)}')
+        print(f'Sentencias SQL: {dict(statements)}')
+        expected = {201: 2, 409: args.workers - 2}
+        ok = results == Counter(expected)
+        print('OK' if ok else f'FALLA: se esperaba {expected}')
+        return 0 if ok else 1
+    finally:
+        if path:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cotizar 100k líneas de carrito con el motor de precios en lote.
+
+Compara app.utils.pricing.price_lines (centavos enteros, listas por columna)
+contra el cálculo línea por línea con Decimal que hacía cada cliente, y
+verifica que ambos den exactamente los mismos totales por carrito.
+
+Uso:
+    python -m benchmarks.pricing --lines 100000 --products 5000
+"""
+import argparse
+import random
+import sys
+from decimal import Decimal, ROUND_HALF_UP
+from app.utils.pricing import price_lines, to_cents
+from benchmarks.common import timed
+
+CENT = Decimal('0.01')
+
+
+def build(lines, products, carts, seed=42):
+    rng = random.Random(seed)
+    catalog = {
+        product_id: (Decimal(rng.randint(1, 99999)).scaleb(-2),
+                     Decimal(rng.choice([0, 0, 500, 1000, 1250, 3333])).scaleb(-2))
+        for product_id in range(1, products + 1)
+    }
+    cart_lines = [(rng.randint(1, carts), rng.randint(1, products), rng.randint(1, 10)) for _ in range(lines)]
+    return catalog, cart_lines
+
+
+def price_decimal(cart_lines, catalog):
+    """Referencia: una línea a la vez con Decimal"""
+    totals = {}
+    for cart_id, product_id, quantity in cart_lines:
+        price, discount = catalog[product_id]
+        unit = price - (price * discount / 100).quantize(CENT, ROUND_HALF_UP)
+        totals[cart_id] = totals.get(cart_id, Decimal(0)) + unit * quantity
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=100000)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--carts', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    catalog, cart_lines = build(args.lines, args.products, args.carts)
+    # El catálogo en centavos se arma una vez por request (una query), fuera del cálculo por línea
+    cents_catalog = {pid: (to_cents(price), to_cents(discount)) for pid, (price, discount) in catalog.items()}
+
+    _, batch_totals = price_lines(cart_lines, cents_catalog)
+    decimal_totals = price_decimal(cart_lines, catalog)
+    batch_ms = timed(lambda: price_lines(cart_lines, cents_catalog), args.repeat)
+    decimal_ms = timed(lambda: price_decimal(cart_lines, catalog), args.repeat)
+
+    exact = all(to_cents(decimal_totals[cart_id]) == net for cart_id, (_, net) in batch_totals.items())
+    print(f'{args.lines} líneas, {args.products} productos, {len(batch_totals)} carritos (promedio de {args.repeat})')
+    print(f'{"motor":<28} {"ms":>10} {"líneas/s":>14}')
+    for name, ms in (('lote en centavos', batch_ms), ('Decimal línea por línea', decimal_ms)):
+        print(f'{name:<28} {ms:>10.1f} {args.lines / ms * 1000:>14,.0f}')
+    print(f'speedup: {decimal_ms / batch_ms:.1f}x')
+
+    if not exact:
+        print('❌ Los totales por carrito no coinciden con la referencia Decimal')
+        return 1
+    print('✅ Totales idénticos a la referencia Decimal')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Regresión de conteo de queries: cada endpoint GET debe ejecutar la misma
+cantidad de sentencias SQL sin importar cuántas filas haya.
+
+Levanta la app completa (create_app con TestingConfig), siembra datos en dos
+tamaños y llama a cada ruta GET registrada con el Flask test client. Si el
+conteo crece con el tamaño (patrón N+1), la ruta falla, se listan las
+sentencias repetidas y el proceso termina con código 1, apto para CI.
+Cada request arranca con una sesión nueva (sin identity map heredado) y sin
+el snapshot del storefront; una ruta que responde sin ejecutar ninguna query
+no midió nada y también falla.
+
+Uso:
+    python -m benchmarks.query_counts
+    python -m benchmarks.query_counts --small 5 --large 40 --verbose
+"""
+import argparse
+import re
+import sys
+from collections import Counter
+from sqlalchemy import event
+from app import create_app, db
+from app.models.Carrito import Carrito
+from app.models.Categoria import Categoria
+from app.models.Detalle import Detalle
+from app.models.Emprendimiento import Emprendimiento
+from app.models.note import Note
+from app.models.Producto import Producto
+from app.models.user import User
+from app.services.storefront_service import storefront_service
+
+# Query string para rutas que la necesitan para responder 200
+QUERY_ARGS = {
+    '/api/notes/search': 'user_id=1&title=Nota',
+}
+
+# Rutas que no consultan datos propios de la API
+SKIP = {'static'}
+
+
+def seed(size):
+    """`size` filas por tabla; el usuario 1 es admin y dueño de las notas"""
+    users = []
+    for i in range(size):
+        user = User(username=f'user{i}', email=f'user{i}@example.com',
+                    role='admin' if i == 0 else 'client')
+        user.set_password('secret123')
+        users.append(user)
+    db.session.add_all(users)
+    db.session.flush()
+
+    db.session.add_all([Note(title=f'Nota {i}', content='x', user_id=users[0].id) for i in range(size)])
+    db.session.add_all([Note(title=f'Nota {i}', content='x', user_id=user.id) for i, user in enumerate(users)])
+
+    categorias = [Categoria(nombreCategoria=f'Categoría {i}') for i in range(size)]
+    db.session.add_all(categorias)
+    db.session.flush()
+    productos = [Producto(nombreProducto=f'Producto {i}', precio=10, disponibilidad=1,
+                          idCategoria=categorias[i].idCategoria) for i in range(size)]
+    db.session.add_all(productos)
+    carritos = [Carrito(subtotal=10, montoTotal=10, idUsuario=users[i % 2].id) for i in range(size)]
+    db.session.add_all(carritos)
+    db.session.add_all([Emprendimiento(nombreEmprendimiento=f'Emp {i}', idUsuario=users[0].id)
+                        for i in range(size)])
+    db.session.flush()
+    db.session.add_all([
+        Detalle(cantidadProductos=1, precioUnitario=10, subtotalDetalle=10,
+                idCarrito=carrito.idCarrito, idProducto=productos[i].idProducto)
+        for i, carrito in enumerate(carritos)
+    ])
+    db.session.commit()
+    return users[0].generate_token()
+
+
+def get_routes(app):
+    """Rutas GET registradas, con los parámetros <int:...> reemplazados por 1"""
+    routes = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if 'GET' not in rule.methods or rule.endpoint in SKIP:
+            continue
+        path = re.sub(r'<(?:int:)?[^>]+>', '1', rule.rule)
+        args = QUERY_ARGS.get(rule.rule)
+        routes.append((rule.rule, f'{path}?{args}' if args else path))
+    return routes
+
+
+def run(size):
+    """Conteo de sentencias por ruta: {regla: (status, [sentencias])}"""
+    app = create_app('testing')
+    statements = []
+    results = {}
+
+    with app.app_context():
+        db.create_all()
+        token = seed(size)
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {token}'}
+        for rule, url in get_routes(app):
+            # Sesión nueva por request: el identity map de la anterior no debe ahorrar queries
+            db.session.remove()
+            # Sin snapshot en memoria: las rutas del storefront miden lo que cuesta construirlo
+            storefront_service.invalidate()
+            statements.clear()
+            response = client.get(url, headers=headers)
+            results[rule] = (response.status_code, list(statements))
+
+        event.remove(db.engine, 'before_cursor_execute', listener)
+        db.session.remove()
+        db.drop_all()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--small', type=int, default=3)
+    parser.add_argument('--large', type=int, default=30)
+    parser.add_argument('--verbose', action='store_true', help='mostrar todas las rutas, no solo las que fallan')
+    args = parser.parse_args()
+
+    small, large = run(args.small), run(args.large)
+    failures = []
+
+    print(f'{"ruta":<44} {"status":>6} {args.small:>6} {args.large:>6}')
+    for rule, (status, statements) in large.items():
+        small_count = len(small.get(rule, (None, []))[1])
+        # Una ruta que responde error o no consulta nada no mide nada: también cuenta como falla
+        failed = len(statements) > small_count or status >= 400 or not statements
+        if failed:
+            failures.append((rule, statements))
+        if failed or args.verbose:
+            mark = '❌' if failed else '  '
+            print(f'{rule:<44} {status:>6} {small_count:>6} {len(statements):>6} {mark}')
+
+    if failures:
+        print(f'\n❌ {len(failures)} rutas con error, sin queries o con más queries al crecer las filas:')
+        for rule, statements in failures:
+            print(f'\n{rule}')
+            for statement, count in Counter(statements).most_common():
+                print(f'   {count:>4}x {" ".join(statement.split())[:140]}')
+        return 1
+
+    print(f'\n✅ {len(large)} rutas GET con conteo de queries constante ({args.small} vs {args.large} filas)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
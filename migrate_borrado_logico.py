@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Script para agregar el borrado lógico en una base existente
+
+Agrega users.deleted_at y notes.deleted_at (NULL = fila viva) con sus
+índices, y recalcula los contadores mantenidos para que cuenten solo filas
+sin deleted_at. Si las columnas de contadores todavía no existen, el
+recálculo se hace al correr migrate_contadores.py.
+Pensado para MySQL; es idempotente.
+"""
+
+import sys
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+from app import create_app, db
+from app.models.note import Note
+from app.models.user import User
+from app.services.count_service import count_service
+
+SOFT_DELETE_TABLES = [User.__table__, Note.__table__]
+
+
+def add_deleted_at(connection):
+    """Agregar deleted_at y su índice en las tablas que falten"""
+    for table in SOFT_DELETE_TABLES:
+        column = table.c.deleted_at
+        existing = {c['name'] for c in inspect(connection).get_columns(table.name)}
+        if column.name not in existing:
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f'ALTER TABLE `{table.name}` ADD COLUMN {ddl}'))
+            print(f"   ➕ {table.name}.{column.name}")
+
+        indexes = {ix['name'] for ix in inspect(connection).get_indexes(table.name)}
+        for index in table.indexes:
+            if column in index.columns.values() and index.name not in indexes:
+                index.create(connection)
+                print(f"   📇 {table.name}.{index.name}")
+
+
+def migrate():
+    """deleted_at en users y notes y recálculo de contadores"""
+    app = create_app('development')
+
+    with app.app_context():
+        if db.engine.dialect.name != 'mysql':
+            print("⚠️  La migración está pensada para MySQL; en otros motores recrear las tablas con reset_db.py")
+            return 1
+
+        with db.engine.begin() as connection:
+            print("🪦 Agregando columnas de borrado lógico...")
+            add_deleted_at(connection)
+
+        user_columns = {c['name'] for c in inspect(db.engine).get_columns(User.__tablename__)}
+        if 'notes_count' not in user_columns:
+            print("⚠️  users.notes_count no existe: correr migrate_contadores.py, que recalcula los contadores")
+            return 0
+
+        print("🧮 Recalculando contadores...")
+        count_service.rebuild_counters()
+
+        print("\n🎉 Borrado lógico listo")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(migrate())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Script para recrear las FKs con la acción ON DELETE que declaran los modelos
+
+Las tablas creadas antes de pasar a ON DELETE CASCADE conservan FKs sin
+acción (RESTRICT), así que borrar un usuario o un carrito falla en vez de
+borrar sus hijos en la base de datos. Recrea cada FK cuyo ON DELETE difiere
+del modelo: notes.user_id, Detalle.idCarrito, Carrito.idUsuario,
+Emprendimiento.idUsuario y Producto.idEmprendimiento.
+Pensado para MySQL; es idempotente. Las FKs que todavía apuntan a la tabla
+legada Usuario se dejan para migrate_usuarios.py.
+"""
+
+import sys
+from sqlalchemy import inspect, text
+from app import create_app, db
+from app.models.Carrito import Carrito
+from app.models.Detalle import Detalle
+from app.models.Emprendimiento import Emprendimiento
+from app.models.Producto import Producto
+from app.models.note import Note
+
+CASCADE_TABLES = [Note.__table__, Detalle.__table__, Carrito.__table__,
+                  Emprendimiento.__table__, Producto.__table__]
+
+
+def rebuild_foreign_keys(connection):
+    """Recrear las FKs cuyo ON DELETE no coincide con el modelo; retorna cuántas"""
+    inspector = inspect(connection)
+    rebuilt = 0
+    for table in CASCADE_TABLES:
+        reflected = inspector.get_foreign_keys(table.name)
+        for fk in table.foreign_key_constraints:
+            if not fk.ondelete:
+                continue
+            columns = [column.name for column in fk.columns]
+            referred = fk.referred_table.name
+            current = [r for r in reflected if r['constrained_columns'] == columns]
+
+            if any(r['referred_table'] != referred for r in current):
+                print(f"   ⚠️  {table.name}.{', '.join(columns)} apunta a otra tabla: correr migrate_usuarios.py")
+                continue
+            ondelete = (current[0]['options'].get('ondelete') or '').upper() if current else None
+            if ondelete == fk.ondelete.upper():
+                continue
+
+            if current:
+                name = current[0]['name']
+                connection.execute(text(f'ALTER TABLE `{table.name}` DROP FOREIGN KEY `{name}`'))
+            else:
+                name = f'fk_{table.name.lower()}_{columns[0].lower()}'
+            remote = ', '.join(f'`{element.column.name}`' for element in fk.elements)
+            connection.execute(text(
+                f'ALTER TABLE `{table.name}` ADD CONSTRAINT `{name}` '
+                f'FOREIGN KEY ({", ".join(f"`{c}`" for c in columns)}) '
+                f'REFERENCES `{referred}` ({remote}) ON DELETE {fk.ondelete}'
+            ))
+            rebuilt += 1
+            print(f"   🔗 {table.name}.{', '.join(columns)} -> {referred} ON DELETE {fk.ondelete}")
+    return rebuilt
+
+
+def migrate():
+    """FKs con ON DELETE CASCADE / SET NULL"""
+    app = create_app('development')
+
+    with app.app_context():
+        if db.engine.dialect.name != 'mysql':
+            print("⚠️  La migración está pensada para MySQL; en otros motores recrear las tablas con reset_db.py")
+            return 1
+
+        with db.engine.begin() as connection:
+            print("🔗 Revisando las FKs...")
+            rebuilt = rebuild_foreign_keys(connection)
+
+        print(f"\n🎉 {rebuilt} FKs recreadas" if rebuilt else "\n✅ Las FKs ya coinciden con los modelos")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(migrate())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Script para agregar los contadores mantenidos en una base existente
+
+Agrega users.notes_count y Categoria.productos_count (NOT NULL DEFAULT 0) y
+los recalcula con CountService.rebuild_counters, ya que los eventos del ORM
+solo mantienen los contadores a partir de que existen. El recálculo cuenta
+solo notas sin deleted_at: si la columna todavía no existe, se hace al
+correr migrate_borrado_logico.py.
+Pensado para MySQL; es idempotente (volver a correrlo recalcula los contadores).
+"""
+
+import sys
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+from app import create_app, db
+from app.models.Categoria import Categoria
+from app.models.note import Note
+from app.models.user import User
+from app.services.count_service import count_service
+
+COUNTER_COLUMNS = [User.__table__.c.notes_count, Categoria.__table__.c.productos_count]
+
+
+def add_counter_columns(connection):
+    """Agregar las columnas de contadores que falten"""
+    for column in COUNTER_COLUMNS:
+        table = column.table.name
+        existing = {c['name'] for c in inspect(connection).get_columns(table)}
+        if column.name in existing:
+            continue
+        ddl = CreateColumn(column).compile(dialect=connection.dialect)
+        connection.execute(text(f'ALTER TABLE `{table}` ADD COLUMN {ddl}'))
+        print(f"   ➕ {table}.{column.name}")
+
+
+def migrate():
+    """Columnas de contadores y recálculo inicial"""
+    app = create_app('development')
+
+    with app.app_context():
+        if db.engine.dialect.name != 'mysql':
+            print("⚠️  La migración está pensada para MySQL; en otros motores recrear las tablas con reset_db.py")
+            return 1
+
+        with db.engine.begin() as connection:
+            print("🔢 Agregando columnas de contadores...")
+            add_counter_columns(connection)
+
+        note_columns = {c['name'] for c in inspect(db.engine).get_columns(Note.__tablename__)}
+        if 'deleted_at' not in note_columns:
+            print("⚠️  notes.deleted_at no existe: correr migrate_borrado_logico.py, que recalcula los contadores")
+            return 0
+
+        print("🧮 Recalculando contadores...")
+        count_service.rebuild_counters()
+
+        print("\n🎉 Contadores listos")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(migrate())
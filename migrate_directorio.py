@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Script para preparar el directorio de emprendimientos en una base existente
+
+Agrega Producto.idEmprendimiento (FK ON DELETE SET NULL) y
+Emprendimiento.ciudad (calculada desde ubicacion) y crea los índices del
+directorio declarados en los modelos Emprendimiento y Producto. El índice
+simple sobre Emprendimiento.idUsuario queda cubierto por el compuesto
+(idUsuario, nombreEmprendimiento, idEmprendimiento) y el de ubicacion por el
+de ciudad, así que se eliminan.
+Pensado para MySQL; es idempotente.
+"""
+
+import sys
+from sqlalchemy import inspect, select, text
+from sqlalchemy.schema import CreateColumn
+from app import create_app, db
+from app.models.Emprendimiento import Emprendimiento
+from app.models.Producto import Producto
+
+REDUNDANT_INDEXES = {Emprendimiento.__tablename__: ['ix_Emprendimiento_idUsuario',
+                                                    'ix_emprendimiento_ubicacion_nombre_id']}
+BATCH_SIZE = 1000
+
+
+def add_emprendimiento_column(connection):
+    """Agregar Producto.idEmprendimiento con su FK"""
+    existing = {c['name'] for c in inspect(connection).get_columns(Producto.__tablename__)}
+    if 'idEmprendimiento' in existing:
+        return
+    ddl = CreateColumn(Producto.__table__.c.idEmprendimiento).compile(dialect=connection.dialect)
+    connection.execute(text(f'ALTER TABLE {Producto.__tablename__} ADD COLUMN {ddl}'))
+    connection.execute(text(
+        f'ALTER TABLE {Producto.__tablename__} ADD CONSTRAINT fk_producto_emprendimiento '
+        f'FOREIGN KEY (idEmprendimiento) REFERENCES {Emprendimiento.__tablename__}(idEmprendimiento) '
+        f'ON DELETE SET NULL'
+    ))
+    print(f"   ➕ {Producto.__tablename__}.idEmprendimiento")
+
+
+def add_ciudad_column(connection):
+    """Agregar Emprendimiento.ciudad y calcularla para las filas existentes"""
+    table = Emprendimiento.__table__
+    existing = {c['name'] for c in inspect(connection).get_columns(table.name)}
+    if 'ciudad' not in existing:
+        ddl = CreateColumn(table.c.ciudad).compile(dialect=connection.dialect)
+        connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {ddl}'))
+        print(f"   ➕ {table.name}.ciudad")
+
+    # Solo las filas sin ciudad: volver a correrlo no recalcula todo
+    last_id, updated = 0, 0
+    while True:
+        rows = connection.execute(
+            select(table.c.idEmprendimiento, table.c.ubicacion)
+            .where(table.c.idEmprendimiento > last_id, table.c.ciudad.is_(None), table.c.ubicacion.isnot(None))
+            .order_by(table.c.idEmprendimiento).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for emprendimiento_id, ubicacion in rows:
+            connection.execute(table.update()
+                               .where(table.c.idEmprendimiento == emprendimiento_id)
+                               .values(ciudad=Emprendimiento.city_key(ubicacion)))
+        last_id = rows[-1][0]
+        updated += len(rows)
+    if updated:
+        print(f"   🏙️  {updated} ciudades calculadas")
+
+
+def create_indexes(connection):
+    """Crear los índices del modelo que falten y quitar los redundantes"""
+    for table in (Emprendimiento.__table__, Producto.__table__):
+        existing = {ix['name'] for ix in inspect(connection).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+                print(f"   📇 {table.name}.{index.name}")
+        for name in REDUNDANT_INDEXES.get(table.name, []):
+            if name in existing:
+                connection.execute(text(f'DROP INDEX {name} ON {table.name}'))
+                print(f"   🗑️  {table.name}.{name}")
+
+
+def migrate():
+    """Columnas e índices del directorio de emprendimientos"""
+    app = create_app('development')
+
+    with app.app_context():
+        if db.engine.dialect.name != 'mysql':
+            print("⚠️  La migración está pensada para MySQL; en otros motores recrear las tablas con reset_db.py")
+            return 1
+
+        with db.engine.begin() as connection:
+            print("🏪 Vinculando productos con emprendimientos...")
+            add_emprendimiento_column(connection)
+            add_ciudad_column(connection)
+            # Los índices nuevos cubren la FK idUsuario, así que se crean antes de borrar el viejo
+            print("📇 Creando índices del directorio...")
+            create_indexes(connection)
+
+        print("\n🎉 Directorio de emprendimientos listo")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(migrate())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Script para pasar los montos de DECIMAL a centavos enteros (BIGINT)
+
+Convierte cada columna declarada como Money en los modelos (Producto.precio,
+Detalle.precioUnitario/subtotalDetalle, Carrito.subtotal/montoTotal) en tres
+pasos que se pueden reanudar: agregar <columna>_cents, copiar
+ROUND(<columna> * 100) y reemplazar la columna vieja por la nueva. MySQL no
+hace transaccional el DDL, así que cada paso mira el estado actual y el script
+es idempotente aunque se corte a mitad de camino.
+Pensado para MySQL.
+"""
+
+import sys
+from sqlalchemy import inspect, text
+from sqlalchemy.types import Integer
+from app import create_app, db
+from app.models.Carrito import Carrito  # noqa: F401 (registra las tablas con montos)
+from app.models.Detalle import Detalle  # noqa: F401
+from app.models.Producto import Producto  # noqa: F401
+from app.utils.money import Money
+
+
+def money_columns():
+    """(tabla, columna) de todas las columnas Money del metadata"""
+    return [(table, column) for table in db.metadata.sorted_tables
+            for column in table.columns if isinstance(column.type, Money)]
+
+
+def convert(connection, table, column):
+    """Reemplazar una columna DECIMAL en unidades por BIGINT en centavos"""
+    name, temp = column.name, f'{column.name}_cents'
+    columns = {c['name']: c['type'] for c in inspect(connection).get_columns(table.name)}
+    null = 'NULL' if column.nullable else 'NOT NULL'
+
+    if name in columns and isinstance(columns[name], Integer) and temp not in columns:
+        return False
+
+    if temp not in columns:
+        connection.execute(text(f'ALTER TABLE `{table.name}` ADD COLUMN `{temp}` BIGINT NULL'))
+    if name in columns:
+        connection.execute(text(f'UPDATE `{table.name}` SET `{temp}` = ROUND(`{name}` * 100)'))
+        connection.execute(text(f'ALTER TABLE `{table.name}` DROP COLUMN `{name}`'))
+    connection.execute(text(f'ALTER TABLE `{table.name}` CHANGE `{temp}` `{name}` BIGINT {null}'))
+    return True
+
+
+def migrate():
+    """Montos en centavos enteros"""
+    app = create_app('development')
+
+    with app.app_context():
+        if db.engine.dialect.name != 'mysql':
+            print("⚠️  La migración está pensada para MySQL; en otros motores recrear las tablas con reset_db.py")
+            return 1
+
+        print("💰 Convirtiendo montos a centavos enteros...")
+        with db.engine.begin() as connection:
+            for table, column in money_columns():
+                if convert(connection, table, column):
+                    print(f"   🔁 {table.name}.{column.name} -> BIGINT (centavos)")
+                else:
+                    print(f"   ✅ {table.name}.{column.name} ya está en centavos")
+
+        print("\n🎉 Montos migrados: la API sigue respondiendo en unidades (19.99)")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(migrate())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Script para crear los índices de paginación y el feed de cambios de notas
+
+Crea en una base existente los índices compuestos de notes que declara el
+modelo Note: (user_id, created_at, id) y (created_at, id) para la paginación
+keyset, y (user_id, change_seq, id) y (change_seq, id) para /api/notes/changes.
+Agrega notes.change_seq (las notas existentes quedan en 0, ordenadas por id)
+y la tabla change_sequences, y quita el índice del feed anterior por updated_at.
+Pensado para MySQL; es idempotente.
+"""
+
+import sys
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+from app import create_app, db
+from app.models.change_sequence import ChangeSequence
+from app.models.note import Note
+
+NOTE_INDEXES = ['ix_notes_user_created_id', 'ix_notes_created_id',
+                'ix_notes_user_change_seq_id', 'ix_notes_change_seq_id']
+OBSOLETE_INDEXES = ['ix_notes_user_updated_id']
+
+
+def add_change_seq(connection):
+    """Agregar notes.change_seq y la tabla de secuencias si faltan"""
+    sequences = ChangeSequence.__table__
+    sequences.create(connection, checkfirst=True)
+    if connection.execute(sequences.select().where(sequences.c.name == Note.__tablename__)).first() is None:
+        connection.execute(sequences.insert().values(name=Note.__tablename__, value=0))
+    existing = {c['name'] for c in inspect(connection).get_columns(Note.__tablename__)}
+    if 'change_seq' not in existing:
+        ddl = CreateColumn(Note.__table__.c.change_seq).compile(dialect=connection.dialect)
+        connection.execute(text(f'ALTER TABLE `{Note.__tablename__}` ADD COLUMN {ddl}'))
+        print(f"   ➕ {Note.__tablename__}.change_seq")
+
+
+def create_indexes(connection):
+    """Crear los índices de notes que falten"""
+    existing = {ix['name'] for ix in inspect(connection).get_indexes(Note.__tablename__)}
+    for index in Note.__table__.indexes:
+        if index.name in NOTE_INDEXES and index.name not in existing:
+            index.create(connection)
+            print(f"   📇 {Note.__tablename__}.{index.name}")
+    for name in OBSOLETE_INDEXES:
+        if name in existing:
+            connection.execute(text(f'DROP INDEX `{name}` ON `{Note.__tablename__}`'))
+            print(f"   🗑️  {Note.__tablename__}.{name}")
+
+
+def migrate():
+    """change_seq e índices de notas"""
+    app = create_app('development')
+
+    with app.app_context():
+        if db.engine.dialect.name != 'mysql':
+            print("⚠️  La migración está pensada para MySQL; en otros motores recrear las tablas con reset_db.py")
+            return 1
+
+        with db.engine.begin() as connection:
+            print("🔢 Agregando change_seq...")
+            add_change_seq(connection)
+
+        with db.engine.begin() as connection:
+            print("📇 Creando índices de notas...")
+            create_indexes(connection)
+
+        print("\n🎉 Notas listas")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(migrate())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Script para unificar la tabla legada Usuario dentro de users
+
+Copia cada fila de Usuario a users (o completa el usuario existente con el
+mismo email), reapunta Carrito.idUsuario y Emprendimiento.idUsuario a users.id
+con ON DELETE CASCADE y deja la tabla vieja renombrada como Usuario_legacy.
+Pensado para MySQL; es idempotente (si no hay tabla Usuario no hace nada).
+"""
+
+import sys
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+from app import create_app, db
+from app.models.user import User
+from app.models.Carrito import Carrito
+from app.models.Emprendimiento import Emprendimiento
+
+LEGACY_TABLE = 'Usuario'
+DEPENDENT_TABLES = [Carrito.__table__, Emprendimiento.__table__]
+
+# Columnas legadas -> columnas de users que se completan si están vacías
+PROFILE_COLUMNS = {
+    'nombres': 'name',
+    'apellidos': 'last_name',
+    'telefono': 'phone',
+    'direccion': 'address',
+    'pais': 'country',
+    'departamento': 'department',
+    'fotoPerfil': 'profile_photo',
+}
+
+
+def add_missing_columns(connection):
+    """Agregar a users las columnas nuevas del modelo (country, department, ...)"""
+    existing = {c['name'] for c in inspect(connection).get_columns(User.__tablename__)}
+    for column in User.__table__.columns:
+        if column.name not in existing:
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f'ALTER TABLE {User.__tablename__} ADD COLUMN {ddl}'))
+            print(f"   ➕ users.{column.name}")
+
+
+def copy_legacy_users(connection):
+    """Copiar Usuario -> users; retorna {idUsuario viejo: users.id}"""
+    users = User.__table__
+    rows = connection.execute(text(f'SELECT * FROM {LEGACY_TABLE}')).mappings().all()
+    mapping = {}
+
+    for row in rows:
+        email = row['correoElectronico'].strip().lower()
+        existing = connection.execute(
+            users.select().where(users.c.email == email)
+        ).mappings().first()
+
+        if existing:
+            # Completar solo los datos de perfil que users no tiene
+            values = {target: row[source] for source, target in PROFILE_COLUMNS.items()
+                      if row[source] and not existing[target]}
+            if values:
+                connection.execute(users.update().where(users.c.id == existing['id']).values(values))
+            mapping[row['idUsuario']] = existing['id']
+        else:
+            values = {target: row[source] for source, target in PROFILE_COLUMNS.items()}
+            result = connection.execute(users.insert().values(
+                username=email,
+                email=email,
+                password_hash=row['contraseña'],
+                role='client',
+                is_active=True,
+                notes_count=0,
+                **values
+            ))
+            mapping[row['idUsuario']] = result.inserted_primary_key[0]
+
+    return mapping
+
+
+def repoint_dependents(connection, mapping):
+    """Reapuntar las FKs idUsuario de Usuario a users.id"""
+    inspector = inspect(connection)
+    for table in DEPENDENT_TABLES:
+        # 1. Quitar la FK vieja hacia Usuario
+        for fk in inspector.get_foreign_keys(table.name):
+            if fk['referred_table'] == LEGACY_TABLE:
+                connection.execute(text(f'ALTER TABLE {table.name} DROP FOREIGN KEY {fk["name"]}'))
+
+        # 2. Traducir los ids en una sola sentencia (evita choques entre ids viejos y nuevos)
+        changed = {old: new for old, new in mapping.items() if old != new}
+        if changed:
+            cases = ' '.join(f'WHEN {int(old)} THEN {int(new)}' for old, new in changed.items())
+            ids = ', '.join(str(int(old)) for old in changed)
+            connection.execute(text(
+                f'UPDATE {table.name} SET idUsuario = CASE idUsuario {cases} END '
+                f'WHERE idUsuario IN ({ids})'
+            ))
+
+        # 3. FK e índice nuevos hacia users
+        indexes = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(connection)
+        connection.execute(text(
+            f'ALTER TABLE {table.name} ADD CONSTRAINT fk_{table.name.lower()}_users '
+            f'FOREIGN KEY (idUsuario) REFERENCES {User.__tablename__}(id) ON DELETE CASCADE'
+        ))
+        print(f"   🔗 {table.name}.idUsuario -> users.id")
+
+
+def migrate():
+    """Unificar Usuario en users"""
+    app = create_app('development')
+
+    with app.app_context():
+        if db.engine.dialect.name != 'mysql':
+            print("⚠️  La migración está pensada para MySQL; en otros motores recrear las tablas con reset_db.py")
+            return 1
+
+        if LEGACY_TABLE not in inspect(db.engine).get_table_names():
+            print("✅ No existe la tabla Usuario: nada que migrar")
+            return 0
+
+        with db.engine.begin() as connection:
+            print("🗄️  Actualizando columnas de users...")
+            add_missing_columns(connection)
+
+            print("👤 Copiando usuarios de Usuario a users...")
+            mapping = copy_legacy_users(connection)
+            print(f"✅ {len(mapping)} usuarios unificados")
+
+            print("🛒 Reapuntando carritos y emprendimientos...")
+            repoint_dependents(connection, mapping)
+
+            connection.execute(text(f'RENAME TABLE {LEGACY_TABLE} TO {LEGACY_TABLE}_legacy'))
+            print(f"📦 Tabla vieja conservada como {LEGACY_TABLE}_legacy")
+
+        print("\n🎉 Identidad unificada: auth, carritos y emprendimientos usan users.id")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(migrate())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Collector OTLP/HTTP mínimo para desarrollo (reemplazo local de un collector
+de OpenTelemetry).
+
+Recibe POST /v1/traces en JSON (TRACING_EXPORTER=otlp), guarda cada lote en
+un archivo .jsonl e imprime el árbol de spans de cada traza con su duración.
+También puede imprimir los árboles de un archivo ya exportado (TRACING_EXPORTER=file).
+
+Uso:
+    python trace_collector.py                       # escucha en :4318
+    python trace_collector.py --port 4318 --output traces.jsonl
+    python trace_collector.py --file traces.jsonl   # solo imprimir
+"""
+import argparse
+import json
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def iter_spans(payload):
+    for resource_spans in payload.get('resourceSpans', []):
+        for scope_spans in resource_spans.get('scopeSpans', []):
+            yield from scope_spans.get('spans', [])
+
+
+def print_traces(payload):
+    """Un árbol por traza: duración en ms, nombre y db.statement si lo hay"""
+    traces = defaultdict(list)
+    for span in iter_spans(payload):
+        traces[span['traceId']].append(span)
+
+    for trace_id, spans in traces.items():
+        ids = {span['spanId'] for span in spans}
+        children = defaultdict(list)
+        for span in spans:
+            parent = span.get('parentSpanId') if span.get('parentSpanId') in ids else None
+            children[parent].append(span)
+
+        print(f'\ntrace {trace_id} ({len(spans)} spans)')
+
+        def show(span, depth):
+            duration = (int(span['endTimeUnixNano']) - int(span['startTimeUnixNano'])) / 1e6
+            attributes = {a['key']: next(iter(a['value'].values())) for a in span.get('attributes', [])}
+            detail = attributes.get('db.statement', '')
+            error = ' ❌' if span.get('status', {}).get('code') == 2 else ''
+            print(f'{duration:>9.2f} ms  {"  " * depth}{span["name"]}{error} {detail[:80]}'.rstrip())
+            for child in sorted(children[span['spanId']], key=lambda s: int(s['startTimeUnixNano'])):
+                show(child, depth + 1)
+
+        for root in sorted(children[None], key=lambda s: int(s['startTimeUnixNano'])):
+            show(root, 0)
+
+
+def serve(port, output):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != '/v1/traces':
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                self.send_response(400)
+                self.end_headers()
+                return
+            with open(output, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(payload, separators=(',', ':')) + '\n')
+            print_traces(payload)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(b'{}')
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('0.0.0.0', port), Handler)
+    print(f'🔭 Collector OTLP/HTTP en http://localhost:{port}/v1/traces (guardando en {output})')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=4318)
+    parser.add_argument('--output', default='traces-collector.jsonl')
+    parser.add_argument('--file', help='imprimir las trazas de un archivo exportado y salir')
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    print_traces(json.loads(line))
+        return
+    serve(args.port, args.output)
+
+
+if __name__ == '__main__':
+    main()